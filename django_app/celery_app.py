@@ -1,13 +1,11 @@
 import os
 
 from celery import Celery
-from django.conf import settings
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 app = Celery('core')
 
-app.config_from_object('django.conf:settings')
-app.conf.broker_url = settings.CELERY_BROKER_URL
+app.config_from_object('django.conf:settings', namespace='CELERY')
 
 app.autodiscover_tasks()
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'event_api.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -41,6 +42,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'event_api.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -64,11 +66,72 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.wsgi.application'
 
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgresql for production; SQLite stays the default for development and tests.
+DB_ENGINE = os.getenv("DB_ENGINE", 'sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    # With DB_POOL_MAX_SIZE set, connections come from psycopg's pool, which Django only allows
+    # with CONN_MAX_AGE=0; otherwise connections persist for DB_CONN_MAX_AGE seconds.
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 0))
+
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv("POSTGRES_DB", 'event_management'),
+            'USER': os.getenv("POSTGRES_USER", 'postgres'),
+            'PASSWORD': os.getenv("POSTGRES_PASSWORD", ''),
+            'HOST': os.getenv("POSTGRES_HOST", 'localhost'),
+            'PORT': os.getenv("POSTGRES_PORT", '5432'),
+            'CONN_MAX_AGE': 0 if DB_POOL_MAX_SIZE else int(os.getenv("DB_CONN_MAX_AGE", 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+                    'max_size': DB_POOL_MAX_SIZE,
+                    'timeout': float(os.getenv("DB_POOL_TIMEOUT", 10)),
+                },
+            } if DB_POOL_MAX_SIZE else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv("SQLITE_PATH", BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # WAL lets readers run alongside the single writer; IMMEDIATE takes the write lock
+                # when a transaction starts, so concurrent writers wait on the busy timeout instead
+                # of failing with "database is locked" when upgrading a read lock.
+                'init_command': (
+                    "PRAGMA journal_mode=WAL;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA cache_size=-64000;"
+                    "PRAGMA temp_store=MEMORY;"
+                    "PRAGMA mmap_size=268435456;"
+                ),
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': int(os.getenv("SQLITE_BUSY_TIMEOUT", 20)),
+            },
+        }
     }
+
+# Read replicas: comma separated hosts (PostgreSQL) or database files (SQLite). Safe-method
+# requests to views with replica_reads = True read from one of them, see event_api.routers.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.getenv("DB_REPLICAS", '').split(',')), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST' if DB_ENGINE == 'postgresql' else 'NAME': replica.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['event_api.routers.PrimaryReplicaRouter']
+
+# How long a client reads from the primary after a write (cookie and per-user cache marker).
+REPLICA_PINNING = {
+    'ALIAS': os.getenv("REPLICA_PIN_CACHE_ALIAS", 'default'),
+    'SECONDS': int(os.getenv("REPLICA_PIN_SECONDS", 5)),
 }
 
 
@@ -87,14 +150,66 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The first hasher of the selected profile hashes new passwords; the rest still verify existing
+# hashes, which are upgraded on the next successful login. The argon2 profile needs argon2-cffi.
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", 870000))
+
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': 'event_api.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+}
+
+PASSWORD_HASHER_PROFILE = os.getenv("PASSWORD_HASHER_PROFILE", 'pbkdf2')
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]] + [
+    hasher for hasher in [
+        'event_api.hashers.TunedPBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    ] if hasher != PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+]
+
+# Pool used by the async login view; "process" isolates hashing CPU from the request workers.
+PASSWORD_HASHING_EXECUTOR = {
+    'KIND': os.getenv("PASSWORD_HASHING_EXECUTOR", 'thread'),
+    'MAX_WORKERS': int(os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)),
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'event_api.authentication.ClaimsJWTAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'event_api.pagination.EventAPIPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'event_api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'event_api.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Per-view wall, SQL and serializer time and response size, exported on /metrics to METRICS_ALLOWED_IPS.
+# The check uses REMOTE_ADDR: behind a local reverse proxy that is the proxy's address, so block /metrics there.
+PERFORMANCE_MONITORING = {
+    'ENABLED': os.getenv("PERFORMANCE_MONITORING", '1') == '1',
+    'SERVER_TIMING': os.getenv("SERVER_TIMING_HEADER", '0') == '1',
+    'SLOW_REQUEST_MS': int(os.getenv("SLOW_REQUEST_MS", 500)),
+    'REPEATED_QUERY_THRESHOLD': int(os.getenv("REPEATED_QUERY_THRESHOLD", 10)),
+    'METRICS_ALLOWED_IPS': os.getenv("METRICS_ALLOWED_IPS", '127.0.0.1,::1').split(','),
+    # Celery workers serve their task metrics on this port; 0 disables it.
+    'WORKER_METRICS_PORT': int(os.getenv("WORKER_METRICS_PORT", 0)),
 }
 
+# "orjson" encodes and decodes API JSON with orjson when it is installed, "stdlib" with the json module.
+API_JSON_BACKEND = os.getenv("API_JSON_BACKEND", "orjson")
+
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -102,6 +217,37 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Role, listing, token status, replica pin and notification keys must be shared by every process
+# (runserver, uvicorn, Celery workers), so deployments set REDIS_CACHE_URL; LocMem is for local runs.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv("REDIS_CACHE_URL"),
+    } if os.getenv("REDIS_CACHE_URL") else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Roles looked up by id where no caller_role annotation is loaded, e.g. the ?expand=member organizer check.
+EVENT_ROLE_CACHE = {
+    'BACKEND': os.getenv("EVENT_ROLE_CACHE_BACKEND", 'event_api.roles.DjangoCacheRoleBackend'),
+    'OPTIONS': {
+        'timeout': int(os.getenv("EVENT_ROLE_CACHE_TIMEOUT", 60)),
+    },
+}
+
+# is_active/is_staff of JWT users, checked on every request instead of loading the user row.
+JWT_USER_STATUS_CACHE = {
+    'ALIAS': os.getenv("JWT_USER_STATUS_CACHE_ALIAS", 'default'),
+    'TIMEOUT': int(os.getenv("JWT_USER_STATUS_CACHE_TIMEOUT", 30)),
+}
+
+# Serialized /api/events/ pages; ALIAS may be empty to disable the cache.
+EVENT_LIST_CACHE = {
+    'ALIAS': os.getenv("EVENT_LIST_CACHE_ALIAS", 'default'),
+    'TIMEOUT': int(os.getenv("EVENT_LIST_CACHE_TIMEOUT", 300)),
+}
+
 LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'UTC'
@@ -116,7 +262,47 @@ AUTH_USER_MODEL = 'event_api.CustomUser'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-CELERY_BROKER_URL = "redis://redis:6379/0"
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
+# Redis hands an unacknowledged task to another worker after this many seconds; it must be longer
+# than the longest countdown (NOTIFICATION_RETRY_BACKOFF * 2 ** NOTIFICATION_MAX_RETRIES).
+CELERY_BROKER_TRANSPORT_OPTIONS = {'visibility_timeout': 3600}
+CELERY_TASK_PUBLISH_RETRY_POLICY = {'max_retries': 3, 'interval_start': 0, 'interval_step': 0.5, 'interval_max': 2}
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+# Mail waits on SMTP, so it runs on its own queue and worker (see docker/docker-compose.yml).
+CELERY_TASK_ROUTES = {
+    'event_api.tasks.flush_notifications': {'queue': 'notifications'},
+    'event_api.tasks.send_event_reminders': {'queue': 'notifications'},
+}
+# Registration mail is queued in the database and sent by flush_notifications in batches of BATCH_SIZE over
+# one connection, at the latest FLUSH_INTERVAL seconds later. A batch is claimed for CLAIM_TIMEOUT seconds,
+# which must cover sending it; the messages of a worker that died mid-batch wait that long.
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 100))
+NOTIFICATION_FLUSH_INTERVAL = float(os.getenv("NOTIFICATION_FLUSH_INTERVAL", 5))
+NOTIFICATION_CLAIM_TIMEOUT = int(os.getenv("NOTIFICATION_CLAIM_TIMEOUT", 600))
+CELERY_BEAT_SCHEDULE = {
+    'flush-notifications': {
+        'task': 'event_api.tasks.flush_notifications',
+        'schedule': NOTIFICATION_FLUSH_INTERVAL,
+    },
+    'schedule-event-reminders': {
+        'task': 'event_api.tasks.schedule_event_reminders',
+        'schedule': float(os.getenv("EVENT_REMINDER_SCAN_INTERVAL", 300)),
+    },
+}
+# Tasks of a worker that dies mid-run are redelivered; NOTIFICATION_IDEMPOTENCY keeps them from sending twice.
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+# Reserve one task per worker process, so a stalled SMTP call holds up one message instead of a prefetched batch.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_WORKER_PREFETCH_MULTIPLIER", 1))
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", '0') == '1'
+
+BULK_REGISTRATION_MAX_ITEMS = 5000
+
+# Rows fetched per round trip when streaming participant exports.
+PARTICIPANT_EXPORT_CHUNK_SIZE = int(os.getenv("PARTICIPANT_EXPORT_CHUNK_SIZE", 2000))
+
+# "auto" picks the full-text backend for the database vendor, or a dotted path to a backend class.
+EVENT_SEARCH_BACKEND = os.getenv("EVENT_SEARCH_BACKEND", "auto")
 
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -125,4 +311,28 @@ EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
-DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
\ No newline at end of file
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+# Seconds before a blocked SMTP call fails (and is retried) instead of holding the worker.
+EMAIL_TIMEOUT = float(os.getenv("EMAIL_TIMEOUT", 10))
+
+NOTIFICATION_MAX_RETRIES = 5
+NOTIFICATION_RETRY_BACKOFF = 30
+# Members get a reminder HOURS_BEFORE an event; participants are enqueued CHUNK_SIZE per send task.
+EVENT_REMINDERS = {
+    'HOURS_BEFORE': float(os.getenv("EVENT_REMINDER_HOURS_BEFORE", 24)),
+    'CHUNK_SIZE': int(os.getenv("EVENT_REMINDER_CHUNK_SIZE", 500)),
+}
+# Keys of sent notifications, so a redelivered task skips messages it already sent. A send first claims
+# its key for CLAIM_TIMEOUT (longer than EMAIL_TIMEOUT plus rate limiting), and only a successful send
+# keeps it for TIMEOUT. The cache must be shared by all workers (Redis): workers refuse to start on a
+# local-memory cache. ALIAS may be empty to turn deduplication off.
+NOTIFICATION_IDEMPOTENCY = {
+    'ALIAS': os.getenv("NOTIFICATION_IDEMPOTENCY_CACHE_ALIAS", 'default'),
+    'CLAIM_TIMEOUT': int(os.getenv("NOTIFICATION_IDEMPOTENCY_CLAIM_TIMEOUT", 300)),
+    'TIMEOUT': int(os.getenv("NOTIFICATION_IDEMPOTENCY_TIMEOUT", 7 * 24 * 3600)),
+}
+# Messages per second, keyed by mail host; "default" applies to every other backend.
+NOTIFICATION_RATE_LIMITS = {
+    'smtp.gmail.com': 10,
+    'default': None,
+}
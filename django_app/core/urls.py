@@ -1,10 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 from event_api.swagger import urlpatterns as swagger_urls
+from event_api.views import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/", include("event_api.urls")),
+    path("metrics", metrics, name="metrics"),
 ]
 
 urlpatterns += swagger_urls
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import CustomUser, Event, EventParticipant
+from .models import CustomUser, Event, EventParticipant, EventReminder, PendingNotification, ReminderDelivery
 
 
 @admin.register(CustomUser)
@@ -18,3 +18,18 @@ class EvenAdmin(admin.ModelAdmin):
 class EventParticipantAdmin(admin.ModelAdmin):
     list_display = ['event', 'member']
 
+
+@admin.register(EventReminder)
+class EventReminderAdmin(admin.ModelAdmin):
+    list_display = ["event", "event_date", "status", "enqueued"]
+
+
+@admin.register(ReminderDelivery)
+class ReminderDeliveryAdmin(admin.ModelAdmin):
+    list_display = ["reminder", "member", "status", "attempts", "at_updated"]
+    list_filter = ["status"]
+
+
+@admin.register(PendingNotification)
+class PendingNotificationAdmin(admin.ModelAdmin):
+    list_display = ["subject", "to", "attempts", "available_at"]
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class EventApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'event_api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from . import task_metrics  # noqa: F401
+        from django.db.backends.signals import connection_created
+
+        from .performance import install_query_recorder, instrument_serializers
+
+        instrument_serializers()
+        connection_created.connect(install_query_recorder, dispatch_uid="event_api.record_query")
@@ -0,0 +1,175 @@
+import json
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
+from rest_framework import exceptions, status
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from .authentication import ClaimsJWTAuthentication, ClaimsRefreshToken
+from .fast_serializers import EventParticipantValuesSerializer, EventValuesSerializer
+from .hashers import amake_password, averify_password
+from .models import CustomUser, Event, EventParticipant
+from .pagination import EventAPIPagination
+from .parsers import ORJSONParser
+from .permissions import CanManageEvent, can_expand_members, expands_members
+from .renderers import ORJSONRenderer
+from .serializers import EventParticipantSerializer, EventSerializer, LoginCredentialsSerializer, \
+    requested_expansions, requested_fields
+from .tasks import queue_invitations
+from .views import EventListAPIView, EventParticipantListAPIView
+
+
+def parse_body(request):
+    if request.content_type == "application/json":
+        return json.loads(request.body or b"{}")
+    return request.POST
+
+
+def render(data, status=status.HTTP_200_OK, headers=None):
+    return HttpResponse(ORJSONRenderer().render(data), content_type="application/json", status=status,
+                        headers=headers)
+
+
+def api_view(view):
+    """
+    Async counterpart of DRF's APIView for the views below: wraps the request in a DRF Request,
+    authenticates it with the JWT authentication of the sync API (the user status lookup runs in
+    a thread) and renders API exceptions the way DRF does.
+    """
+    authentication = ClaimsJWTAuthentication()
+
+    @csrf_exempt
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        request = Request(request, parsers=[ORJSONParser(), FormParser(), MultiPartParser()])
+        try:
+            authenticated = await sync_to_async(authentication.authenticate)(request)
+            if authenticated is None:
+                raise exceptions.NotAuthenticated()
+            request.user = authenticated[0]
+            return await view(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(exc, {"request": request})
+            if response is None:
+                raise
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response.status_code = status.HTTP_401_UNAUTHORIZED
+                response["WWW-Authenticate"] = authentication.authenticate_header(request)
+            headers = {name: value for name, value in response.items() if name.lower() != "content-type"}
+            return render(response.data, status=response.status_code, headers=headers)
+
+    return wrapper
+
+
+def filter_queryset(view_class, request, queryset):
+    """Apply the filter backends of a sync list view; none of them run queries themselves."""
+    view = view_class(request=request, format_kwarg=None)
+    for backend in view.filter_backends:
+        queryset = backend().filter_queryset(request, queryset, view)
+    return queryset
+
+
+async def paginated(view_class, request, queryset, serializer_class):
+    paginator = EventAPIPagination()
+    page = await paginator.apaginate_queryset(queryset, request, view=view_class)
+    return render(paginator.get_paginated_response(serializer_class(page, many=True).data).data)
+
+
+@require_GET
+@api_view
+async def event_list(request):
+    fields = requested_fields(request, EventSerializer)
+    queryset = filter_queryset(EventListAPIView, request, Event.objects.all())
+    return await paginated(EventListAPIView, request, EventValuesSerializer(fields=fields).values(queryset),
+                           partial(EventValuesSerializer, fields=fields))
+
+
+@require_GET
+@api_view
+async def event_detail(request, pk):
+    try:
+        event = await Event.objects.with_caller_role(request.user.id).aget(pk=pk)
+    except Event.DoesNotExist:
+        raise exceptions.NotFound("No Event matches the given query.")
+
+    permission = CanManageEvent()
+    if not await sync_to_async(permission.has_object_permission)(request, None, event):
+        raise exceptions.PermissionDenied(getattr(permission, "message", None))
+    return render(EventSerializer(event).data)
+
+
+@require_http_methods(["GET", "POST"])
+@api_view
+async def participant_list(request):
+    if request.method == "GET":
+        expand = requested_expansions(request, EventParticipantSerializer)
+        fields = requested_fields(request, EventParticipantSerializer)
+        if expands_members(expand, fields) and not await sync_to_async(can_expand_members)(request):
+            raise exceptions.PermissionDenied(
+                "Expanding member is limited to staff and the organizers of the ?event= listed.")
+        queryset = filter_queryset(EventParticipantListAPIView, request, EventParticipant.objects.all())
+        if expand:
+            return await paginated(EventParticipantListAPIView, request, queryset.select_related(*expand),
+                                   partial(EventParticipantSerializer, expand=expand, fields=fields))
+        return await paginated(EventParticipantListAPIView, request,
+                               EventParticipantValuesSerializer(fields=fields).values(queryset),
+                               partial(EventParticipantValuesSerializer, fields=fields))
+
+    serializer = EventParticipantSerializer(data=request.data)
+    # The related field validation looks up the event and the member.
+    await sync_to_async(serializer.is_valid)(raise_exception=True)
+    try:
+        participant = await sync_to_async(register_participant)(request, serializer)
+    except IntegrityError:
+        return render({"detail": "You are already registered for this event."})
+    return render(EventParticipantSerializer(participant).data, status=status.HTTP_201_CREATED)
+
+
+def register_participant(request, serializer):
+    # The insert, the counter update and the invitation commit together, as in EventParticipantListAPIView.
+    with transaction.atomic():
+        participant = serializer.save()
+        if participant.role == "member":
+            full_name = f"{request.user.first_name} + {request.user.last_name}"
+            queue_invitations([(request.user.email, full_name, serializer.validated_data["event"].date)])
+    return participant
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    """
+    Async counterpart of UserLoginAPIView. Password checks (and rehashing to the preferred
+    hasher) run in the bounded hashing pool so the event loop keeps serving other requests.
+    """
+    try:
+        data = parse_body(request)
+    except ValueError:
+        return JsonResponse({"detail": "JSON parse error."}, status=400)
+
+    serializer = LoginCredentialsSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    email, password = serializer.validated_data["email"], serializer.validated_data["password"]
+
+    user = await CustomUser.objects.filter(email=email).afirst()
+    if user is None:
+        # Hash anyway so the response time does not tell which emails are registered.
+        await amake_password(password)
+        return JsonResponse({"detail": "Invalid credentials"}, status=401)
+
+    encoded = await averify_password(password, user.password)
+    if encoded is None:
+        return JsonResponse({"detail": "Invalid credentials"}, status=401)
+    if encoded != user.password:
+        user.password = encoded
+        await user.asave(update_fields=["password"])
+
+    refresh = ClaimsRefreshToken.for_user(user)
+    return JsonResponse({"refresh": str(refresh), "access": str(refresh.access_token)})
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import CustomUser
+
+USER_CLAIMS = ("is_staff", "email", "first_name", "last_name")
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token carrying the user fields our views need, copied into its access tokens too."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class ClaimsTokenUser(TokenUser):
+    """
+    ``request.user`` built from the token claims. Attributes that are not claims (or claims
+    missing from tokens issued before they were added) load the CustomUser row on first use.
+    """
+
+    @cached_property
+    def db_user(self):
+        try:
+            return CustomUser.objects.get(pk=self.id)
+        except CustomUser.DoesNotExist:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+    @cached_property
+    def is_staff(self):
+        return self._claim("is_staff")
+
+    def _claim(self, name):
+        if name in self.token:
+            return self.token[name]
+        return getattr(self.db_user, name)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if attr in USER_CLAIMS:
+            return self._claim(attr)
+        return getattr(self.db_user, attr)
+
+    def __str__(self):
+        return f"{self.first_name} {self.last_name}"
+
+
+def get_status_cache():
+    return caches[settings.JWT_USER_STATUS_CACHE["ALIAS"]]
+
+
+def _status_key(user_id):
+    return f"jwt_user_status:{user_id}"
+
+
+def get_user_status(user_id):
+    """``(is_active, is_staff)`` for a user, cached for a few seconds; unknown users are inactive."""
+    cache = get_status_cache()
+    status = cache.get(_status_key(user_id))
+    if status is None:
+        # From the primary even in replica-routed requests, since the status is cached for every process.
+        row = CustomUser.objects.using("default").filter(pk=user_id).values_list("is_active", "is_staff").first()
+        status = tuple(row) if row else (False, False)
+        cache.set(_status_key(user_id), status, timeout=settings.JWT_USER_STATUS_CACHE["TIMEOUT"])
+    return status
+
+
+def forget_user_status(user_id):
+    get_status_cache().delete(_status_key(user_id))
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT authentication without loading the user row on every request. The only per-request
+    lookup is the cached user status, so deactivation and staff changes apply within
+    JWT_USER_STATUS_CACHE["TIMEOUT"] seconds (immediately on the same cache).
+    """
+
+    def get_user(self, validated_token):
+        user = ClaimsTokenUser(super().get_user(validated_token).token)
+
+        is_active, is_staff = get_user_status(user.id)
+        if not is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        # The status is fresher than the claim baked into the token.
+        user.is_staff = is_staff
+        return user
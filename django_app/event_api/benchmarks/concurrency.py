@@ -0,0 +1,78 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+from event_api.authentication import ClaimsRefreshToken
+
+from .runner import build_context, percentile
+
+
+async def _request(url, headers, slow):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    try:
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        writer.write(f"GET {path} HTTP/1.1\r\n".encode())
+        await writer.drain()
+        if slow:
+            # A slow client keeps the connection (and a WSGI worker thread) busy before finishing the request.
+            await asyncio.sleep(slow)
+        lines = [f"Host: {parts.netloc}", "Connection: close", *(f"{k}: {v}" for k, v in headers.items())]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def _run_target(url, headers, clients, requests_per_client, slow):
+    latencies = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            try:
+                status = await _request(url, headers, slow)
+            except (OSError, ValueError, IndexError):
+                status = None
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    total = clients * requests_per_client
+    return {
+        "url": url,
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(total / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def run_concurrency_benchmark(targets, clients=200, requests_per_client=5, slow=0.0, token=None):
+    """
+    Hit running deployments (e.g. ``{"wsgi": ".../api/events/", "asgi": ".../api/async/events/"}``)
+    with ``clients`` concurrent connections each, optionally slow ones. The servers must use the
+    same SECRET_KEY and database as this process, so the benchmark user's token is accepted.
+    """
+    if token is None:
+        token = ClaimsRefreshToken.for_user(build_context()["user"]).access_token
+    headers = {"Authorization": f"Bearer {token}"}
+
+    results = {}
+    for name, url in targets.items():
+        results[name] = asyncio.run(_run_target(url, headers, clients, requests_per_client, slow))
+
+    return {
+        "meta": {"clients": clients, "requests_per_client": requests_per_client, "slow_seconds": slow},
+        "results": results,
+    }
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.test.utils import override_settings
+
+from event_api.list_cache import list_cache_hits, list_cache_misses, reset_list_cache
+
+from .runner import build_context, database_profile, default_scenarios, run_scenario
+
+LIST_SCENARIOS = ("events_list", "events_list_deep_page", "events_list_cursor", "events_search")
+
+
+def run_list_cache_benchmark(requests=200, warmup=10):
+    """Time the events listing scenarios with the response cache disabled and then enabled."""
+    context = build_context()
+    scenarios = [scenario for scenario in default_scenarios(context) if scenario.name in LIST_SCENARIOS]
+
+    uncached = {}
+    with override_settings(EVENT_LIST_CACHE={**settings.EVENT_LIST_CACHE, "ALIAS": None}):
+        for scenario in scenarios:
+            uncached[scenario.name] = run_scenario(scenario, context, requests=requests, warmup=warmup)
+
+    reset_list_cache()
+    list_cache_hits.reset()
+    list_cache_misses.reset()
+    cached = {}
+    for scenario in scenarios:
+        cached[scenario.name] = run_scenario(scenario, context, requests=requests, warmup=warmup)
+
+    return {
+        "meta": {
+            "database": database_profile(),
+            "cache": settings.CACHES[settings.EVENT_LIST_CACHE["ALIAS"]]["BACKEND"],
+            "requests": requests,
+            "warmup": warmup,
+            "hits": list_cache_hits.value(),
+            "misses": list_cache_misses.value(),
+        },
+        "results": {
+            name: {
+                "uncached": uncached[name],
+                "cached": cached[name],
+                "p50_speedup": round(uncached[name]["p50_ms"] / cached[name]["p50_ms"], 2)
+                if cached[name]["p50_ms"] else None,
+            }
+            for name in cached
+        },
+    }
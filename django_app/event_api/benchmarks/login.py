@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from event_api.hashers import shutdown_hashing_executor
+from event_api.models import CustomUser
+
+from .runner import database_profile
+from .seed import BENCHMARK_EMAIL_DOMAIN, BENCHMARK_PASSWORD
+
+
+def _available_cpus():
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+def _profile_hashers(profile):
+    preferred = settings.PASSWORD_HASHER_PROFILES[profile]
+    return [preferred] + [hasher for hasher in settings.PASSWORD_HASHERS if hasher != preferred]
+
+
+def _report(logins, elapsed, cores, errors):
+    rate = logins / elapsed if elapsed else 0.0
+    return {
+        "logins": logins,
+        "errors": errors,
+        "cores": cores,
+        "logins_per_sec": round(rate, 2),
+        "logins_per_sec_per_core": round(rate / cores, 2),
+    }
+
+
+def _time_sync(email, logins):
+    client = APIClient()
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(logins):
+        if client.post("/api/login/", {"email": email, "password": BENCHMARK_PASSWORD}).status_code != 200:
+            errors += 1
+    return _report(logins, time.perf_counter() - started, 1, errors)
+
+
+async def _async_logins(email, logins, concurrency):
+    client = AsyncClient()
+    remaining = iter(range(logins))
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            response = await client.post("/api/async/login/", {"email": email, "password": BENCHMARK_PASSWORD},
+                                         content_type="application/json")
+            if response.status_code != 200:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return errors
+
+
+def _time_async(email, logins, concurrency):
+    started = time.perf_counter()
+    errors = async_to_sync(_async_logins)(email, logins, concurrency)
+    cores = min(settings.PASSWORD_HASHING_EXECUTOR["MAX_WORKERS"], _available_cpus())
+    return _report(logins, time.perf_counter() - started, cores, errors)
+
+
+def run_login_benchmark(logins=50, concurrency=8, profiles=("pbkdf2", "scrypt")):
+    """
+    Logins per second through the synchronous view (the "before") and the async view with the
+    hashing pool, for every hasher profile. The benchmark user's password is rehashed per profile.
+    """
+    user = CustomUser.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").order_by("id").first()
+    if user is None:
+        raise ValueError("No benchmark data found, run the seed_benchmark command first")
+
+    results = {}
+    for profile in profiles:
+        with override_settings(PASSWORD_HASHERS=_profile_hashers(profile)):
+            CustomUser.objects.filter(pk=user.pk).update(password=make_password(BENCHMARK_PASSWORD))
+            results[profile] = {
+                "sync": _time_sync(user.email, logins),
+                "async_pool": _time_async(user.email, logins, concurrency),
+            }
+        shutdown_hashing_executor()
+
+    return {
+        "meta": {
+            "database": database_profile(),
+            "executor": settings.PASSWORD_HASHING_EXECUTOR,
+            "pbkdf2_iterations": settings.PASSWORD_PBKDF2_ITERATIONS,
+            "concurrency": concurrency,
+            "cpus": _available_cpus(),
+        },
+        "results": results,
+    }
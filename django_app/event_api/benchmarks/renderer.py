@@ -0,0 +1,66 @@
+import time
+
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from event_api.fast_serializers import EventParticipantValuesSerializer
+from event_api.models import EventParticipant
+from event_api.renderers import ORJSONRenderer, use_orjson
+
+from .runner import Scenario, build_context, database_profile, default_scenarios, percentile, run_scenario
+
+BACKENDS = ("stdlib", "orjson")
+ENDPOINT_SCENARIOS = ("events_list", "event_detail", "participants_list", "participants_by_event", "list_users")
+
+
+def _time_render(renderer, data, repeat):
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        renderer.render(data)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": round(percentile(latencies, 50), 3), "p95_ms": round(percentile(latencies, 95), 3)}
+
+
+def run_renderer_benchmark(requests=200, warmup=10, rows=1000):
+    """
+    Time the JSON endpoints and a participant export with API_JSON_BACKEND set to each backend, and
+    the rendering of one ``rows`` long participants page with JSONRenderer and ORJSONRenderer.
+    """
+    context = build_context()
+    scenarios = [scenario for scenario in default_scenarios(context) if scenario.name in ENDPOINT_SCENARIOS]
+    scenarios.append(Scenario("participants_export", "get",
+                              f"/api/event/{context['event_id']}/participants/export/?export_format=ndjson"))
+
+    endpoints = {}
+    for backend in BACKENDS:
+        with override_settings(API_JSON_BACKEND=backend):
+            for scenario in scenarios:
+                result = run_scenario(scenario, context, requests=requests, warmup=warmup)
+                endpoints.setdefault(scenario.name, {})[backend] = result
+
+    page = EventParticipantValuesSerializer(
+        list(EventParticipantValuesSerializer().values(EventParticipant.objects.order_by("id")[:rows]))).data
+    data = {"count": len(page), "next": None, "previous": None, "results": page}
+    with override_settings(API_JSON_BACKEND="orjson"):
+        identical = JSONRenderer().render(data) == ORJSONRenderer().render(data)
+        rendering = {"stdlib": _time_render(JSONRenderer(), data, requests),
+                     "orjson": _time_render(ORJSONRenderer(), data, requests)}
+
+    return {
+        "meta": {
+            "database": database_profile(),
+            "orjson": use_orjson(),
+            "requests": requests,
+            "warmup": warmup,
+            "rows": len(page),
+        },
+        "results": {
+            "endpoints": {
+                name: {**results, "p50_speedup": round(results["stdlib"]["p50_ms"] / results["orjson"]["p50_ms"], 2)
+                       if results["orjson"]["p50_ms"] else None}
+                for name, results in endpoints.items()
+            },
+            "page_rendering": {**rendering, "byte_identical": identical},
+        },
+    }
@@ -0,0 +1,220 @@
+import math
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from event_api.authentication import ClaimsRefreshToken
+from event_api.models import CustomUser, Event, EventParticipant
+
+from .seed import BENCHMARK_EMAIL_DOMAIN, BENCHMARK_PASSWORD
+
+
+class Scenario:
+    def __init__(self, name, method, path, data=None, authenticated=True, rollback=False, expected_status=200):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.authenticated = authenticated
+        self.rollback = rollback
+        self.expected_status = expected_status
+
+
+def default_scenarios(context):
+    return [
+        Scenario("events_list", "get", "/api/events/"),
+        Scenario("events_list_deep_page", "get", f"/api/events/?page={context['deep_events_page']}"),
+        Scenario("events_list_cursor", "get", "/api/events/?pagination=cursor"),
+        Scenario("events_search", "get", "/api/events/?search=Workshop"),
+        Scenario("event_detail", "get", f"/api/event/{context['event_id']}/"),
+        Scenario("participants_list", "get", "/api/participants/"),
+        Scenario("participants_by_event", "get", f"/api/participants/?event={context['event_id']}"),
+        Scenario("participants_by_event_cursor", "get",
+                 f"/api/participants/?event={context['event_id']}&pagination=cursor"),
+        Scenario("participant_detail", "get", f"/api/participants/{context['participant_id']}/"),
+        Scenario("participant_register", "post", "/api/participants/",
+                 data={"event": context["event_id"], "member": context["outsider_id"], "role": "organizer"},
+                 rollback=True, expected_status=201),
+        Scenario("list_users", "get", "/api/list_users/"),
+        Scenario("user_detail", "get", f"/api/user/{context['user_id']}/"),
+        Scenario("login", "post", "/api/login/", authenticated=False,
+                 data={"email": context["email"], "password": BENCHMARK_PASSWORD}),
+    ]
+
+
+def build_context():
+    organizer = (EventParticipant.objects
+                 .filter(role="organizer", member__email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}")
+                 .select_related("member").order_by("id").first())
+    if organizer is None:
+        raise ValueError("No benchmark data found, run the seed_benchmark command first")
+
+    participant = (EventParticipant.objects.filter(event_id=organizer.event_id)
+                   .exclude(id=organizer.id).order_by("id").first()) or organizer
+    outsider = (CustomUser.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}")
+                .exclude(participant__event_id=organizer.event_id).order_by("id").first())
+    staff = CustomUser.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}", is_staff=True).first()
+
+    return {
+        "user": organizer.member,
+        "user_id": organizer.member_id,
+        "email": organizer.member.email,
+        "staff": staff or organizer.member,
+        "event_id": organizer.event_id,
+        "participant_id": participant.id,
+        "outsider_id": outsider.id if outsider else organizer.member_id,
+        "deep_events_page": max(1, Event.objects.count() // settings.REST_FRAMEWORK["PAGE_SIZE"]),
+    }
+
+
+def percentile(samples, percent):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _perform(client, scenario):
+    call = getattr(client, scenario.method)
+    if not scenario.rollback:
+        return call(scenario.path, scenario.data, format="json") if scenario.data else call(scenario.path)
+
+    response = None
+    try:
+        with transaction.atomic():
+            response = call(scenario.path, scenario.data, format="json")
+            raise _Rollback
+    except _Rollback:
+        pass
+    return response
+
+
+def _client_for(scenario, context):
+    client = APIClient()
+    if scenario.authenticated:
+        user = context["staff"] if scenario.name == "list_users" else context["user"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {ClaimsRefreshToken.for_user(user).access_token}")
+    return client
+
+
+def _timed_requests(client, scenario, requests):
+    latencies = []
+    errors = 0
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = _perform(client, scenario)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        if response.status_code != scenario.expected_status:
+            errors += 1
+    return latencies, errors
+
+
+def _threaded_requests(scenario, context, requests):
+    client = _client_for(scenario, context)
+    try:
+        return _timed_requests(client, scenario, requests)
+    finally:
+        # Give this thread's connection back (to the pool, when one is configured).
+        connections.close_all()
+
+
+def run_scenario(scenario, context, requests=200, warmup=10, threads=1):
+    client = _client_for(scenario, context)
+
+    for _ in range(warmup):
+        _perform(client, scenario)
+
+    with CaptureQueriesContext(connection) as queries:
+        _perform(client, scenario)
+    query_count = len(queries)
+
+    started = time.perf_counter()
+    if threads > 1:
+        # Concurrent clients, each on its own database connection, to size connection pools.
+        shares = [requests // threads + (index < requests % threads) for index in range(threads)]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            outcomes = list(executor.map(lambda share: _threaded_requests(scenario, context, share), shares))
+        latencies = [latency for outcome in outcomes for latency in outcome[0]]
+        errors = sum(outcome[1] for outcome in outcomes)
+    else:
+        latencies, errors = _timed_requests(client, scenario, requests)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "method": scenario.method.upper(),
+        "path": scenario.path,
+        "requests": requests,
+        "errors": errors,
+        "queries": query_count,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(requests / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def database_profile():
+    """Database settings that matter when comparing reports, e.g. across pool sizes."""
+    settings_dict = connection.settings_dict
+    profile = {
+        "vendor": connection.vendor,
+        "conn_max_age": settings_dict["CONN_MAX_AGE"],
+        "conn_health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+        "pool": settings_dict["OPTIONS"].get("pool"),
+    }
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            profile["journal_mode"] = cursor.fetchone()[0]
+        profile["transaction_mode"] = settings_dict["OPTIONS"].get("transaction_mode")
+    return profile
+
+
+def run_benchmark(requests=200, warmup=10, only=None, threads=1):
+    context = build_context()
+    results = {}
+    for scenario in default_scenarios(context):
+        if only and scenario.name not in only:
+            continue
+        results[scenario.name] = run_scenario(scenario, context, requests=requests, warmup=warmup, threads=threads)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "database": database_profile(),
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "requests": requests,
+            "warmup": warmup,
+            "threads": threads,
+        },
+        "results": results,
+    }
+
+
+def compare_with_baseline(report, baseline, tolerance=0.2):
+    """Return a list of human readable regressions of ``report`` against ``baseline``."""
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        if current["queries"] > previous["queries"]:
+            regressions.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: errors {previous.get('errors', 0)} -> {current['errors']}")
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+    return regressions
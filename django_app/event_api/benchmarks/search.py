@@ -0,0 +1,40 @@
+import time
+
+from event_api.models import Event
+from event_api.search import IcontainsSearchBackend, get_search_backend
+
+from .runner import database_profile, percentile
+
+DEFAULT_TERMS = ["workshop", "conference kiev", "topic 42", "hackathon online", "retrospective"]
+
+
+def _time_backend(backend, terms, repeat, page_size):
+    latencies = []
+    matches = {}
+    for term in terms:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = list(backend.search(Event.objects.all(), term)[:page_size])
+            latencies.append((time.perf_counter() - started) * 1000)
+        matches[term] = len(rows)
+    return {
+        "queries": len(terms) * repeat,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "first_page_matches": matches,
+    }
+
+
+def run_search_benchmark(terms=None, repeat=20, page_size=10):
+    """Compare the old SearchFilter behaviour (icontains on title and location) with the search backend."""
+    terms = terms or DEFAULT_TERMS
+    backend = get_search_backend()
+    return {
+        "meta": {"database": database_profile(), "backend": type(backend).__name__, "terms": terms, "repeat": repeat},
+        "results": {
+            "search_filter_icontains": _time_backend(IcontainsSearchBackend(fields=("title", "location")),
+                                                     terms, repeat, page_size),
+            "search_backend": _time_backend(backend, terms, repeat, page_size),
+        },
+    }
@@ -0,0 +1,89 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from event_api.models import CustomUser, Event, EventParticipant
+
+BENCHMARK_PASSWORD = "BenchPass2025"
+BENCHMARK_EMAIL_DOMAIN = "bench.example.com"
+
+BASE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+LOCATIONS = ["Kiev", "Lviv", "Odesa", "Kharkiv", "Dnipro", "Warsaw", "Berlin", "Prague", "Vienna", "Online"]
+TOPICS = ["Daily meeting", "Tech talk", "Workshop", "Conference", "Meetup", "Hackathon", "Webinar", "Retrospective"]
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bulk_insert(model, objects, batch_size):
+    created = 0
+    for batch in _batched(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+    return created
+
+
+def flush_benchmark_data():
+    EventParticipant.objects.filter(member__email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").delete()
+    Event.objects.filter(description__startswith="[bench]").delete()
+    CustomUser.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}").delete()
+
+
+def seed_benchmark_data(users=100_000, events=50_000, participants_per_event=60, batch_size=5000, seed=42):
+    """Insert a deterministic dataset; returns the number of rows created per model."""
+    if participants_per_event > users:
+        raise ValueError("participants_per_event cannot exceed the number of users")
+
+    rng = random.Random(seed)
+    password = make_password(BENCHMARK_PASSWORD)
+
+    users_created = _bulk_insert(CustomUser, (
+        CustomUser(email=f"user{i}@{BENCHMARK_EMAIL_DOMAIN}", first_name=f"First{i}", last_name=f"Last{i}",
+                   password=password, is_staff=(i == 0))
+        for i in range(users)
+    ), batch_size)
+
+    events_created = _bulk_insert(Event, (
+        Event(title=f"{rng.choice(TOPICS)} #{i}",
+              description=f"[bench] {rng.choice(TOPICS)} about topic {rng.randrange(1000)} in {rng.choice(LOCATIONS)}",
+              date=BASE_DATE + timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 2)),
+              location=rng.choice(LOCATIONS),
+              # Participants are bulk inserted below, which bypasses the counter signals.
+              organizers_count=min(1, participants_per_event),
+              members_count=max(0, participants_per_event - 1))
+        for i in range(events)
+    ), batch_size)
+
+    user_ids = list(CustomUser.objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}")
+                    .order_by("id").values_list("id", flat=True))
+    event_ids = list(Event.objects.filter(description__startswith="[bench]")
+                     .order_by("id").values_list("id", flat=True))
+
+    def participants():
+        stride = max(1, len(user_ids) // max(1, len(event_ids)))
+        for index, event_id in enumerate(event_ids):
+            start = (index * stride) % len(user_ids)
+            for offset in range(participants_per_event):
+                member_id = user_ids[(start + offset) % len(user_ids)]
+                yield EventParticipant(event_id=event_id, member_id=member_id,
+                                       role="organizer" if offset == 0 else "member")
+
+    participants_created = _bulk_insert(EventParticipant, participants(), batch_size)
+
+    return {
+        "users": users_created,
+        "events": events_created,
+        "participants": participants_created,
+    }
@@ -0,0 +1,71 @@
+import time
+
+from event_api.fast_serializers import EventParticipantValuesSerializer, EventValuesSerializer
+from event_api.models import Event, EventParticipant
+from event_api.serializers import EventParticipantSerializer, EventSerializer
+
+from .runner import database_profile, percentile
+
+TARGETS = {
+    "events": (Event, ("date", "id"), EventSerializer, EventValuesSerializer),
+    "participants": (EventParticipant, ("register_time", "id"), EventParticipantSerializer,
+                     EventParticipantValuesSerializer),
+}
+
+
+def _timed(render, repeat, rows):
+    fetch, serialize = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fetched = rows()
+        fetched_at = time.perf_counter()
+        render(fetched)
+        finished = time.perf_counter()
+        fetch.append((fetched_at - started) * 1000)
+        serialize.append((finished - fetched_at) * 1000)
+    return fetch, serialize
+
+
+def _summary(fetch, serialize, count):
+    # Reported per 1,000 rows so runs over different page sizes compare directly.
+    scale = 1000 / count
+    return {
+        "fetch_p50_ms": round(percentile(fetch, 50) * scale, 3),
+        "serialize_p50_ms": round(percentile(serialize, 50) * scale, 3),
+        "serialize_p95_ms": round(percentile(serialize, 95) * scale, 3),
+    }
+
+
+def run_serialization_benchmark(rows=1000, repeat=20, fields=None):
+    """
+    Render the first ``rows`` events and participants with the DRF serializers (model instances) and
+    with the ``.values()`` list serializers, optionally limited to ``fields``, per 1,000 rows.
+    """
+    results = {}
+    for name, (model, ordering, serializer_class, values_class) in TARGETS.items():
+        queryset = model.objects.order_by(*ordering)[:rows]
+        count = queryset.count()
+        if not count:
+            raise ValueError(f"No {name} to serialize, run seed_benchmark first")
+
+        target_fields = [field for field in fields or () if field in values_class.field_names()] or None
+        drf = _timed(lambda objects: serializer_class(objects, many=True, fields=target_fields).data, repeat,
+                     lambda: list(queryset.all()))
+        values = values_class(fields=target_fields)
+        fast = _timed(lambda page: values_class(page, fields=target_fields).data, repeat,
+                      lambda: list(values.values(queryset)))
+
+        drf_summary, fast_summary = _summary(*drf, count), _summary(*fast, count)
+        results[name] = {
+            "rows": count,
+            "fields": target_fields or list(values_class.field_names()),
+            "drf": drf_summary,
+            "values": fast_summary,
+            "serialize_speedup": round(drf_summary["serialize_p50_ms"] / fast_summary["serialize_p50_ms"], 2)
+            if fast_summary["serialize_p50_ms"] else None,
+        }
+
+    return {
+        "meta": {"database": database_profile(), "rows": rows, "repeat": repeat, "fields": fields},
+        "results": results,
+    }
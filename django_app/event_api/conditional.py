@@ -0,0 +1,41 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+
+def event_etag(event):
+    """
+    Strong ETag of a single event, derived from ``at_updated`` and the participant counters.
+
+    Events get no Last-Modified: registrations change the counters without touching ``at_updated``,
+    and a whole-second date cannot tell apart two updates in the same second, so If-Modified-Since
+    would answer 304 wrongly.
+    """
+    version = f"{event.at_updated.timestamp()}-{event.members_count}-{event.organizers_count}"
+    return quote_etag(f"event-{event.pk}-{version}")
+
+
+def event_list_etag(request, events, pagination=None):
+    """
+    ETag of one listing page, computed from the ``.values()`` rows already fetched for it: the
+    page's ids and ``at_updated`` values plus the pagination metadata (count, links), scoped to the
+    full query string. No extra query is needed and deletions change the ETag too.
+
+    Listings get no Last-Modified either: deleted events, counter changes and rows moving between
+    pages change a page without raising any ``at_updated``.
+    """
+    versions = [(event["id"], event["at_updated"].timestamp()) for event in events]
+    counters = [(event["members_count"], event["organizers_count"]) for event in events]
+    fingerprint = f"{request.get_full_path()}|{versions}|{counters}|{pagination}"
+    return quote_etag("events-" + hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+
+
+def conditional_response(request, etag):
+    """Return a 304/412 response when the request preconditions say so, otherwise ``None``."""
+    return get_conditional_response(request, etag=etag)
+
+
+def set_validators(response, etag):
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,72 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from .list_cache import bump_generation
+from .models import Event, EventParticipant
+
+COUNTER_FIELDS = {
+    "member": "members_count",
+    "organizer": "organizers_count",
+}
+
+
+def adjust_participant_counts(deltas):
+    """
+    Apply ``{(event_id, role): delta}`` to the denormalized counters with a single UPDATE.
+
+    Counters are changed with F() expressions so concurrent registrations cannot lose updates.
+    """
+    per_field = {}
+    for (event_id, role), delta in deltas.items():
+        if delta:
+            field = COUNTER_FIELDS[role]
+            per_field.setdefault(field, Counter())[event_id] += delta
+
+    if not per_field:
+        return
+
+    event_ids = {event_id for changes in per_field.values() for event_id in changes}
+    updates = {
+        field: F(field) + Case(*[When(pk=event_id, then=Value(delta)) for event_id, delta in changes.items()],
+                               default=Value(0), output_field=IntegerField())
+        for field, changes in per_field.items()
+    }
+    Event.objects.filter(pk__in=event_ids).update(**updates)
+    bump_generation()
+
+
+def _participant_count(role):
+    participants = (EventParticipant.objects.filter(event=OuterRef("pk"), role=role)
+                    .order_by().values("event").annotate(total=Count("pk")).values("total"))
+    return Coalesce(Subquery(participants), Value(0))
+
+
+def reconcile_event_counters(batch_size=1000):
+    """
+    Recount participants for every event in primary key batches; returns the number of fixed events.
+
+    Each batch is locked (SELECT ... FOR UPDATE) and recounted in a single UPDATE ... SET = (SELECT COUNT(*)).
+    A registration adjusts the counter after inserting its row, so it waits for the lock and then adds to
+    a count that did not include its uncommitted row; nothing committed meanwhile is overwritten.
+    """
+    fixed = 0
+    last_id = 0
+    members, organizers = _participant_count("member"), _participant_count("organizer")
+    while True:
+        with transaction.atomic():
+            ids = list(Event.objects.select_for_update().filter(pk__gt=last_id).order_by("pk")
+                       .values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return fixed
+
+            drifted = (Event.objects.filter(pk__in=ids)
+                       .exclude(members_count=members, organizers_count=organizers)
+                       .update(members_count=members, organizers_count=organizers))
+            if drifted:
+                bump_generation()
+
+        fixed += drifted
+        last_id = ids[-1]
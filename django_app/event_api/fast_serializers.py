@@ -0,0 +1,86 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+
+from .performance import timed_serialization
+from .serializers import EventParticipantSerializer, EventSerializer
+
+
+@lru_cache(maxsize=None)
+def datetime_formatter(output_format, tz):
+    """
+    Render aware datetimes exactly like DRF's ``DateTimeField(format=output_format)`` in ``tz``,
+    without the per-value field lookups.
+    """
+    def convert(value):
+        return value.astimezone(tz) if tz is not None and timezone.is_aware(value) else value
+
+    if output_format is None:
+        return lambda value: value
+    if output_format.lower() == ISO_8601:
+        def render(value):
+            if value is None:
+                return None
+            value = convert(value).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        return render
+    return lambda value: None if value is None else convert(value).strftime(output_format)
+
+
+class ValuesListSerializer:
+    """
+    Read-only stand-in for ``serializer_class(rows, many=True)`` over ``.values()`` rows.
+
+    It returns the same dicts in the same key order as ``serializer_class``, optionally limited to
+    ``fields``, but skips the per-row serializer and field machinery. ``extra_values`` are columns the
+    list views read from the rows (ordering, validators) without rendering them.
+    """
+    serializer_class = None
+    extra_values = ()
+
+    def __init__(self, instance=None, many=True, fields=None):
+        self.instance = instance
+        self.fields = fields or self.field_names()
+
+    @classmethod
+    def field_names(cls):
+        if "_field_names" not in cls.__dict__:
+            cls._field_names = tuple(name for name, field in cls.serializer_class().fields.items()
+                                     if not field.write_only)
+        return cls._field_names
+
+    @classmethod
+    def datetime_formats(cls):
+        if "_datetime_formats" not in cls.__dict__:
+            # Fields without an explicit format follow api_settings.DATETIME_FORMAT at render time.
+            cls._datetime_formats = {name: getattr(field, "format", empty)
+                                     for name, field in cls.serializer_class().fields.items()
+                                     if isinstance(field, serializers.DateTimeField)}
+        return {name: api_settings.DATETIME_FORMAT if output_format is empty else output_format
+                for name, output_format in cls._datetime_formats.items()}
+
+    def values(self, queryset):
+        return queryset.values(*dict.fromkeys((*self.fields, *self.extra_values)))
+
+    @property
+    @timed_serialization
+    def data(self):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        formats = self.datetime_formats()
+        columns = [(name, datetime_formatter(formats[name], tz) if name in formats else None) for name in self.fields]
+        return [{name: row[name] if render is None else render(row[name]) for name, render in columns}
+                for row in self.instance]
+
+
+class EventValuesSerializer(ValuesListSerializer):
+    serializer_class = EventSerializer
+    extra_values = ("id", "date", "at_updated", "members_count", "organizers_count")
+
+
+class EventParticipantValuesSerializer(ValuesListSerializer):
+    serializer_class = EventParticipantSerializer
+    extra_values = ("id", "register_time")
@@ -1,4 +1,5 @@
 import django_filters
+from django.db.models.functions import Lower
 
 from .models import EventParticipant
 
@@ -6,8 +7,12 @@ from .models import EventParticipant
 class EventParticipantFilter(django_filters.FilterSet):
     event = django_filters.NumberFilter(field_name="event", lookup_expr="exact")
     member = django_filters.NumberFilter(field_name="member", lookup_expr="exact")
-    role = django_filters.CharFilter(field_name="role", lookup_expr="iexact")
+    role = django_filters.CharFilter(method="filter_role")
 
     class Meta:
         model = EventParticipant
-        fields = ['event', 'member', 'role']
\ No newline at end of file
+        fields = ['event', 'member', 'role']
+
+    def filter_role(self, queryset, name, value):
+        # Case-insensitive match that can use the Lower("role") index, unlike iexact.
+        return queryset.alias(role_lower=Lower("role")).filter(role_lower=value.lower())
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password, get_hasher, identify_hasher, \
+    make_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 with the iteration count from PASSWORD_PBKDF2_ITERATIONS; changing it rehashes on login."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+def verify_password(password, encoded):
+    """
+    Check ``password`` against ``encoded``. Returns ``None`` when it does not match, otherwise the
+    hash to store: ``encoded`` itself, or a new hash when the preferred hasher or its cost changed.
+    """
+    if not check_password(password, encoded):
+        return None
+    preferred = get_hasher("default")
+    if identify_hasher(encoded).algorithm != preferred.algorithm or preferred.must_update(encoded):
+        return make_password(password)
+    return encoded
+
+
+def _setup_worker():
+    django.setup()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor():
+    """Bounded pool for password hashing, configured by PASSWORD_HASHING_EXECUTOR."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            config = settings.PASSWORD_HASHING_EXECUTOR
+            if config["KIND"] == "process":
+                _executor = ProcessPoolExecutor(max_workers=config["MAX_WORKERS"], initializer=_setup_worker)
+            else:
+                _executor = ThreadPoolExecutor(max_workers=config["MAX_WORKERS"], thread_name_prefix="hashing")
+        return _executor
+
+
+def shutdown_hashing_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+@receiver(setting_changed)
+def reset_hashing_executor(setting, **kwargs):
+    if setting in ("PASSWORD_HASHING_EXECUTOR", "PASSWORD_HASHERS", "PASSWORD_PBKDF2_ITERATIONS"):
+        shutdown_hashing_executor()
+
+
+async def averify_password(password, encoded):
+    return await asyncio.get_running_loop().run_in_executor(get_hashing_executor(), verify_password,
+                                                            password, encoded)
+
+
+async def amake_password(password):
+    return await asyncio.get_running_loop().run_in_executor(get_hashing_executor(), make_password, password)
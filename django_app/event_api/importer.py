@@ -0,0 +1,212 @@
+import csv
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import adjust_participant_counts
+from .list_cache import bump_generation
+from .models import CustomUser, Event, EventParticipant, ImportCheckpoint
+from .roles import invalidate_event_role
+from .serializers import BulkRegistrationItemSerializer, EventImportSerializer, UserImportSerializer
+
+FORMATS = ("csv", "ndjson")
+
+
+def read_records(path, file_format=None):
+    """Yield one dict per record without loading the file; undecodable NDJSON lines yield ``None``."""
+    if file_format is None:
+        file_format = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+
+    with open(path, newline="", encoding="utf-8") as stream:
+        if file_format == "csv":
+            yield from csv.DictReader(stream)
+            return
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else None
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RecordImporter:
+    serializer_class = None
+    hashes_passwords = False
+
+    def validate(self, batch):
+        """Split ``[(number, record)]`` into validated rows and ``[(number, errors)]``."""
+        valid, errors = [], []
+        for number, record in batch:
+            if record is None:
+                errors.append((number, {"non_field_errors": ["Malformed record."]}))
+                continue
+            serializer = self.serializer_class(data=record)
+            if serializer.is_valid():
+                valid.append((number, serializer.validated_data))
+            else:
+                errors.append((number, serializer.errors))
+        return valid, errors
+
+    def build(self, rows, pool):
+        """Return ``(objects, skipped, errors)`` for the validated rows of one batch."""
+        raise NotImplementedError
+
+    def save(self, objects, batch_size):
+        """Insert ``objects`` and return the ones written."""
+        raise NotImplementedError
+
+    def after_commit(self, objects):
+        pass
+
+
+class UserImporter(RecordImporter):
+    serializer_class = UserImportSerializer
+    hashes_passwords = True
+
+    def build(self, rows, pool):
+        rows = [(number, {**data, "email": CustomUser.objects.normalize_email(data["email"])}) for number, data in rows]
+        seen = set(CustomUser.objects.filter(email__in=[data["email"] for _, data in rows])
+                   .values_list("email", flat=True))
+        new_rows = []
+        for number, data in rows:
+            if data["email"] not in seen:
+                seen.add(data["email"])
+                new_rows.append(data)
+
+        passwords = [data.pop("password") for data in new_rows]
+        if pool is None:
+            hashed = map(make_password, passwords)
+        else:
+            hashed = pool.map(make_password, passwords, chunksize=16)
+        objects = [CustomUser(password=password, **data) for data, password in zip(new_rows, hashed)]
+        return objects, len(rows) - len(objects), []
+
+    def save(self, objects, batch_size):
+        # Users signing up since the lookup in build() are skipped and not reported as created.
+        return CustomUser.objects.bulk_create_new(objects, batch_size=batch_size)
+
+
+class EventImporter(RecordImporter):
+    serializer_class = EventImportSerializer
+
+    def build(self, rows, pool):
+        return [Event(**data) for _, data in rows], 0, []
+
+    def save(self, objects, batch_size):
+        Event.objects.bulk_create(objects, batch_size=batch_size)
+        bump_generation()
+        return objects
+
+
+class ParticipantImporter(RecordImporter):
+    serializer_class = BulkRegistrationItemSerializer
+
+    def build(self, rows, pool):
+        event_ids = {data["event"] for _, data in rows}
+        member_ids = {data["member"] for _, data in rows}
+        events = set(Event.objects.filter(pk__in=event_ids).values_list("pk", flat=True))
+        members = set(CustomUser.objects.filter(pk__in=member_ids).values_list("pk", flat=True))
+        registered = set(EventParticipant.objects.filter(event_id__in=event_ids, member_id__in=member_ids)
+                         .values_list("event_id", "member_id"))
+
+        objects, errors, skipped = [], [], 0
+        for number, data in rows:
+            key = (data["event"], data["member"])
+            if data["event"] not in events:
+                errors.append((number, {"event": ["Event not found."]}))
+            elif data["member"] not in members:
+                errors.append((number, {"member": ["Member not found."]}))
+            elif key in registered:
+                skipped += 1
+            else:
+                registered.add(key)
+                objects.append(EventParticipant(event_id=data["event"], member_id=data["member"], role=data["role"]))
+        return objects, skipped, errors
+
+    def save(self, objects, batch_size):
+        # Registrations made since build() are skipped and left out of the counters, which they updated themselves.
+        inserted = EventParticipant.objects.bulk_create_new(objects, batch_size=batch_size)
+        # Bulk inserts do not send post_save, so counters are adjusted in the same transaction.
+        adjust_participant_counts(Counter((participant.event_id, participant.role) for participant in inserted))
+        return inserted
+
+    def after_commit(self, objects):
+        for participant in objects:
+            invalidate_event_role(participant.member_id, participant.event_id)
+
+
+IMPORTERS = {
+    "users": UserImporter,
+    "events": EventImporter,
+    "participants": ParticipantImporter,
+}
+
+
+def import_records(path, model, file_format=None, batch_size=1000, workers=None, checkpoint=None, restart=False,
+                   on_error=None, on_batch=None):
+    """
+    Import ``model`` records from a CSV or NDJSON file in batches of ``batch_size``.
+
+    Each batch is validated, inserted and recorded in its ImportCheckpoint inside one transaction,
+    so an interrupted run resumes after the last committed batch. Passwords are hashed before the
+    transaction starts, in a pool of ``workers`` processes (``0`` hashes in this process).
+    Returns the counters of this run: records, created, skipped, invalid, resumed_from and seconds.
+    """
+    importer = IMPORTERS[model]()
+    state, _ = ImportCheckpoint.objects.get_or_create(source=checkpoint or f"{model}:{os.path.abspath(path)}")
+    if restart:
+        state.records = 0
+        state.save(update_fields=["records", "at_updated"])
+
+    stats = Counter(resumed_from=state.records)
+    started = time.perf_counter()
+    records = islice(enumerate(read_records(path, file_format), start=1), state.records, None)
+    if importer.hashes_passwords and workers != 0:
+        pool_context = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+    else:
+        pool_context = nullcontext()
+
+    with pool_context as pool:
+        for batch in _batched(records, batch_size):
+            valid, errors = importer.validate(batch)
+            objects, skipped, missing = importer.build(valid, pool)
+            errors.extend(missing)
+
+            with transaction.atomic():
+                saved = importer.save(objects, batch_size)
+                ImportCheckpoint.objects.filter(pk=state.pk).update(records=batch[-1][0], at_updated=timezone.now())
+                transaction.on_commit(partial(importer.after_commit, saved))
+
+            skipped += len(objects) - len(saved)
+            stats.update(records=len(batch), created=len(saved), skipped=skipped, invalid=len(errors))
+            if on_error is not None:
+                for number, record_errors in sorted(errors, key=lambda error: error[0]):
+                    on_error(number, record_errors)
+            if on_batch is not None:
+                on_batch(stats, time.perf_counter() - started)
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
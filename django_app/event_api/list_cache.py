@@ -0,0 +1,86 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .metrics import counter
+from .routers import get_read_database
+
+GENERATION_KEY = "event_list:generation"
+
+list_cache_hits = counter("event_list_cache_hits_total", "Event listing pages served from the response cache")
+list_cache_misses = counter("event_list_cache_misses_total", "Event listing pages that had to be rendered")
+
+
+def get_list_cache():
+    alias = settings.EVENT_LIST_CACHE["ALIAS"]
+    return caches[alias] if alias else None
+
+
+def get_generation(cache):
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so a generation lost to eviction never matches keys cached before it.
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _bump():
+    cache = get_list_cache()
+    if cache is None:
+        return
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_generation():
+    """Invalidate every cached listing page."""
+    _bump()
+    if transaction.get_connection().in_atomic_block:
+        # Pages rendered before the commit could still be cached under the new generation.
+        transaction.on_commit(_bump)
+
+
+def list_cache_key(request):
+    """
+    Key for a listing page: host and path (pagination links are absolute), the query parameters
+    sorted by name, and the current generation. The generation is read before the page is queried
+    so a page rendered from data older than a bump is stored under the old generation.
+    """
+    cache = get_list_cache()
+    if cache is None:
+        return None
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    fingerprint = f"{request.get_host()}|{request.path}|{params}"
+    digest = hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest()
+    return f"event_list:{get_generation(cache)}:{digest}"
+
+
+def get_cached_page(key):
+    if key is None:
+        return None
+    page = get_list_cache().get(key)
+    (list_cache_hits if page is not None else list_cache_misses).inc()
+    return page
+
+
+def cache_page(key, page):
+    if key is None:
+        return
+    timeout = settings.EVENT_LIST_CACHE["TIMEOUT"]
+    if get_read_database() is not None:
+        # A lagging replica may have served data older than the generation; keep it no longer
+        # than the replication lag budget.
+        timeout = min(timeout, settings.REPLICA_PINNING["SECONDS"])
+    get_list_cache().set(key, page, timeout=timeout)
+
+
+def reset_list_cache():
+    cache = get_list_cache()
+    if cache is not None:
+        cache.delete(GENERATION_KEY)
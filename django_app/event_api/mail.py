@@ -0,0 +1,207 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .metrics import counter
+from .models import PendingNotification
+
+logger = logging.getLogger(__name__)
+
+duplicate_notifications = counter("notifications_duplicates_skipped_total",
+                                  "Notifications skipped because their idempotency key was already sent")
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` messages per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                self.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1
+                self._updated = self.clock()
+            self._tokens -= 1
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider):
+    limits = settings.NOTIFICATION_RATE_LIMITS
+    rate = limits.get(provider, limits.get("default"))
+    if not rate:
+        return None
+    with _rate_limiters_lock:
+        if provider not in _rate_limiters:
+            _rate_limiters[provider] = RateLimiter(rate)
+        return _rate_limiters[provider]
+
+
+def get_provider(connection):
+    return getattr(connection, "host", None) or "default"
+
+
+def message_to_notification(message):
+    return PendingNotification(subject=message.subject, body=message.body, from_email=message.from_email,
+                               to=message.to)
+
+
+def notification_to_message(notification):
+    message = EmailMessage(notification.subject, notification.body, notification.from_email, notification.to)
+    # A row is deleted once sent, so a flush that died after sending is stopped by the key instead.
+    message.idempotency_key = f"notification:{notification.pk}"
+    return message
+
+
+IN_FLIGHT = "in-flight"
+SENT = "sent"
+
+
+def idempotency_cache():
+    alias = settings.NOTIFICATION_IDEMPOTENCY["ALIAS"]
+    return caches[alias] if alias else None
+
+
+def check_idempotency_cache():
+    """Workers refuse to start when the idempotency keys would live in a per-process cache."""
+    if isinstance(idempotency_cache(), LocMemCache):
+        raise ImproperlyConfigured(
+            "NOTIFICATION_IDEMPOTENCY needs a cache shared by all workers; set REDIS_CACHE_URL, "
+            "or set NOTIFICATION_IDEMPOTENCY_CACHE_ALIAS to an empty string to turn it off.")
+
+
+def _idempotency_cache_key(message):
+    key = getattr(message, "idempotency_key", None)
+    return None if key is None or idempotency_cache() is None else f"notification-sent:{key}"
+
+
+def claim_delivery(message):
+    """
+    Reserve ``message``'s idempotency key for CLAIM_TIMEOUT seconds before sending it; False if it was
+    sent or another delivery holds it. The short claim lets a redelivery send a message whose worker died
+    mid-send. Messages without a key are always sent.
+    """
+    key = _idempotency_cache_key(message)
+    if key is None:
+        return True
+    return idempotency_cache().add(key, IN_FLIGHT, settings.NOTIFICATION_IDEMPOTENCY["CLAIM_TIMEOUT"])
+
+
+def confirm_delivery(message):
+    """Replace the claim with the long-lived "sent" marker once the message went out."""
+    key = _idempotency_cache_key(message)
+    if key is not None:
+        idempotency_cache().set(key, SENT, settings.NOTIFICATION_IDEMPOTENCY["TIMEOUT"])
+
+
+def was_delivered(message):
+    key = _idempotency_cache_key(message)
+    return key is not None and idempotency_cache().get(key) == SENT
+
+
+def release_delivery(message):
+    key = _idempotency_cache_key(message)
+    if key is not None:
+        idempotency_cache().delete(key)
+
+
+def deliver(messages, connection=None):
+    """
+    Send ``messages`` over one reused connection and return the ones that failed.
+    Messages whose idempotency key was already delivered, or is being delivered, are skipped.
+    Each message's ``delivered`` is set to whether it went out, now or in an earlier delivery.
+    """
+    connection = connection or get_connection(fail_silently=False)
+    rate_limiter = get_rate_limiter(get_provider(connection))
+    failed = []
+
+    with connection:
+        for message in messages:
+            message.delivered = False
+            if not claim_delivery(message):
+                logger.info("Skipping notification %s to %s, already sent or being sent", message.idempotency_key,
+                            ", ".join(message.to))
+                duplicate_notifications.inc()
+                message.delivered = was_delivered(message)
+                continue
+            if rate_limiter:
+                rate_limiter.acquire()
+            try:
+                connection.send_messages([message])
+            except Exception:
+                logger.exception("Failed to send notification to %s", ", ".join(message.to))
+                failed.append(message)
+                release_delivery(message)
+                # A broken SMTP session is reopened by the next send_messages call.
+                connection.close()
+            else:
+                confirm_delivery(message)
+                message.delivered = True
+
+    return failed
+
+
+def claim_notifications(limit, now=None):
+    """
+    Claim up to ``limit`` due notifications for NOTIFICATION_CLAIM_TIMEOUT seconds and return them.
+    Rows another flush holds are skipped (SELECT ... FOR UPDATE SKIP LOCKED).
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        # Range scan on notification_available_idx.
+        notifications = list(PendingNotification.objects.select_for_update(skip_locked=True)
+                             .filter(available_at__lte=now).order_by("available_at", "id")[:limit])
+        PendingNotification.objects.filter(pk__in=[notification.pk for notification in notifications]).update(
+            available_at=now + timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT))
+    return notifications
+
+
+def deliver_notifications(notifications, now=None):
+    """
+    Send claimed ``notifications`` over one connection and return how many were sent (or had been already).
+    Sent rows are deleted;
+    failed ones wait NOTIFICATION_RETRY_BACKOFF * 2 ** attempt seconds, until NOTIFICATION_MAX_RETRIES.
+    """
+    messages = [notification_to_message(notification) for notification in notifications]
+    failed = {id(message) for message in deliver(messages)}
+    now = now or timezone.now()
+
+    PendingNotification.objects.filter(pk__in=[
+        notification.pk for notification, message in zip(notifications, messages) if id(message) not in failed
+    ]).delete()
+    for notification, message in zip(notifications, messages):
+        if id(message) not in failed:
+            continue
+        notification.attempts += 1
+        if notification.attempts > settings.NOTIFICATION_MAX_RETRIES:
+            logger.error("Giving up on notification to %s after %d attempts", ", ".join(notification.to),
+                         notification.attempts)
+            notification.delete()
+            continue
+        notification.available_at = now + timedelta(
+            seconds=settings.NOTIFICATION_RETRY_BACKOFF * 2 ** (notification.attempts - 1))
+        notification.save(update_fields=["attempts", "available_at"])
+
+    return len(notifications) - len(failed)
@@ -0,0 +1,82 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from event_api.benchmarks.concurrency import run_concurrency_benchmark
+from event_api.benchmarks.list_cache import run_list_cache_benchmark
+from event_api.benchmarks.login import run_login_benchmark
+from event_api.benchmarks.renderer import run_renderer_benchmark
+from event_api.benchmarks.runner import compare_with_baseline, run_benchmark
+from event_api.benchmarks.search import run_search_benchmark
+from event_api.benchmarks.serialization import run_serialization_benchmark
+
+
+class Command(BaseCommand):
+    help = "Benchmark the event_api endpoints and report latency percentiles, throughput and query counts as JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--suite", choices=["endpoints", "search", "list_cache", "login", "concurrency",
+                                                     "serialization", "renderer"], default="endpoints")
+        parser.add_argument("--requests", type=int, default=200, help="Timed requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--only", nargs="*", help="Scenario names to run")
+        parser.add_argument("--threads", type=int, default=1,
+                            help="Concurrent clients per endpoint, each with its own connection (endpoints suite)")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent async logins (login suite)")
+        parser.add_argument("--profiles", nargs="*", default=["pbkdf2", "scrypt"],
+                            help="Password hasher profiles to compare (login suite)")
+        parser.add_argument("--target", action="append", default=[], metavar="NAME=URL",
+                            help="Deployment to load, e.g. asgi=http://localhost:8001/api/async/events/ "
+                                 "(concurrency suite)")
+        parser.add_argument("--clients", type=int, default=200, help="Concurrent clients (concurrency suite)")
+        parser.add_argument("--slow", type=float, default=0.0,
+                            help="Seconds each client stalls mid-request (concurrency suite)")
+        parser.add_argument("--rows", type=int, default=1000,
+                            help="Rows rendered per run (serialization and renderer suites)")
+        parser.add_argument("--fields", nargs="*", help="Sparse fieldset to render (serialization suite)")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+        parser.add_argument("--baseline", help="JSON report to compare against")
+        parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Allowed relative p95 increase over the baseline")
+
+    def handle(self, *args, **options):
+        try:
+            if options["suite"] == "search":
+                report = run_search_benchmark(repeat=options["requests"])
+            elif options["suite"] == "login":
+                report = run_login_benchmark(logins=options["requests"], concurrency=options["concurrency"],
+                                             profiles=options["profiles"])
+            elif options["suite"] == "concurrency":
+                targets = dict(target.split("=", 1) for target in options["target"])
+                if not targets:
+                    raise ValueError("The concurrency suite needs at least one --target NAME=URL")
+                report = run_concurrency_benchmark(targets, clients=options["clients"],
+                                                   requests_per_client=options["requests"], slow=options["slow"])
+            elif options["suite"] == "serialization":
+                report = run_serialization_benchmark(rows=options["rows"], repeat=options["requests"],
+                                                     fields=options["fields"])
+            elif options["suite"] == "renderer":
+                report = run_renderer_benchmark(requests=options["requests"], warmup=options["warmup"],
+                                                rows=options["rows"])
+            elif options["suite"] == "list_cache":
+                report = run_list_cache_benchmark(requests=options["requests"], warmup=options["warmup"])
+            else:
+                report = run_benchmark(requests=options["requests"], warmup=options["warmup"], only=options["only"],
+                                       threads=options["threads"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        content = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                output.write(content)
+        else:
+            self.stdout.write(content)
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare_with_baseline(report, baseline, tolerance=options["tolerance"])
+            if regressions:
+                raise CommandError("Benchmark regressions:\n" + "\n".join(regressions))
+            self.stderr.write(self.style.SUCCESS("No regressions against baseline"))
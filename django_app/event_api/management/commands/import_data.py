@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from event_api.importer import FORMATS, IMPORTERS, import_records
+
+
+class Command(BaseCommand):
+    help = "Import users, events or participants from a CSV or NDJSON file, resuming from the last checkpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to ndjson for .ndjson/.jsonl files, else csv")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Password hashing processes, 0 hashes in the command process")
+        parser.add_argument("--checkpoint", help="Checkpoint name, defaults to the model and absolute path")
+        parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start from the top")
+
+    def handle(self, *args, **options):
+        stats = import_records(
+            options["path"],
+            options["model"],
+            file_format=options["format"],
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            checkpoint=options["checkpoint"],
+            restart=options["restart"],
+            on_error=self.report_error,
+            on_batch=self.report_progress if options["verbosity"] > 1 else None,
+        )
+        if stats["resumed_from"]:
+            self.stdout.write(f"Resumed after record {stats['resumed_from']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['created']} {options['model']} ({stats['skipped']} skipped, {stats['invalid']} invalid) "
+            f"from {stats['records']} records in {stats['seconds']:.1f}s, {self.rate(stats, stats['seconds'])} rows/sec"
+        ))
+
+    def report_error(self, number, errors):
+        self.stderr.write(f"Record {number}: {errors}")
+
+    def report_progress(self, stats, seconds):
+        self.stdout.write(f"{stats['records']} records, {self.rate(stats, seconds)} rows/sec")
+
+    def rate(self, stats, seconds):
+        return f"{stats['records'] / seconds:.0f}" if seconds else "-"
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from event_api.counters import reconcile_event_counters
+
+
+class Command(BaseCommand):
+    help = "Recount event participants and repair drifted members_count/organizers_count values"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = reconcile_event_counters(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} events"))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from event_api.benchmarks.seed import flush_benchmark_data, seed_benchmark_data
+
+
+class Command(BaseCommand):
+    help = "Seed a deterministic users/events/participants dataset for the benchmark command"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--events", type=int, default=50_000)
+        parser.add_argument("--participants-per-event", type=int, default=60)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--flush", action="store_true", help="Delete previously seeded benchmark rows first")
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            flush_benchmark_data()
+
+        created = seed_benchmark_data(
+            users=options["users"],
+            events=options["events"],
+            participants_per_event=options["participants_per_event"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created['users']} users, {created['events']} events, "
+            f"{created['participants']} participants"
+        ))
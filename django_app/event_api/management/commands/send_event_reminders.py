@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from event_api.reminders import schedule_reminders
+
+
+class Command(BaseCommand):
+    help = "Enqueue reminders for events entering the reminder window, without Celery beat"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=None, help="Members per send task")
+        parser.add_argument("--interval", type=float, default=None,
+                            help="Keep scanning every INTERVAL seconds instead of running once")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = schedule_reminders(chunk_size=options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Enqueued reminders for {stats['members']} members of {stats['events']} events"))
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
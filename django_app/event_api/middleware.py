@@ -0,0 +1,199 @@
+import logging
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .performance import finish_request_stats, repeated_queries, request_db_duration, request_duration, \
+    request_queries, request_serializer_duration, requests_total, response_size, slow_requests, start_request_stats
+from .routers import choose_replica, reset_read_database, use_read_database
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "replica_pin"
+
+
+def _pin_key(user_id):
+    return f"replica_pin:{user_id}"
+
+
+def token_user_id(request):
+    """User id from the request's bearer token, without touching the database."""
+    header = request.META.get("HTTP_AUTHORIZATION", "").split()
+    if len(header) != 2 or header[0] not in jwt_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        return AccessToken(header[1])[jwt_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes safe-method requests to views with ``replica_reads = True`` to a read replica.
+
+    After a successful write the client is pinned to the primary for REPLICA_PINNING["SECONDS"]
+    (about the replication lag budget), through a cookie and a per-user cache marker, so it
+    reads its own writes.
+
+    It runs in the handler's mode, so ASGI requests are not moved to a thread for it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # The handler picks the process_view that matches its mode.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = use_read_database(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_read_database(token)
+
+        if self.should_pin(request, response):
+            user_id = self.pin(request, response)
+            if user_id is not None:
+                self.cache.set(_pin_key(user_id), 1, timeout=settings.REPLICA_PINNING["SECONDS"])
+        return response
+
+    async def __acall__(self, request):
+        token = use_read_database(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            reset_read_database(token)
+
+        if self.should_pin(request, response):
+            user_id = self.pin(request, response)
+            if user_id is not None:
+                await self.cache.aset(_pin_key(user_id), 1, timeout=settings.REPLICA_PINNING["SECONDS"])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.reads_replica(request, view_func) and not self.pinned_by_cookie(request):
+            user_id = token_user_id(request)
+            if user_id is None or self.cache.get(_pin_key(user_id)) is None:
+                use_read_database(choose_replica())
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self.reads_replica(request, view_func) and not self.pinned_by_cookie(request):
+            user_id = token_user_id(request)
+            if user_id is None or await self.cache.aget(_pin_key(user_id)) is None:
+                use_read_database(choose_replica())
+
+    def reads_replica(self, request, view_func):
+        view_class = getattr(view_func, "cls", None)
+        return request.method in SAFE_METHODS and getattr(view_class, "replica_reads", False)
+
+    def pinned_by_cookie(self, request):
+        return PIN_COOKIE in request.COOKIES
+
+    def should_pin(self, request, response):
+        return settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS and response.status_code < 400
+
+    def pin(self, request, response):
+        """Set the pin cookie; returns the user id whose cache marker the caller sets, if any."""
+        response.set_cookie(PIN_COOKIE, "1", max_age=settings.REPLICA_PINNING["SECONDS"], httponly=True,
+                            samesite="Lax")
+        return token_user_id(request)
+
+    @property
+    def cache(self):
+        return caches[settings.REPLICA_PINNING["ALIAS"]]
+
+
+class PerformanceMiddleware:
+    """
+    Records wall time, SQL query count and time, serializer time and response size per view into
+    the metrics registry (served on /metrics), and logs slow requests and statements repeated more
+    than REPEATED_QUERY_THRESHOLD times (usually an N+1). With SERVER_TIMING the numbers are also
+    sent in a Server-Timing header.
+
+    The cost per request is a context variable lookup per query and a few counter updates.
+    It runs in the handler's mode, so ASGI requests are not moved to a thread for it.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        config = settings.PERFORMANCE_MONITORING
+        if not config["ENABLED"]:
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        with self.collect() as stats:
+            response = self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - started, config)
+        return response
+
+    async def __acall__(self, request):
+        config = settings.PERFORMANCE_MONITORING
+        if not config["ENABLED"]:
+            return await self.get_response(request)
+
+        started = time.perf_counter()
+        with self.collect() as stats:
+            response = await self.get_response(request)
+        self.record(request, response, stats, time.perf_counter() - started, config)
+        return response
+
+    @contextmanager
+    def collect(self):
+        # Queries reach the stats through performance.record_query, which every connection carries.
+        stats, token = start_request_stats()
+        try:
+            yield stats
+        finally:
+            finish_request_stats(token)
+
+    def record(self, request, response, stats, duration, config):
+        labels = {"view": request.resolver_match.route if request.resolver_match else "unmatched",
+                  "method": request.method}
+        requests_total.inc(status=response.status_code, **labels)
+        request_duration.observe(duration, **labels)
+        request_queries.observe(stats.queries, **labels)
+        request_db_duration.observe(stats.db_seconds, **labels)
+        request_serializer_duration.observe(stats.serializer_seconds, **labels)
+        if not response.streaming:
+            response_size.observe(len(response.content), **labels)
+
+        if config["SERVER_TIMING"]:
+            response["Server-Timing"] = (
+                f"total;dur={duration * 1000:.1f}, "
+                f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                f"serializer;dur={stats.serializer_seconds * 1000:.1f}"
+            )
+
+        if duration * 1000 >= config["SLOW_REQUEST_MS"]:
+            slow_requests.inc(**labels)
+            logger.warning("Slow request %s %s: %.0f ms, %d queries in %.0f ms, serializer %.0f ms",
+                           request.method, request.get_full_path(), duration * 1000, stats.queries,
+                           stats.db_seconds * 1000, stats.serializer_seconds * 1000)
+
+        sql, repeats = stats.most_repeated()
+        if repeats >= config["REPEATED_QUERY_THRESHOLD"]:
+            repeated_queries.inc(**labels)
+            logger.warning("Repeated query in %s %s: %d times: %s", request.method, request.get_full_path(),
+                           repeats, sql[:500])
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0002_rename_visitor_eventparticipant_member_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'id'], name='event_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['register_time', 'id'], name='participant_reg_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['event', 'register_time', 'id'], name='participant_event_reg_idx'),
+        ),
+    ]
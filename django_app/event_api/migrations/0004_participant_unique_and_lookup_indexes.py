@@ -0,0 +1,39 @@
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def remove_duplicate_registrations(apps, schema_editor):
+    EventParticipant = apps.get_model("event_api", "EventParticipant")
+    duplicates = (EventParticipant.objects.values("event", "member")
+                  .annotate(first_id=models.Min("id"), total=models.Count("id"))
+                  .filter(total__gt=1))
+    for row in duplicates.iterator():
+        (EventParticipant.objects.filter(event=row["event"], member=row["member"])
+         .exclude(id=row["first_id"]).delete())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_registrations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['event', 'role'], name='participant_event_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['member', 'event'], name='participant_member_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(django.db.models.functions.text.Lower('role'), name='participant_role_lower_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventparticipant',
+            constraint=models.UniqueConstraint(fields=('event', 'member'), name='unique_event_member'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import migrations
+
+# Frozen copies of the statements, so later changes to event_api.search do not change this migration.
+SQLITE_FTS_SQL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS event_api_event_fts USING fts5(
+        title, description, location, content='event_api_event', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS event_api_event_fts_ai AFTER INSERT ON event_api_event BEGIN
+        INSERT INTO event_api_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_api_event_fts_ad AFTER DELETE ON event_api_event BEGIN
+        INSERT INTO event_api_event_fts(event_api_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_api_event_fts_au AFTER UPDATE ON event_api_event BEGIN
+        INSERT INTO event_api_event_fts(event_api_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO event_api_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    "INSERT INTO event_api_event_fts(event_api_event_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_FTS_SQL = [
+    "DROP TRIGGER IF EXISTS event_api_event_fts_ai",
+    "DROP TRIGGER IF EXISTS event_api_event_fts_ad",
+    "DROP TRIGGER IF EXISTS event_api_event_fts_au",
+    "DROP TABLE IF EXISTS event_api_event_fts",
+]
+
+POSTGRES_SEARCH_SQL = [
+    "ALTER TABLE event_api_event ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """CREATE OR REPLACE FUNCTION event_api_event_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS event_api_event_search_vector_trigger ON event_api_event",
+    """CREATE TRIGGER event_api_event_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, location ON event_api_event
+        FOR EACH ROW EXECUTE FUNCTION event_api_event_search_vector_update()""",
+    "UPDATE event_api_event SET title = title",
+    "CREATE INDEX IF NOT EXISTS event_search_vector_idx ON event_api_event USING GIN (search_vector)",
+]
+
+POSTGRES_DROP_SEARCH_SQL = [
+    "DROP TRIGGER IF EXISTS event_api_event_search_vector_trigger ON event_api_event",
+    "DROP FUNCTION IF EXISTS event_api_event_search_vector_update()",
+    "ALTER TABLE event_api_event DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def install_search_index(apps, schema_editor):
+    """Create the vendor specific full-text index and the triggers that keep it in sync."""
+    statements = {"sqlite": SQLITE_FTS_SQL, "postgresql": POSTGRES_SEARCH_SQL}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(apps, schema_editor):
+    statements = {"sqlite": SQLITE_DROP_FTS_SQL, "postgresql": POSTGRES_DROP_SEARCH_SQL}.get(
+        schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0004_participant_unique_and_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
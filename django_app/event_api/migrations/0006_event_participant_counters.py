@@ -0,0 +1,62 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Frozen copy of the SQLite triggers of 0005_event_full_text_search, which remaking the event table drops.
+SQLITE_FTS_TRIGGERS_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS event_api_event_fts_ai AFTER INSERT ON event_api_event BEGIN
+        INSERT INTO event_api_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_api_event_fts_ad AFTER DELETE ON event_api_event BEGIN
+        INSERT INTO event_api_event_fts(event_api_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS event_api_event_fts_au AFTER UPDATE ON event_api_event BEGIN
+        INSERT INTO event_api_event_fts(event_api_event_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO event_api_event_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+]
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_FTS_TRIGGERS_SQL:
+            schema_editor.execute(statement)
+
+
+def populate_counters(apps, schema_editor):
+    Event = apps.get_model("event_api", "Event")
+    EventParticipant = apps.get_model("event_api", "EventParticipant")
+
+    def count(role):
+        participants = (EventParticipant.objects.filter(event=OuterRef("pk"), role=role)
+                        .order_by().values("event").annotate(total=Count("pk")).values("total"))
+        return Coalesce(Subquery(participants), Value(0))
+
+    Event.objects.update(members_count=count("member"), organizers_count=count("organizer"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0005_event_full_text_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='organizers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+        # Adding the columns remakes the event table on SQLite, which drops the search triggers.
+        migrations.RunPython(reinstall_search_triggers, migrations.RunPython.noop),
+    ]
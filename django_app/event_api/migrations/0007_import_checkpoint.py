@@ -0,0 +1,22 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0006_event_participant_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255, unique=True)),
+                ('records', models.PositiveBigIntegerField(default=0)),
+                ('at_updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-18 20:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0007_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('enqueued', 'Enqueued')], default='pending', max_length=20)),
+                ('last_participant_id', models.BigIntegerField(default=0)),
+                ('enqueued', models.PositiveIntegerField(default=0)),
+                ('at_created', models.DateTimeField(auto_now_add=True)),
+                ('at_updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='eventparticipant',
+            name='participant_event_role_idx',
+        ),
+        migrations.AddIndex(
+            model_name='eventparticipant',
+            index=models.Index(fields=['event', 'role', 'id'], name='participant_event_role_id_idx'),
+        ),
+        migrations.AddField(
+            model_name='eventreminder',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='event_api.event'),
+        ),
+        migrations.AddConstraint(
+            model_name='eventreminder',
+            constraint=models.UniqueConstraint(fields=('event', 'event_date'), name='unique_event_reminder'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 21:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event_api', '0009_pending_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderDelivery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('sent', 'Sent'), ('failed', 'Failed')], max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=1)),
+                ('at_updated', models.DateTimeField(auto_now=True)),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_deliveries', to=settings.AUTH_USER_MODEL)),
+                ('reminder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deliveries', to='event_api.eventreminder')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('reminder', 'member'), name='unique_reminder_delivery')],
+            },
+        ),
+    ]
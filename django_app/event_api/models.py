@@ -1,6 +1,9 @@
 from django.contrib.auth.base_user import BaseUserManager, AbstractBaseUser
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models.constants import OnConflict
+from django.db.models.functions import Lower
 from django.contrib.auth.models import PermissionsMixin
+from django.utils import timezone
 
 VISITOR_STATUS = (
     ('member', 'Member'),
@@ -8,7 +11,58 @@ VISITOR_STATUS = (
 )
 
 
-class CustomUserManager(BaseUserManager):
+class NewRowsQuerySet(models.QuerySet):
+    """QuerySet whose ``bulk_create_new`` reports only the rows actually inserted, by ``unique_fields``."""
+    unique_fields = ()
+
+    def bulk_create_new(self, objs, batch_size=1000):
+        """
+        Insert ``objs``, skipping those whose ``unique_fields`` already exist, and return the ones inserted.
+
+        Unlike ``bulk_create(ignore_conflicts=True)``, rows skipped because a concurrent write got there
+        first are not reported as inserted. The inserted rows come back from
+        INSERT ... ON CONFLICT DO NOTHING RETURNING on SQLite and PostgreSQL; other backends insert
+        row by row in savepoints.
+        """
+        connection = connections[self.db]
+        opts = self.model._meta
+        fields = [field for field in opts.concrete_fields if not field.primary_key]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            return [obj for obj in objs if self._insert_one(obj, fields)]
+
+        unique = [opts.get_field(name) for name in self.unique_fields]
+        batch_size = min(batch_size, max(connection.ops.bulk_batch_size(fields, objs), 1))
+        pending = {tuple(getattr(obj, field.attname) for field in unique): obj for obj in objs}
+        inserted = []
+        for start in range(0, len(objs), batch_size):
+            rows = self._insert(objs[start:start + batch_size], fields=fields, using=self.db,
+                                on_conflict=OnConflict.IGNORE, returning_fields=[opts.pk, *unique])
+            # A single-row batch that conflicted comes back as [None].
+            for pk, *key in filter(None, rows):
+                inserted.append(self._mark_inserted(pending[tuple(key)], pk))
+        return inserted
+
+    def _insert_one(self, obj, fields):
+        try:
+            with transaction.atomic(using=self.db):
+                [(pk,)] = self._insert([obj], fields=fields, using=self.db,
+                                       returning_fields=[self.model._meta.pk])
+        except IntegrityError:
+            return None
+        return self._mark_inserted(obj, pk)
+
+    def _mark_inserted(self, obj, pk):
+        obj.pk = pk
+        obj._state.adding = False
+        obj._state.db = self.db
+        return obj
+
+
+class CustomUserQuerySet(NewRowsQuerySet):
+    unique_fields = ("email",)
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     def create_user(self, email, first_name, last_name, password=None, **extra_fields):
         if not email:
             raise ValueError("You have not provided a valid email address")
@@ -27,6 +81,20 @@ class CustomUserManager(BaseUserManager):
         return self.create_user(email, first_name, last_name, password, **extra_fields)
 
 
+class EventQuerySet(models.QuerySet):
+    def with_caller_role(self, user_id):
+        role = EventParticipant.objects.filter(event=models.OuterRef("pk"), member_id=user_id).values("role")[:1]
+        return self.annotate(caller_role=models.Subquery(role))
+
+
+class EventParticipantQuerySet(NewRowsQuerySet):
+    unique_fields = ("event", "member")
+
+    def with_caller_role(self, user_id):
+        role = EventParticipant.objects.filter(event=models.OuterRef("event"), member_id=user_id).values("role")[:1]
+        return self.annotate(caller_role=models.Subquery(role))
+
+
 class CustomUser(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True, blank=False, null=False)
     first_name = models.CharField(max_length=50, blank=False, null=False)
@@ -50,6 +118,16 @@ class Event(models.Model):
     location = models.CharField(max_length=150)
     at_created = models.DateTimeField(auto_now_add=True)
     at_updated = models.DateTimeField(auto_now=True)
+    # Maintained from EventParticipant signals, see event_api.counters.
+    members_count = models.PositiveIntegerField(default=0, editable=False)
+    organizers_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = EventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="event_date_id_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -60,3 +138,116 @@ class EventParticipant(models.Model):
     member = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="participant")
     role = models.CharField(max_length=50, choices=VISITOR_STATUS)
     register_time = models.DateTimeField(auto_now_add=True)
+
+    objects = EventParticipantQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["register_time", "id"], name="participant_reg_idx"),
+            models.Index(fields=["event", "register_time", "id"], name="participant_event_reg_idx"),
+            # Also the keyset order of an event's members for reminders, see event_api.reminders.
+            models.Index(fields=["event", "role", "id"], name="participant_event_role_id_idx"),
+            models.Index(fields=["member", "event"], name="participant_member_event_idx"),
+            models.Index(Lower("role"), name="participant_role_lower_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["event", "member"], name="unique_event_member"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {name: getattr(instance, name) for name in ("event_id", "member_id", "role")
+                                   if name in instance.__dict__}
+        return instance
+
+
+class ImportCheckpoint(models.Model):
+    """Records of an import source already committed, updated in the same transaction as each batch."""
+    source = models.CharField(max_length=255, unique=True)
+    records = models.PositiveBigIntegerField(default=0)
+    at_updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source} ({self.records})"
+
+
+class EventReminder(models.Model):
+    """
+    Reminder fan-out for one event date. ``last_participant_id`` is the keyset cursor of the last
+    participant whose reminder was enqueued, so an interrupted run resumes after it.
+
+    The row tracks enqueueing; each member's outcome is a ReminderDelivery. The NOTIFICATION_IDEMPOTENCY
+    cache key ``reminder:<reminder id>:<member id>`` only guards sends that are in flight.
+    """
+    PENDING = "pending"
+    ENQUEUED = "enqueued"
+    STATUSES = (
+        (PENDING, "Pending"),
+        (ENQUEUED, "Enqueued"),
+    )
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="reminders")
+    # A rescheduled event gets a new reminder for its new date.
+    event_date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=STATUSES, default=PENDING)
+    last_participant_id = models.BigIntegerField(default=0)
+    enqueued = models.PositiveIntegerField(default=0)
+    at_created = models.DateTimeField(auto_now_add=True)
+    at_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["event", "event_date"], name="unique_event_reminder"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} at {self.event_date} ({self.status})"
+
+
+class ReminderDelivery(models.Model):
+    """Outcome of one member's reminder, written after each chunk is sent; members already sent are skipped."""
+    SENT = "sent"
+    FAILED = "failed"
+    STATUSES = (
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    )
+
+    reminder = models.ForeignKey(EventReminder, on_delete=models.CASCADE, related_name="deliveries")
+    member = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="reminder_deliveries")
+    status = models.CharField(max_length=20, choices=STATUSES)
+    attempts = models.PositiveSmallIntegerField(default=1)
+    at_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["reminder", "member"], name="unique_reminder_delivery"),
+        ]
+
+    def __str__(self):
+        return f"{self.reminder_id} to {self.member_id} ({self.status})"
+
+
+class PendingNotification(models.Model):
+    """
+    Notification mail waiting to be sent by event_api.tasks.flush_notifications, written in the transaction
+    of the registration it announces. A flush claims rows by moving ``available_at`` past
+    NOTIFICATION_CLAIM_TIMEOUT and deletes them once sent, so the rows of a worker that died mid-batch are
+    claimed again when that expires. Failed rows wait ``available_at`` for their next attempt.
+    """
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, null=True)
+    to = models.JSONField()
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    at_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["available_at", "id"], name="notification_available_idx"),
+        ]
+
+    def __str__(self):
+        return f"{', '.join(self.to)}: {self.subject}"
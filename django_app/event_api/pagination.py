@@ -0,0 +1,161 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over ``view.keyset_ordering``.
+
+    The cursor holds the ordering values of the last row on the page, so the next page is a
+    range scan on a matching index instead of an OFFSET, and no COUNT(*) is run. The last
+    ordering field must be unique (normally ``id``).
+
+    Querysets already ordered by a filter, like ranked search results, are rejected rather than
+    reordered: a relevance score is no stable position to resume from.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    ordering = ("id",)
+    invalid_cursor_message = "Invalid cursor"
+    ordered_queryset_message = ("Cursor pagination is not available for ordered results such as ?search=; "
+                                "use ?pagination=page.")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = list(self.page_queryset(queryset, request, view))
+        return self.set_page(rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        rows = [row async for row in self.page_queryset(queryset, request, view)]
+        return self.set_page(rows)
+
+    def page_queryset(self, queryset, request, view):
+        self.request = request
+        self.ordering = tuple(getattr(view, "keyset_ordering", self.ordering))
+        self.model = queryset.model
+
+        if queryset.query.order_by and tuple(queryset.query.order_by) != self.ordering:
+            raise serializers.ValidationError({"pagination": [self.ordered_queryset_message]})
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.build_filter(position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def build_filter(self, position):
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            step = Q(**{f"{name}__{lookup}": position[index]})
+            for previous, value in zip(self.ordering[:index], position[:index]):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [self.model._meta.get_field(field.lstrip("-")).to_python(value)
+                    for field, value in zip(self.ordering, values)]
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = row[name] if isinstance(row, dict) else getattr(row, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        encoded = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+
+class EventPageNumberPagination(PageNumberPagination):
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async ``paginate_queryset``: the count and the page rows come from the async ORM."""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        # The Paginator only does the page arithmetic, over a range as long as the queryset.
+        paginator = self.django_paginator_class(range(await queryset.acount()), page_size)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        self.request = request
+        offset = (self.page.number - 1) * page_size
+        return [row async for row in queryset[offset:offset + page_size]]
+
+
+class EventAPIPagination(BasePagination):
+    """
+    Page-number pagination by default, keyset pagination on request.
+
+    Clients opt in with ``?pagination=cursor`` (or by following a ``cursor`` link); a view opts
+    in for all its clients with ``pagination_mode = "cursor"``, and ``?pagination=page`` still
+    returns numbered pages there.
+    """
+    mode_query_param = "pagination"
+
+    def get_mode(self, request, view):
+        mode = request.query_params.get(self.mode_query_param)
+        if mode in ("page", "cursor"):
+            return mode
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return "cursor"
+        return getattr(view, "pagination_mode", "page")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request, view)
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.get_paginator(request, view)
+        return await self.paginator.apaginate_queryset(queryset, request, view=view)
+
+    def get_paginator(self, request, view):
+        if self.get_mode(request, view) == "cursor":
+            return KeysetPagination()
+        return EventPageNumberPagination()
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return PageNumberPagination().get_schema_operation_parameters(view)
@@ -0,0 +1,22 @@
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import orjson, use_orjson
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser decoding UTF-8 bodies with orjson; anything orjson rejects is left to JSONParser."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if not use_orjson() or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        content = stream.read()
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Same result and error message as JSONParser, e.g. for integers beyond 64 bits.
+            return super().parse(io.BytesIO(content), media_type, parser_context)
@@ -0,0 +1,102 @@
+import contextvars
+import time
+from collections import Counter
+from functools import wraps
+
+from rest_framework.serializers import BaseSerializer
+
+from .metrics import counter, histogram
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+requests_total = counter("http_requests_total", "Requests by view, method and status")
+request_duration = histogram("http_request_duration_seconds", "Wall time per request", DURATION_BUCKETS)
+request_queries = histogram("http_request_db_queries", "SQL queries per request", QUERY_BUCKETS)
+request_db_duration = histogram("http_request_db_duration_seconds", "SQL time per request", DURATION_BUCKETS)
+request_serializer_duration = histogram("http_request_serializer_duration_seconds",
+                                        "Serializer time per request", DURATION_BUCKETS)
+response_size = histogram("http_response_size_bytes", "Response body size", SIZE_BUCKETS)
+slow_requests = counter("http_slow_requests_total", "Requests over the slow request threshold")
+repeated_queries = counter("http_repeated_queries_total", "Requests running one statement over the N+1 threshold")
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+class RequestStats:
+    """Per-request counters filled by ``record_query`` and the serializer timer."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.statements = Counter()
+        self._serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # The SQL text is parameterized, so repeats of one statement with different parameters count together.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def most_repeated(self):
+        return self.statements.most_common(1)[0] if self.statements else (None, 0)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper on every connection that counts the query against the current request, if any.
+
+    Connections are per thread while the stats live in a context variable, so queries that async views run
+    through sync_to_async threads are still counted.
+    """
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver; the check keeps a reconnect from adding the wrapper twice."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_request_stats():
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def finish_request_stats(token):
+    _current.reset(token)
+
+
+def timed_serialization(data):
+    """Wrap a serializer ``data`` getter so the time is added to the current request's stats."""
+
+    @wraps(data)
+    def timed(serializer):
+        stats = _current.get()
+        # Only the outermost call counts: ListSerializer.data and Serializer.data go through super().data.
+        if stats is None or stats._serializing:
+            return data(serializer)
+        stats._serializing = True
+        started = time.perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            stats.serializer_seconds += time.perf_counter() - started
+            stats._serializing = False
+
+    timed.timed_serialization = True
+    return timed
+
+
+def instrument_serializers():
+    """Time every DRF serializer's ``.data``; called once from the app config."""
+    if not getattr(BaseSerializer.data.fget, "timed_serialization", False):
+        BaseSerializer.data = property(timed_serialization(BaseSerializer.data.fget))
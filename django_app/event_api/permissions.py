@@ -1,9 +1,7 @@
-from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import BasePermission
 
-from .models import Event, EventParticipant
+from .roles import MISSING, get_event_role
 
 
 class IsStaff(BasePermission):
@@ -19,40 +17,53 @@ class UserPermission(BasePermission):
 
 
 class CanManageEvent(BasePermission):
+    """
+    Object-level check on the ``caller_role`` annotation of the view's queryset, which supersedes the
+    role cache; the cache is only consulted for objects loaded without it.
+    """
 
-    def has_permission(self, request, view):
-        try:
-            event = Event.objects.get(id=view.kwargs['pk'])
-        except ObjectDoesNotExist:
-            raise PermissionDenied({"detail": "This event does not exist"})
-
-        try:
-            user_event = EventParticipant.objects.get(event=event, member=request.user)
-            if user_event:
-                if user_event.role == "organizer":
-                    return True
-                elif user_event.role == "member":
-                    raise PermissionDenied({"detail": "Participants cannot modify the event."})
-        except ObjectDoesNotExist:
-            return False
-
+    def has_object_permission(self, request, view, obj):
+        role = get_event_role(request.user.id, obj.id, default=getattr(obj, "caller_role", MISSING))
+        if role == "organizer":
+            return True
+        if role == "member":
+            raise PermissionDenied({"detail": "Participants cannot modify the event."})
         return False
 
 
 class CanManageEventParticipant(BasePermission):
-    def has_permission(self, request, view):
-        try:
-            participant = EventParticipant.objects.get(id=view.kwargs['pk'])
-        except ObjectDoesNotExist:
-            raise PermissionError({"detail": "This event does not exist."})
+    """
+    Object-level check on the ``caller_role`` annotation of the view's queryset, which supersedes the
+    role cache; the cache is only consulted for objects loaded without it.
+    """
 
-        if participant.member == request.user:
+    def has_object_permission(self, request, view, obj):
+        if obj.member_id == request.user.id:
             return True
 
-        is_organizer = EventParticipant.objects.filter(event=participant.event,
-                                                       role="organizer",
-                                                       member=request.user).exists()
-        if is_organizer:
-            return True
+        role = get_event_role(request.user.id, obj.event_id, default=getattr(obj, "caller_role", MISSING))
+        return role == "organizer"
 
-        return False
+
+class IsEventOrganizer(BasePermission):
+    """Object-level check on an event for organizer-only actions that are not edits, like exports."""
+
+    def has_object_permission(self, request, view, obj):
+        return get_event_role(request.user.id, obj.id, default=getattr(obj, "caller_role", MISSING)) == "organizer"
+
+
+def expands_members(expand, fields):
+    """Whether member summaries are rendered: expanded, and not left out by ?fields=."""
+    return "member" in expand and (fields is None or "member" in fields)
+
+
+def can_expand_members(request):
+    """
+    Member summaries carry names and emails, so ``?expand=member`` is limited to staff and to an
+    ``?event=`` filtered listing of an event the caller organizes. No event is loaded here, so the
+    role comes from the role cache.
+    """
+    if request.user.is_staff:
+        return True
+    event_id = request.query_params.get("event", "")
+    return event_id.isdigit() and get_event_role(request.user.id, int(event_id)) == "organizer"
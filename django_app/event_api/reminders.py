@@ -0,0 +1,69 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Event, EventParticipant, EventReminder
+from .tasks import send_event_reminders
+
+
+def due_events(now=None):
+    """Events starting within the reminder window whose reminder for the current date is not fully enqueued."""
+    now = now or timezone.now()
+    window_end = now + timedelta(hours=settings.EVENT_REMINDERS["HOURS_BEFORE"])
+    sent = EventReminder.objects.filter(event=OuterRef("pk"), event_date=OuterRef("date"),
+                                        status=EventReminder.ENQUEUED)
+    # Range scan on event_date_id_idx.
+    return (Event.objects.filter(date__gt=now, date__lte=window_end).exclude(Exists(sent))
+            .order_by("date", "id").only("id", "title", "date"))
+
+
+def enqueue_reminders(event, chunk_size=None):
+    """
+    Enqueue one send task per ``chunk_size`` members of ``event``, resuming after the reminder's cursor.
+
+    Each chunk is read and enqueued while holding the reminder row (SELECT ... FOR UPDATE SKIP LOCKED),
+    so a concurrent run skips the reminder instead of enqueueing the same chunk. A chunk is enqueued before
+    the cursor moves past it, so a crash in between enqueues it again; the reminder's delivery rows (and,
+    for sends still in flight, the messages' idempotency keys) keep those members from getting two mails.
+    Returns the number of members enqueued by this call.
+    """
+    chunk_size = chunk_size or settings.EVENT_REMINDERS["CHUNK_SIZE"]
+    reminder, _ = EventReminder.objects.get_or_create(event=event, event_date=event.date)
+    pending = EventReminder.objects.select_for_update(skip_locked=True).filter(pk=reminder.pk,
+                                                                                status=EventReminder.PENDING)
+    members = (EventParticipant.objects.filter(event_id=event.id, role="member").order_by("id")
+               .values_list("id", "member_id", "member__email", "member__first_name", "member__last_name"))
+    enqueued = 0
+    while True:
+        with transaction.atomic():
+            # Re-read under the lock: another run may have moved the cursor or finished the reminder.
+            reminder = pending.first()
+            if reminder is None:
+                break
+            # Keyset iteration on participant_event_role_id_idx; no OFFSET, so every chunk costs the same.
+            chunk = list(members.filter(id__gt=reminder.last_participant_id)[:chunk_size])
+            if not chunk:
+                reminder.status = EventReminder.ENQUEUED
+                reminder.save(update_fields=["status", "at_updated"])
+                break
+            send_event_reminders.delay(reminder.id, event.title, event.date, [
+                [member_id, email, f"{first_name} {last_name}"] for _, member_id, email, first_name, last_name in chunk
+            ])
+            reminder.last_participant_id = chunk[-1][0]
+            reminder.enqueued += len(chunk)
+            reminder.save(update_fields=["last_participant_id", "enqueued", "at_updated"])
+        enqueued += len(chunk)
+
+    return enqueued
+
+
+def schedule_reminders(now=None, chunk_size=None):
+    """Enqueue the reminders of every due event; returns the events and members handled."""
+    stats = Counter()
+    for event in due_events(now):
+        stats.update(events=1, members=enqueue_reminders(event, chunk_size))
+    return stats
@@ -0,0 +1,78 @@
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Types orjson would encode differently from DRF's encoder are handed to it through ``default``.
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                  if orjson is not None else 0)
+
+
+def use_orjson():
+    return orjson is not None and settings.API_JSON_BACKEND == "orjson"
+
+
+# Values that cannot be or contain NaN or an infinity.
+_FINITE_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def has_non_finite_numbers(data):
+    """Whether ``data`` holds NaN or an infinity, which orjson writes as null and DRF rejects."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, Decimal):
+        return not data.is_finite()
+    if isinstance(data, dict):
+        values = data.values()
+    elif isinstance(data, (list, tuple)):
+        values = data
+    else:
+        return False
+    # Containers of strings, integers and nulls, like most result rows, are skipped without a call per value.
+    if _FINITE_TYPES.issuperset(map(type, values)):
+        return False
+    for value in values:
+        kind = type(value)
+        if kind in _FINITE_TYPES or kind is dict and _FINITE_TYPES.issuperset(map(type, value.values())):
+            continue
+        if has_non_finite_numbers(value):
+            return True
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed and API_JSON_BACKEND is "orjson".
+
+    The output matches JSONRenderer with the default compact UTF-8 settings: same key order and
+    separators, datetimes, Decimals and other non-JSON types encoded by DRF's encoder,
+    \\u2028/\\u2029 escaped. Floats are the same numbers but may be spelled differently (``1e16``
+    for ``1e+16``, ``0.000025`` for ``2.5e-05``). Indented output, data orjson rejects (integers
+    beyond 64 bits) and NaN or infinities, which JSONRenderer refuses, go through JSONRenderer.
+    """
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if use_orjson() and self.compact and not self.ensure_ascii \
+                and self.get_indent(accepted_media_type, renderer_context or {}) is None:
+            try:
+                content = orjson.dumps(data, default=self.encoder.default, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                pass
+            else:
+                # orjson writes NaN and infinities as null; only output with a null can hide one.
+                if b"null" in content and has_non_finite_numbers(data):
+                    return super().render(data, accepted_media_type, renderer_context)
+                return content.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .metrics import counter
+from .models import EventParticipant
+
+# Object-level permission checks read the role from the caller_role annotation of the view's queryset
+# (with_caller_role), which supersedes this cache: it comes in the same query as the object and cannot be
+# stale. The cache backs the remaining lookups by id, such as the organizer check of ?expand=member
+# listings, and its hit and miss counters only count those.
+
+MISSING = object()
+
+# Caches cannot tell a stored ``None`` from a miss, so "not a participant" is stored as an empty string.
+NO_ROLE = ""
+
+role_cache_hits = counter("event_role_cache_hits_total",
+                          "Event role lookups without a caller_role annotation served from the role cache")
+role_cache_misses = counter("event_role_cache_misses_total",
+                            "Event role lookups without a caller_role annotation read from the database")
+
+
+class LocMemRoleBackend:
+    """Per-process LRU with a TTL; entries are (expires_at, role)."""
+
+    def __init__(self, max_entries=10000, timeout=60):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, event_id):
+        key = (user_id, event_id)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, role = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return role
+
+    def set(self, user_id, event_id, role):
+        key = (user_id, event_id)
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.timeout, role)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, user_id, event_id):
+        with self._lock:
+            self._data.pop((user_id, event_id), None)
+
+    def delete_event(self, event_id):
+        with self._lock:
+            for key in [key for key in self._data if key[1] == event_id]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheRoleBackend:
+    """Stores roles in a Django cache alias, e.g. one backed by Redis and shared by all workers."""
+
+    def __init__(self, alias="default", timeout=60, key_prefix="event-role"):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, user_id, event_id):
+        return f"{self.key_prefix}:{event_id}:{user_id}"
+
+    def get(self, user_id, event_id):
+        return self.cache.get(self._key(user_id, event_id), MISSING)
+
+    def set(self, user_id, event_id, role):
+        self.cache.set(self._key(user_id, event_id), role, self.timeout)
+
+    def delete(self, user_id, event_id):
+        self.cache.delete(self._key(user_id, event_id))
+
+    def delete_event(self, event_id):
+        # Keys cannot be enumerated here. Deleting an event cascades to its participants, whose
+        # post_delete signals drop every stored role; remaining "no role" entries stay correct.
+        pass
+
+    # No clear(): the alias is usually shared with the listing, replica pin, token status and
+    # notification keys, and emptying it would lose those too.
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_role_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = settings.EVENT_ROLE_CACHE
+                _backend = import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+    return _backend
+
+
+@receiver(setting_changed)
+def _reset_role_backend(setting, **kwargs):
+    global _backend
+    if setting == "EVENT_ROLE_CACHE":
+        _backend = None
+
+
+def get_event_role(user_id, event_id, default=MISSING):
+    """
+    Return the role of ``user_id`` in ``event_id`` or ``None`` if they are not a participant.
+
+    ``default`` is a role the caller already loaded (e.g. through ``with_caller_role``). It was read
+    in the same query as the object, so it is returned without touching the cache or its counters.
+    It is not stored either: the query may have run on a lagging replica, and the cache is shared by
+    every process.
+    """
+    if default is not MISSING:
+        return default
+
+    backend = get_role_backend()
+    role = backend.get(user_id, event_id)
+    if role is not MISSING:
+        role_cache_hits.inc()
+        return role or None
+
+    role_cache_misses.inc()
+    # Read from the primary even in replica-routed requests, since the result is cached for every process.
+    role = (EventParticipant.objects.using("default").filter(event_id=event_id, member_id=user_id)
+            .values_list("role", flat=True).first())
+    backend.set(user_id, event_id, role or NO_ROLE)
+    return role
+
+
+def _on_commit_too(invalidate, *args):
+    invalidate(*args)
+    if transaction.get_connection().in_atomic_block:
+        # A request missing the cache before the commit reads the old role and stores it again.
+        transaction.on_commit(partial(invalidate, *args))
+
+
+def invalidate_event_role(user_id, event_id):
+    _on_commit_too(get_role_backend().delete, user_id, event_id)
+
+
+def invalidate_event_roles(event_id):
+    _on_commit_too(get_role_backend().delete_event, event_id)
+
+
+def reset_role_cache():
+    """Reset the hit and miss counters, and drop the cached roles if the backend can do so on its own."""
+    backend = get_role_backend()
+    if hasattr(backend, "clear"):
+        backend.clear()
+    role_cache_hits.reset()
+    role_cache_misses.reset()
+
+
+def role_cache_stats():
+    hits = role_cache_hits.value()
+    misses = role_cache_misses.value()
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
@@ -0,0 +1,43 @@
+import contextvars
+import random
+
+from django.conf import settings
+
+_read_database = contextvars.ContextVar("event_api_read_database", default=None)
+
+
+def get_read_database():
+    return _read_database.get()
+
+
+def use_read_database(alias):
+    """Send reads in the current context to ``alias``; returns a token for ``reset_read_database``."""
+    return _read_database.set(alias)
+
+
+def reset_read_database(token):
+    _read_database.reset(token)
+
+
+def choose_replica():
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+class PrimaryReplicaRouter:
+    """
+    Reads go to the replica chosen for the current request by ReplicaRoutingMiddleware, everything
+    else (writes, and reads outside such requests) to ``default``.
+    """
+
+    def db_for_read(self, model, **hints):
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
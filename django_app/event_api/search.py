@@ -0,0 +1,87 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+EVENT_TABLE = "event_api_event"
+FTS_TABLE = "event_api_event_fts"
+SEARCH_CONFIG = "english"
+
+# The index and the triggers keeping it in sync are created by migration 0005_event_full_text_search.
+# SQLite drops the triggers whenever Django remakes the event table, so migrations altering Event must
+# create them again, as 0006_event_participant_counters does.
+
+
+class IcontainsSearchBackend:
+    """Unranked substring match, for databases without a full-text index."""
+
+    fields = ("title", "description", "location")
+
+    def __init__(self, fields=None):
+        if fields is not None:
+            self.fields = fields
+
+    def search(self, queryset, query):
+        condition = Q()
+        for term in query.split():
+            term_condition = Q()
+            for field in self.fields:
+                term_condition |= Q(**{f"{field}__icontains": term})
+            condition &= term_condition
+        return queryset.filter(condition)
+
+
+class SQLiteFTS5SearchBackend:
+    def match_expression(self, query):
+        # Quote every token so user input cannot use FTS5 query syntax; "*" allows prefix matches.
+        return " ".join(f'"{token}"*' for token in re.findall(r"\w+", query))
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+
+        # Joining the FTS table evaluates MATCH once; bm25() is lower for better matches.
+        return (queryset
+                .extra(tables=[FTS_TABLE],
+                       where=[f"{FTS_TABLE}.rowid = {EVENT_TABLE}.id", f"{FTS_TABLE} MATCH %s"],
+                       params=[match],
+                       select={"search_rank": f"-bm25({FTS_TABLE}, 10.0, 2.0, 5.0)"})
+                .order_by("-search_rank", "id"))
+
+
+class PostgresSearchBackend:
+    def search(self, queryset, query):
+        tsquery = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        return (queryset
+                .filter(RawSQL(f"{EVENT_TABLE}.search_vector @@ {tsquery}", [query], output_field=BooleanField()))
+                .annotate(search_rank=RawSQL(f"ts_rank({EVENT_TABLE}.search_vector, {tsquery})", [query],
+                                             output_field=FloatField()))
+                .order_by("-search_rank", "id"))
+
+
+VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTS5SearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    backend = settings.EVENT_SEARCH_BACKEND
+    if backend == "auto":
+        return VENDOR_BACKENDS.get(connection.vendor, IcontainsSearchBackend)()
+    return import_string(backend)()
+
+
+class EventSearchFilter(SearchFilter):
+    """Drop-in replacement for SearchFilter on events that uses the full-text search backend."""
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
@@ -1,26 +1,59 @@
+from collections import Counter
 from datetime import datetime
+from functools import partial
 
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework_simplejwt.exceptions import AuthenticationFailed
 
-from .models import Event, CustomUser, EventParticipant
+from .counters import adjust_participant_counts
+from .models import Event, CustomUser, EventParticipant, VISITOR_STATUS
+from .roles import invalidate_event_role
+from .tasks import queue_invitations
 
 
-class EventSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Renders only ``fields`` when given, see requested_fields()."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def requested_fields(request, serializer_class):
+    """Field names from ``?fields=title,date`` in ``serializer_class`` order, or ``None`` for all of them."""
+    requested = {name.strip() for name in request.query_params.get("fields", "").split(",") if name.strip()}
+    if not requested:
+        return None
+    available = [name for name, field in serializer_class().fields.items() if not field.write_only]
+    unknown = sorted(requested.difference(available))
+    if unknown:
+        raise serializers.ValidationError({"fields": [f"Unknown field '{name}'." for name in unknown]})
+    return [name for name in available if name in requested]
+
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     date = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", input_formats=["%Y-%m-%d %H:%M:%S"])
 
     class Meta:
         model = Event
-        fields = ["title", "description", "date", "location"]
+        fields = ["title", "description", "date", "location", "members_count", "organizers_count"]
+        read_only_fields = ["members_count", "organizers_count"]
 
     def create(self, validated_data):
         user = self.context['request'].user
 
-        event = Event.objects.create(**validated_data)
-
-        EventParticipant.objects.create(event=event, member=user, role="organizer")
+        with transaction.atomic():
+            # The creator is the first organizer: the counter is set on insert and bulk_create skips the
+            # post_save signal that would otherwise update it again.
+            event = Event.objects.create(organizers_count=1, **validated_data)
+            EventParticipant.objects.bulk_create([EventParticipant(event=event, member_id=user.id, role="organizer")])
+            transaction.on_commit(partial(invalidate_event_role, user.id, event.id))
 
         return event
 
@@ -42,10 +75,22 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserLoginSerializer(serializers.Serializer):
+class UserImportSerializer(UserSerializer):
+    # Uniqueness is checked per batch by the importer instead of one query per row.
+    email = serializers.EmailField(max_length=254)
+
+
+class EventImportSerializer(EventSerializer):
+    class Meta(EventSerializer.Meta):
+        fields = ["title", "description", "date", "location"]
+
+
+class LoginCredentialsSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
 
+
+class UserLoginSerializer(LoginCredentialsSerializer):
     def validate(self, data):
         email = data.get("email")
         password = data.get("password")
@@ -63,8 +108,114 @@ class UserLoginSerializer(serializers.Serializer):
         return user
 
 
-class EventParticipantSerializer(serializers.ModelSerializer):
+class EventSummarySerializer(serializers.ModelSerializer):
+    date = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
+
+    class Meta:
+        model = Event
+        fields = ["id", "title", "date"]
+
+
+class MemberSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ["id", "first_name", "last_name", "email"]
+
+
+class EventParticipantSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # Relations that ?expand= inlines instead of the id; the queryset must select_related them.
+    expandable_fields = {
+        "event": EventSummarySerializer,
+        "member": MemberSummarySerializer,
+    }
+
     class Meta:
         model = EventParticipant
         fields = '__all__'
+        # Uniqueness of (event, member) is enforced by the database constraint, see the views.
+        validators = []
+
+    def __init__(self, *args, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            if name in self.fields:
+                self.fields[name] = self.expandable_fields[name](read_only=True)
+
+    def create(self, validated_data):
+        # The insert and the counter update of the post_save signal commit together. A duplicate raises
+        # IntegrityError out of the caller's transaction too, so no savepoint is needed.
+        with transaction.atomic(savepoint=False):
+            return super().create(validated_data)
+
+
+def requested_expansions(request, serializer_class):
+    """Relation names from ``?expand=event,member``, validated against ``serializer_class.expandable_fields``."""
+    names = [name.strip() for name in request.query_params.get("expand", "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in serializer_class.expandable_fields]
+    if unknown:
+        raise serializers.ValidationError({"expand": [f"Cannot expand '{name}'." for name in unknown]})
+    return list(dict.fromkeys(names))
+
 
+class BulkRegistrationItemSerializer(serializers.Serializer):
+    event = serializers.IntegerField(min_value=1)
+    member = serializers.IntegerField(min_value=1)
+    role = serializers.ChoiceField(choices=VISITOR_STATUS)
+
+
+class EventParticipantBulkSerializer(serializers.Serializer):
+    participants = BulkRegistrationItemSerializer(many=True, allow_empty=False,
+                                                  max_length=settings.BULK_REGISTRATION_MAX_ITEMS)
+
+    def create(self, validated_data):
+        items = validated_data["participants"]
+        event_ids = {item["event"] for item in items}
+        member_ids = {item["member"] for item in items}
+
+        events = Event.objects.only("id", "date").in_bulk(event_ids)
+        members = CustomUser.objects.only("id", "email", "first_name", "last_name").in_bulk(member_ids)
+        registered = set(EventParticipant.objects.filter(event_id__in=event_ids, member_id__in=member_ids)
+                         .values_list("event_id", "member_id"))
+
+        results = []
+        to_create = []
+        for item in items:
+            key = (item["event"], item["member"])
+            if item["event"] not in events:
+                item_status = "event_not_found"
+            elif item["member"] not in members:
+                item_status = "member_not_found"
+            elif key in registered:
+                item_status = "already_registered"
+            else:
+                item_status = "created"
+                registered.add(key)
+                to_create.append(EventParticipant(event_id=item["event"], member_id=item["member"], role=item["role"]))
+            results.append({**item, "status": item_status})
+
+        with transaction.atomic():
+            # Registrations that raced in after the lookup above are skipped and not returned.
+            created = EventParticipant.objects.bulk_create_new(to_create, batch_size=1000)
+            # Bulk inserts do not send post_save either, so counters are adjusted in the same transaction,
+            # from the inserted rows only: a racing registration already counted itself.
+            adjust_participant_counts(Counter((participant.event_id, participant.role) for participant in created))
+            recipients = []
+            for participant in created:
+                if participant.role == "member":
+                    member = members[participant.member_id]
+                    recipients.append((member.email, f"{member.first_name} {member.last_name}",
+                                       events[participant.event_id].date))
+            # Queued in the same transaction, so only committed registrations are announced.
+            queue_invitations(recipients)
+            transaction.on_commit(lambda: self._after_commit(created))
+
+        inserted = {(participant.event_id, participant.member_id) for participant in created}
+        for result in results:
+            if result["status"] == "created" and (result["event"], result["member"]) not in inserted:
+                result["status"] = "already_registered"
+        return {"results": results}
+
+    def _after_commit(self, created):
+        # bulk_create does not send post_save, so roles are invalidated here.
+        for participant in created:
+            invalidate_event_role(participant.member_id, participant.event_id)
@@ -0,0 +1,80 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_user_status
+from .counters import COUNTER_FIELDS, adjust_participant_counts
+from .list_cache import bump_generation
+from .models import CustomUser, Event, EventParticipant
+from .roles import invalidate_event_role, invalidate_event_roles
+
+
+def _previous_values(instance):
+    loaded = getattr(instance, "_loaded_values", {})
+    return (loaded.get("event_id", instance.event_id), loaded.get("member_id", instance.member_id),
+            loaded.get("role", instance.role))
+
+
+def _sync_cached_event(instance, event_id, role, delta):
+    # Keep an Event already loaded on the participant in step with the UPDATE issued for it.
+    if EventParticipant.event.is_cached(instance) and instance.event.pk == event_id:
+        field = COUNTER_FIELDS[role]
+        setattr(instance.event, field, getattr(instance.event, field) + delta)
+
+
+@receiver(post_save, sender=EventParticipant)
+def participant_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous_event_id, previous_member_id, previous_role = _previous_values(instance)
+    invalidate_event_role(instance.member_id, instance.event_id)
+    if (previous_event_id, previous_member_id) != (instance.event_id, instance.member_id):
+        invalidate_event_role(previous_member_id, previous_event_id)
+
+    if created:
+        adjust_participant_counts({(instance.event_id, instance.role): 1})
+        _sync_cached_event(instance, instance.event_id, instance.role, 1)
+    elif (previous_event_id, previous_role) != (instance.event_id, instance.role):
+        adjust_participant_counts({(previous_event_id, previous_role): -1, (instance.event_id, instance.role): 1})
+        _sync_cached_event(instance, previous_event_id, previous_role, -1)
+        _sync_cached_event(instance, instance.event_id, instance.role, 1)
+
+    instance._loaded_values = {"event_id": instance.event_id, "member_id": instance.member_id, "role": instance.role}
+
+
+@receiver(post_delete, sender=EventParticipant)
+def participant_deleted(sender, instance, origin=None, **kwargs):
+    event_id, member_id, role = _previous_values(instance)
+    invalidate_event_role(member_id, event_id)
+
+    # No point counting down an event that is being deleted itself.
+    if not isinstance(origin, Event):
+        adjust_participant_counts({(event_id, role): -1})
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, **kwargs):
+    bump_generation()
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    invalidate_event_roles(instance.pk)
+    bump_generation()
+
+
+@receiver(post_save, sender=CustomUser)
+def user_saved(sender, instance, raw=False, **kwargs):
+    # Dropped rather than replaced, so a save that is rolled back never becomes the cached status; dropped
+    # again on commit, as a request in between may have cached the status from before the save.
+    forget_user_status(instance.pk)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(forget_user_status, instance.pk))
+
+
+@receiver(post_delete, sender=CustomUser)
+def user_deleted(sender, instance, **kwargs):
+    forget_user_status(instance.pk)
@@ -0,0 +1,64 @@
+import time
+
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun, task_retry, worker_ready
+from django.conf import settings
+
+from .metrics import counter, histogram, start_metrics_server
+from .performance import DURATION_BUCKETS
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+
+tasks_published = counter("celery_tasks_published_total", "Tasks sent to the broker by task and queue")
+task_queue_latency = histogram("celery_task_queue_latency_seconds",
+                               "Time from publishing a task to a worker starting it", LATENCY_BUCKETS)
+task_runtime = histogram("celery_task_runtime_seconds", "Task run time by final state", DURATION_BUCKETS)
+task_failures = counter("celery_task_failures_total", "Tasks that raised, by exception")
+task_retries = counter("celery_task_retries_total", "Task retries")
+
+_started = {}
+
+
+def _queue(request):
+    return (request.delivery_info or {}).get("routing_key") or "eager"
+
+
+@before_task_publish.connect
+def stamp_published(sender=None, headers=None, routing_key=None, **kwargs):
+    # Message headers become attributes of task.request in the worker. Eager tasks are not
+    # published, so they report run time but no queue latency.
+    headers["published_at"] = time.time()
+    tasks_published.inc(task=sender, queue=routing_key)
+
+
+@task_prerun.connect
+def task_started(task_id=None, task=None, **kwargs):
+    _started[task_id] = time.perf_counter()
+    published_at = getattr(task.request, "published_at", None)
+    if published_at is not None:
+        task_queue_latency.observe(max(0.0, time.time() - published_at), task=task.name, queue=_queue(task.request))
+
+
+@task_postrun.connect
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is not None:
+        task_runtime.observe(time.perf_counter() - started, task=task.name, state=state)
+
+
+@task_failure.connect
+def task_failed(sender=None, exception=None, **kwargs):
+    task_failures.inc(task=sender.name, exception=type(exception).__name__)
+
+
+@task_retry.connect
+def task_retried(sender=None, **kwargs):
+    task_retries.inc(task=sender.name)
+
+
+@worker_ready.connect
+def serve_worker_metrics(**kwargs):
+    # Tasks record into the registry of the process that runs them, which is the worker itself
+    # with the threads or solo pool; prefork children keep their own registries.
+    port = settings.PERFORMANCE_MONITORING["WORKER_METRICS_PORT"]
+    if port:
+        start_metrics_server(port)
@@ -1,17 +1,136 @@
+import logging
+
 from celery import shared_task
-from django.core.mail import send_mail
+from celery.signals import celeryd_init
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
 
 from core.settings import EMAIL_HOST_USER
 
+from .mail import check_idempotency_cache, claim_notifications, deliver, deliver_notifications, message_to_notification
+from .models import CustomUser, PendingNotification, ReminderDelivery
 
-@shared_task
-def message_for_register_event(email, full_name, date_event):
-    send_mail(
+logger = logging.getLogger(__name__)
+
+
+@celeryd_init.connect
+def require_shared_idempotency_cache(**kwargs):
+    check_idempotency_cache()
+
+
+def register_event_message(full_name, date_event):
+    return (
         "Invitation to Join Our Event",
         f"Hello, {full_name}!\n\nWe are pleased to invite you to join our upcoming event, which will take place on {date_event}."
         f"\n\nThis is a great "
         "opportunity for idea exchange and collaboration. Don’t miss the chance to be a part of this event!\n\nWe look forward to your presence!",
-        EMAIL_HOST_USER,
-        [email],
-        fail_silently=False,
-    )
\ No newline at end of file
+    )
+
+
+def event_reminder_message(full_name, title, date_event):
+    return (
+        f"Reminder: {title}",
+        f"Hello, {full_name}!\n\nThis is a reminder that {title} takes place on {date_event}."
+        "\n\nWe look forward to seeing you there!",
+    )
+
+
+def invitation(email, full_name, date_event):
+    return EmailMessage(*register_event_message(full_name, date_event), EMAIL_HOST_USER, [email])
+
+
+def queue_notifications(messages):
+    """
+    Store ``messages`` for flush_notifications in the current transaction, so they are only sent if it
+    commits. A flush starts once a batch of NOTIFICATION_BATCH_SIZE has filled up; smaller batches go
+    out with the periodic flush every NOTIFICATION_FLUSH_INTERVAL seconds.
+    """
+    notifications = PendingNotification.objects.bulk_create([
+        message_to_notification(message) for message in messages
+    ])
+    size = settings.NOTIFICATION_BATCH_SIZE
+    # Ids grow with every queued message, so crossing a multiple of the batch size means another batch
+    # filled up, without counting the table.
+    if notifications and notifications[-1].pk // size > (notifications[0].pk - 1) // size:
+        transaction.on_commit(flush_notifications.delay)
+
+
+def queue_invitations(recipients):
+    """Queue one invitation per (email, full_name, date_event) entry."""
+    queue_notifications([invitation(email, full_name, date_event) for email, full_name, date_event in recipients])
+
+
+@shared_task
+def flush_notifications():
+    """Send the due queued notifications, each batch of NOTIFICATION_BATCH_SIZE over a single connection."""
+    sent = 0
+    while True:
+        notifications = claim_notifications(settings.NOTIFICATION_BATCH_SIZE)
+        if notifications:
+            sent += deliver_notifications(notifications)
+        if len(notifications) < settings.NOTIFICATION_BATCH_SIZE:
+            return sent
+
+
+# The per-registration tasks before notifications were queued in the database. Kept for one release so
+# messages already on the broker at deploy time are queued instead of failing as unregistered tasks.
+@shared_task
+def message_for_register_event(email, full_name, date_event):
+    queue_invitations([(email, full_name, date_event)])
+
+
+@shared_task
+def messages_for_register_event(recipients):
+    queue_invitations(recipients)
+
+
+@shared_task
+def send_event_reminders(reminder_id, title, date_event, recipients, attempt=0):
+    """
+    Send the reminder to each (member_id, email, full_name) entry of one chunk over a single connection,
+    skipping members whose ReminderDelivery says sent, and record every member's outcome. Failed members
+    are retried with backoff and stay recorded as failed after NOTIFICATION_MAX_RETRIES.
+    """
+    member_ids = [member_id for member_id, _, _ in recipients]
+    sent = set(ReminderDelivery.objects.filter(reminder_id=reminder_id, status=ReminderDelivery.SENT,
+                                               member_id__in=member_ids).values_list("member_id", flat=True))
+    # Members deleted since the chunk was enqueued get no mail and no delivery row.
+    members = set(CustomUser.objects.filter(pk__in=member_ids).values_list("pk", flat=True))
+    pending = [recipient for recipient in recipients if recipient[0] in members and recipient[0] not in sent]
+    messages = []
+    for member_id, email, full_name in pending:
+        message = EmailMessage(*event_reminder_message(full_name, title, date_event), EMAIL_HOST_USER, [email])
+        # Keyed by member rather than task, so a chunk enqueued twice still sends one mail per member.
+        message.idempotency_key = f"reminder:{reminder_id}:{member_id}"
+        messages.append(message)
+    failed = {id(message) for message in deliver(messages)}
+
+    deliveries, retry = [], []
+    for recipient, message in zip(pending, messages):
+        if id(message) in failed:
+            retry.append(recipient)
+        elif not message.delivered:
+            # Another delivery holds the member's key and records the outcome itself.
+            continue
+        deliveries.append(ReminderDelivery(
+            reminder_id=reminder_id, member_id=recipient[0], attempts=attempt + 1,
+            status=ReminderDelivery.FAILED if id(message) in failed else ReminderDelivery.SENT))
+    ReminderDelivery.objects.bulk_create(deliveries, update_conflicts=True, unique_fields=["reminder", "member"],
+                                         update_fields=["status", "attempts", "at_updated"])
+
+    if not retry:
+        return
+    if attempt >= settings.NOTIFICATION_MAX_RETRIES:
+        logger.error("Giving up on %d reminders of %s after %d attempts", len(retry), reminder_id, attempt + 1)
+        return
+    send_event_reminders.apply_async(args=[reminder_id, title, date_event, retry, attempt + 1],
+                                     countdown=settings.NOTIFICATION_RETRY_BACKOFF * 2 ** attempt)
+
+
+@shared_task
+def schedule_event_reminders():
+    # Imported here because event_api.reminders enqueues send_event_reminders from this module.
+    from .reminders import schedule_reminders
+
+    return dict(schedule_reminders())
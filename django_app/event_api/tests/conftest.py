@@ -0,0 +1,77 @@
+from datetime import datetime
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from rest_framework.test import APIClient
+from core import celery_app
+from event_api.models import CustomUser, Event, EventParticipant
+from event_api.list_cache import reset_list_cache
+from event_api.roles import DjangoCacheRoleBackend, get_role_backend, reset_role_cache
+
+# A second alias on the test database standing in for a read replica; tests opt in with
+# django_db(databases=["default", "replica"]) and settings.DATABASE_REPLICAS.
+connections.settings.setdefault("replica", {**connections.settings["default"], "TEST": {"MIRROR": "default"}})
+
+
+@pytest.fixture(autouse=True)
+def clear_role_cache():
+    reset_role_cache()
+    backend = get_role_backend()
+    if isinstance(backend, DjangoCacheRoleBackend):
+        # Rolled back ids are reused by the next test; the backend has no clear() of its own.
+        backend.cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_list_cache():
+    reset_list_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_notification_keys():
+    # Reminder keys are built from row ids, which the next test reuses.
+    caches[settings.NOTIFICATION_IDEMPOTENCY["ALIAS"]].clear()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def celery_eager():
+    # Tasks run in the test process, and anything published goes to the in-memory broker instead of Redis.
+    # The app reads the CELERY_ settings namespace, so overrides use the same names.
+    celery_app.conf.update(CELERY_TASK_ALWAYS_EAGER=True, CELERY_BROKER_URL="memory://")
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def create_user(db):
+    def make_user(email="test@gmail.com", first_name="Oleg", last_name="Ivanov", password="TtppZZffd2"):
+        user = CustomUser.objects.create(
+            email=email, first_name=first_name, last_name=last_name
+        )
+        user.set_password(password)
+        user.save()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def create_event(db):
+    def make_event(title="Daily meeting", description="Discussion of a new project",
+                   date="12-02-2025 14:00:00", location="Kiev"):
+        parsed_date = datetime.strptime(date, "%d-%m-%Y %H:%M:%S")
+        event = Event.objects.create(
+            title=title, description=description, date=parsed_date, location=location
+        )
+        return event
+    return make_event
+
+
+@pytest.fixture
+def create_event_participant(db):
+    def add_participant(event, member, role):
+        return EventParticipant.objects.create(event=event, member=member, role=role)
+    return add_participant
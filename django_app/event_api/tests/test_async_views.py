@@ -0,0 +1,136 @@
+import asyncio
+import threading
+
+import pytest
+
+from event_api.authentication import ClaimsRefreshToken
+from event_api.benchmarks.concurrency import run_concurrency_benchmark
+from event_api.models import PendingNotification
+
+
+@pytest.fixture
+def organized_event(create_user, create_event, create_event_participant):
+    organizer = create_user()
+    member = create_user(email="member@gmail.com", first_name="Stas", last_name="Stasov")
+    event = create_event()
+    create_event_participant(event, organizer, "organizer")
+    create_event_participant(event, member, "member")
+    return event, organizer, member
+
+
+def bearer(api_client, user):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {ClaimsRefreshToken.for_user(user).access_token}")
+    return api_client
+
+
+@pytest.mark.django_db
+class TestAsyncEventViews:
+    @pytest.mark.parametrize("query", ["", "?page=1", "?title=Daily+meeting", "?search=daily",
+                                       "?pagination=cursor"])
+    def test_list_matches_sync_view(self, api_client, organized_event, create_event, query):
+        create_event(title="Retro", location="Lviv")
+        bearer(api_client, organized_event[1])
+
+        sync = api_client.get(f"/api/events/{query}")
+        response = api_client.get(f"/api/async/events/{query}")
+
+        assert response.status_code == 200
+        assert response.json()["results"] == sync.json()["results"]
+        assert response.json().get("count") == sync.json().get("count")
+
+    def test_list_pages(self, api_client, create_user, create_event):
+        for i in range(12):
+            create_event(title=f"Event {i}")
+        bearer(api_client, create_user())
+
+        first = api_client.get("/api/async/events/").json()
+        second = api_client.get(first["next"]).json()
+
+        assert first["count"] == 12
+        assert len(second["results"]) == 2
+        assert api_client.get("/api/async/events/?page=9").status_code == 404
+
+    def test_requires_authentication(self, api_client):
+        response = api_client.get("/api/async/events/")
+
+        assert response.status_code == 401
+        assert "WWW-Authenticate" in response
+
+    def test_detail(self, api_client, organized_event, create_user):
+        event, organizer, member = organized_event
+
+        assert bearer(api_client, organizer).get(f"/api/async/event/{event.id}/").json()["title"] == event.title
+
+        response = bearer(api_client, member).get(f"/api/async/event/{event.id}/")
+        assert response.status_code == 403
+        assert response.json() == {"detail": "Participants cannot modify the event."}
+
+        assert bearer(api_client, create_user(email="x@gmail.com")).get(
+            f"/api/async/event/{event.id}/").status_code == 403
+        assert api_client.get("/api/async/event/999/").status_code == 404
+
+
+@pytest.mark.django_db
+class TestAsyncParticipantViews:
+    def test_list_with_filters(self, api_client, organized_event):
+        event, organizer, member = organized_event
+        bearer(api_client, organizer)
+
+        response = api_client.get(f"/api/async/participants/?event={event.id}&role=MEMBER")
+
+        assert response.status_code == 200
+        assert [item["member"] for item in response.json()["results"]] == [member.id]
+
+    def test_register(self, api_client, create_user, create_event):
+        user = create_user()
+        event = create_event()
+        bearer(api_client, user)
+        payload = {"event": event.id, "member": user.id, "role": "member"}
+
+        response = api_client.post("/api/async/participants/", payload, format="json")
+
+        assert response.status_code == 201
+        assert response.json()["role"] == "member"
+        event.refresh_from_db()
+        [notification] = PendingNotification.objects.all()
+        assert notification.to == ["test@gmail.com"]
+        assert "Oleg + Ivanov" in notification.body
+        assert event.members_count == 1
+
+        duplicate = api_client.post("/api/async/participants/", payload, format="json")
+        assert duplicate.json() == {"detail": "You are already registered for this event."}
+
+    def test_register_validation(self, api_client, create_user):
+        bearer(api_client, create_user())
+
+        response = api_client.post("/api/async/participants/", {"event": 999, "role": "guest"}, format="json")
+
+        assert response.status_code == 400
+        assert set(response.json()) == {"event", "member", "role"}
+
+
+def test_concurrency_benchmark():
+    loop = asyncio.new_event_loop()
+    requests = []
+
+    async def handle(reader, writer):
+        requests.append(await reader.readuntil(b"\r\n\r\n"))
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}")
+        await writer.drain()
+        writer.close()
+
+    server = loop.run_until_complete(asyncio.start_server(handle, "127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        report = run_concurrency_benchmark({"asgi": f"http://127.0.0.1:{port}/api/async/events/?page=2"},
+                                           clients=5, requests_per_client=2, slow=0.01, token="token")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    result = report["results"]["asgi"]
+    assert (result["requests"], result["errors"]) == (10, 0)
+    assert requests[0].startswith(b"GET /api/async/events/?page=2 HTTP/1.1\r\n")
+    assert b"Authorization: Bearer token" in requests[0]
@@ -0,0 +1,97 @@
+import pytest
+from django.db import transaction
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from event_api.authentication import ClaimsRefreshToken, forget_user_status
+from event_api.models import PendingNotification
+
+
+def bearer(api_client, user, token_class=ClaimsRefreshToken):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token_class.for_user(user).access_token}")
+    return api_client
+
+
+@pytest.mark.django_db
+class TestClaimsJWTAuthentication:
+    def test_login_embeds_claims(self, api_client, create_user):
+        create_user()
+
+        response = api_client.post("/api/login/", {"email": "test@gmail.com", "password": "TtppZZffd2"})
+
+        access = ClaimsRefreshToken(response.data["refresh"]).access_token
+        assert (access["email"], access["first_name"], access["last_name"], access["is_staff"]) == \
+            ("test@gmail.com", "Oleg", "Ivanov", False)
+
+    def test_no_user_query_while_status_is_cached(self, api_client, create_user, create_event,
+                                                  django_assert_num_queries):
+        user = create_user()
+        bearer(api_client, user)
+        api_client.get("/api/events/")
+
+        # Served from the listing cache and authenticated from the token alone.
+        with django_assert_num_queries(0):
+            response = api_client.get("/api/events/")
+        assert response.status_code == 200
+
+    def test_status_lookup_after_expiry(self, api_client, create_user, django_assert_num_queries):
+        user = create_user()
+        bearer(api_client, user)
+        api_client.get("/api/events/")
+        forget_user_status(user.pk)
+
+        with django_assert_num_queries(1):
+            response = api_client.get("/api/events/")
+        assert response.status_code == 200
+
+    def test_deactivated_user_is_rejected(self, api_client, create_user):
+        user = create_user()
+        bearer(api_client, user)
+        assert api_client.get("/api/events/").status_code == 200
+
+        user.is_active = False
+        user.save()
+
+        assert api_client.get("/api/events/").status_code == 401
+
+    def test_rolled_back_promotion_is_not_cached(self, api_client, create_user):
+        user = create_user()
+        bearer(api_client, user)
+
+        with pytest.raises(RuntimeError), transaction.atomic():
+            user.is_staff = True
+            user.save()
+            raise RuntimeError
+
+        assert api_client.get("/api/list_users/").status_code == 403
+
+    def test_staff_flag_follows_the_database(self, api_client, create_user):
+        user = create_user()
+        user.is_staff = True
+        user.save()
+        bearer(api_client, user)
+        assert api_client.get("/api/list_users/").status_code == 200
+
+        user.is_staff = False
+        user.save()
+
+        assert api_client.get("/api/list_users/").status_code == 403
+
+    def test_old_tokens_fall_back_to_the_database(self, api_client, create_user, create_event):
+        user = create_user()
+        event = create_event()
+        bearer(api_client, user, token_class=RefreshToken)
+
+        response = api_client.post("/api/participants/", {"event": event.id, "member": user.id, "role": "member"})
+
+        assert response.status_code == 201
+        assert PendingNotification.objects.get().to == ["test@gmail.com"]
+
+    def test_event_create_with_token_user(self, api_client, create_user):
+        user = create_user()
+        bearer(api_client, user)
+
+        response = api_client.post("/api/events/", {"title": "Retro", "description": "Sprint retro",
+                                                    "date": "2025-02-12 14:00:00", "location": "Kiev"})
+
+        assert response.status_code == 201
+        assert response.data["organizers_count"] == 1
@@ -0,0 +1,50 @@
+import pytest
+
+from event_api.benchmarks.runner import compare_with_baseline, percentile, run_benchmark
+from event_api.benchmarks.seed import seed_benchmark_data
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+    def test_seed_creates_unique_participants(self):
+        created = seed_benchmark_data(users=30, events=10, participants_per_event=4, batch_size=7)
+        assert created == {"users": 30, "events": 10, "participants": 40}
+
+    def test_run_benchmark_reports_every_scenario(self):
+        seed_benchmark_data(users=30, events=10, participants_per_event=4)
+        report = run_benchmark(requests=3, warmup=0, only=["events_list", "event_detail", "participants_list"])
+
+        assert set(report["results"]) == {"events_list", "event_detail", "participants_list"}
+        for result in report["results"].values():
+            assert result["errors"] == 0
+            assert result["queries"] > 0
+            assert result["p50_ms"] <= result["p95_ms"] <= result["p99_ms"]
+
+
+def test_percentile():
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile([5, 1, 3, 2, 4], 99) == 5
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_with_baseline():
+    baseline = {"results": {"events_list": {"queries": 2, "errors": 0, "p95_ms": 10.0}}}
+    report = {"results": {"events_list": {"queries": 3, "errors": 0, "p95_ms": 13.0}}}
+
+    regressions = compare_with_baseline(report, baseline, tolerance=0.2)
+
+    assert len(regressions) == 2
+    assert compare_with_baseline(baseline, baseline) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_benchmark_with_threads():
+    seed_benchmark_data(users=30, events=10, participants_per_event=4)
+
+    report = run_benchmark(requests=6, warmup=0, only=["events_list", "event_detail"], threads=3)
+
+    assert report["meta"]["threads"] == 3
+    assert report["meta"]["database"]["vendor"] == "sqlite"
+    for result in report["results"].values():
+        assert result["requests"] == 6
+        assert result["errors"] == 0
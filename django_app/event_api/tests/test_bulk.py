@@ -0,0 +1,107 @@
+import pytest
+
+from event_api.models import EventParticipant, EventParticipantQuerySet, PendingNotification
+
+
+@pytest.fixture
+def staff_client(api_client, create_user):
+    staff = create_user(email="staff@gmail.com")
+    staff.is_staff = True
+    staff.save()
+    api_client.force_authenticate(user=staff)
+    return api_client
+
+
+def queued_recipients():
+    return [notification.to[0] for notification in PendingNotification.objects.order_by("id")]
+
+
+@pytest.mark.django_db
+class TestBulkRegistration:
+    def test_per_item_status(self, staff_client, create_user, create_event, create_event_participant,
+                             django_capture_on_commit_callbacks):
+        event = create_event()
+        users = [create_user(email=f"user{i}@gmail.com") for i in range(3)]
+        create_event_participant(event, users[0], "member")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = staff_client.post("/api/participants/bulk/", {"participants": [
+                {"event": event.id, "member": users[0].id, "role": "member"},
+                {"event": event.id, "member": users[1].id, "role": "member"},
+                {"event": event.id, "member": users[2].id, "role": "organizer"},
+                {"event": event.id, "member": users[2].id, "role": "member"},
+                {"event": 999, "member": users[1].id, "role": "member"},
+                {"event": event.id, "member": 999, "role": "member"},
+            ]}, format="json")
+
+        assert response.status_code == 200
+        assert [item["status"] for item in response.data["results"]] == [
+            "already_registered", "created", "created", "already_registered", "event_not_found", "member_not_found",
+        ]
+        assert EventParticipant.objects.filter(event=event).count() == 3
+        assert queued_recipients() == ["user1@gmail.com"]
+
+    def test_registration_racing_in_is_not_reported_as_created(self, staff_client, create_user, create_event,
+                                                               monkeypatch,
+                                                               django_capture_on_commit_callbacks):
+        event = create_event()
+        users = [create_user(email=f"user{i}@gmail.com") for i in range(2)]
+        bulk_create_new = EventParticipantQuerySet.bulk_create_new
+
+        def racing(queryset, objs, batch_size=1000):
+            # Another request registers users[0] between the lookup and the insert.
+            EventParticipant.objects.create(event=event, member=users[0], role="member")
+            return bulk_create_new(queryset, objs, batch_size)
+
+        monkeypatch.setattr(EventParticipantQuerySet, "bulk_create_new", racing)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = staff_client.post("/api/participants/bulk/", {"participants": [
+                {"event": event.id, "member": users[0].id, "role": "member"},
+                {"event": event.id, "member": users[1].id, "role": "member"},
+            ]}, format="json")
+
+        assert [item["status"] for item in response.data["results"]] == ["already_registered", "created"]
+        assert queued_recipients() == ["user1@gmail.com"]
+
+    def test_counters_do_not_count_racing_registrations(self, staff_client, create_user, create_event,
+                                                        monkeypatch):
+        event = create_event()
+        user = create_user(email="user0@gmail.com")
+        bulk_create_new = EventParticipantQuerySet.bulk_create_new
+
+        def racing(queryset, objs, batch_size=1000):
+            EventParticipant.objects.create(event=event, member=user, role="member")
+            return bulk_create_new(queryset, objs, batch_size)
+
+        monkeypatch.setattr(EventParticipantQuerySet, "bulk_create_new", racing)
+        response = staff_client.post("/api/participants/bulk/", {"participants": [
+            {"event": event.id, "member": user.id, "role": "member"},
+        ]}, format="json")
+
+        assert response.data["results"][0]["status"] == "already_registered"
+        event.refresh_from_db()
+        assert event.members_count == 1
+
+    def test_query_count_does_not_grow_with_items(self, staff_client, create_user, create_event,
+                                                  django_assert_max_num_queries):
+        events = [create_event(title=f"Event {i}") for i in range(5)]
+        users = [create_user(email=f"user{i}@gmail.com") for i in range(20)]
+        payload = [{"event": event.id, "member": user.id, "role": "member"} for event in events for user in users]
+
+        with django_assert_max_num_queries(8):
+            response = staff_client.post("/api/participants/bulk/", {"participants": payload}, format="json")
+
+        assert response.status_code == 200
+        assert EventParticipant.objects.count() == 100
+        assert PendingNotification.objects.count() == 100
+
+    def test_invalid_item_rejects_request(self, staff_client):
+        response = staff_client.post("/api/participants/bulk/", {"participants": [
+            {"event": 1, "member": 1, "role": "speaker"},
+        ]}, format="json")
+        assert response.status_code == 400
+
+    def test_requires_staff(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user())
+        response = api_client.post("/api/participants/bulk/", {"participants": []}, format="json")
+        assert response.status_code == 403
@@ -0,0 +1,96 @@
+import pytest
+
+
+@pytest.fixture
+def organizer_client(api_client, create_user, create_event, create_event_participant):
+    organizer = create_user()
+    event = create_event()
+    create_event_participant(event, organizer, "organizer")
+    api_client.force_authenticate(user=organizer)
+    return api_client, event
+
+
+@pytest.mark.django_db
+class TestEventConditionalRequests:
+    def test_detail_not_modified(self, organizer_client, monkeypatch):
+        api_client, event = organizer_client
+        response = api_client.get(f"/api/event/{event.id}/")
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert "Last-Modified" not in response
+
+        monkeypatch.setattr("event_api.views.EventAPIView.get_serializer",
+                            lambda *args, **kwargs: pytest.fail("serializer must not run"))
+        not_modified = api_client.get(f"/api/event/{event.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert not_modified.status_code == 304
+
+    def test_detail_changes_after_registration(self, organizer_client, create_user, create_event_participant):
+        api_client, event = organizer_client
+        response = api_client.get(f"/api/event/{event.id}/")
+
+        # Registrations only move the counters; at_updated stays the same.
+        create_event_participant(event, create_user(email="member@gmail.com"), "member")
+
+        assert api_client.get(f"/api/event/{event.id}/", HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 200
+        changed = api_client.get(f"/api/event/{event.id}/", HTTP_IF_MODIFIED_SINCE="Tue, 01 Jan 2030 00:00:00 GMT")
+        assert changed.status_code == 200
+        assert changed.data["members_count"] == response.data["members_count"] + 1
+
+    def test_detail_changes_after_update(self, organizer_client):
+        api_client, event = organizer_client
+        etag = api_client.get(f"/api/event/{event.id}/")["ETag"]
+
+        updated = api_client.patch(f"/api/event/{event.id}/", {"title": "Renamed"})
+
+        assert updated["ETag"] != etag
+        assert api_client.get(f"/api/event/{event.id}/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_if_match_prevents_lost_update(self, organizer_client):
+        api_client, event = organizer_client
+        etag = api_client.get(f"/api/event/{event.id}/")["ETag"]
+
+        first = api_client.patch(f"/api/event/{event.id}/", {"title": "First"}, HTTP_IF_MATCH=etag)
+        second = api_client.patch(f"/api/event/{event.id}/", {"title": "Second"}, HTTP_IF_MATCH=etag)
+
+        assert first.status_code == 200
+        assert second.status_code == 412
+        event.refresh_from_db()
+        assert event.title == "First"
+
+    def test_if_match_on_delete(self, organizer_client):
+        api_client, event = organizer_client
+        response = api_client.delete(f"/api/event/{event.id}/", HTTP_IF_MATCH='"stale"')
+        assert response.status_code == 412
+
+    def test_list_not_modified(self, api_client, create_user, create_event):
+        create_event()
+        api_client.force_authenticate(user=create_user())
+        etag = api_client.get("/api/events/")["ETag"]
+
+        assert api_client.get("/api/events/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+        assert api_client.get("/api/events/?page=1", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_list_etag_changes_on_create_and_delete(self, api_client, create_user, create_event):
+        event = create_event()
+        api_client.force_authenticate(user=create_user())
+        etag = api_client.get("/api/events/")["ETag"]
+
+        other = create_event(title="Other")
+        with_new_event = api_client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+        assert with_new_event.status_code == 200
+
+        other.delete()
+        event.delete()
+        assert api_client.get("/api/events/", HTTP_IF_NONE_MATCH=with_new_event["ETag"]).status_code == 200
+
+    def test_list_has_no_last_modified(self, api_client, create_user, create_event):
+        event = create_event()
+        create_event(title="Other")
+        api_client.force_authenticate(user=create_user())
+        response = api_client.get("/api/events/")
+        assert "Last-Modified" not in response
+
+        # Deleting an event does not raise the latest at_updated, so a date would wrongly answer 304.
+        event.delete()
+        changed = api_client.get("/api/events/", HTTP_IF_MODIFIED_SINCE="Tue, 01 Jan 2030 00:00:00 GMT")
+        assert changed.status_code == 200
@@ -0,0 +1,91 @@
+import pytest
+from django.core.management import call_command
+
+from event_api.counters import reconcile_event_counters
+from event_api.models import Event
+
+
+def counts(event):
+    event.refresh_from_db()
+    return event.members_count, event.organizers_count
+
+
+@pytest.mark.django_db
+class TestParticipantCounters:
+    def test_create_change_role_and_delete(self, create_user, create_event, create_event_participant):
+        event = create_event()
+        organizer = create_event_participant(event, create_user(), "organizer")
+        member = create_event_participant(event, create_user(email="member@gmail.com"), "member")
+        assert counts(event) == (1, 1)
+
+        member.role = "organizer"
+        member.save()
+        assert counts(event) == (0, 2)
+
+        organizer.delete()
+        assert counts(event) == (0, 1)
+
+    def test_moving_participant_between_events(self, create_user, create_event, create_event_participant):
+        first, second = create_event(title="First"), create_event(title="Second")
+        participant = create_event_participant(first, create_user(), "member")
+
+        participant.event = second
+        participant.save()
+
+        assert counts(first) == (0, 0)
+        assert counts(second) == (1, 0)
+
+    def test_cached_event_is_kept_in_step(self, create_user, create_event, create_event_participant):
+        event = create_event()
+        create_event_participant(event, create_user(), "member")
+        assert event.members_count == 1
+
+    def test_bulk_registration_updates_counters(self, api_client, create_user, create_event):
+        staff = create_user(email="staff@gmail.com")
+        staff.is_staff = True
+        staff.save()
+        events = [create_event(title=f"Event {i}") for i in range(2)]
+        users = [create_user(email=f"user{i}@gmail.com") for i in range(3)]
+        payload = [{"event": event.id, "member": user.id, "role": "member"} for event in events for user in users]
+        api_client.force_authenticate(user=staff)
+
+        api_client.post("/api/participants/bulk/", {"participants": payload}, format="json")
+
+        assert [counts(event) for event in events] == [(3, 0), (3, 0)]
+
+    def test_listing_exposes_counters(self, api_client, create_user, create_event, create_event_participant,
+                                      django_assert_num_queries):
+        user = create_user()
+        create_event_participant(create_event(), user, "organizer")
+        api_client.force_authenticate(user=user)
+
+        with django_assert_num_queries(2):
+            response = api_client.get("/api/events/")
+
+        assert response.data["results"][0]["organizers_count"] == 1
+        assert response.data["results"][0]["members_count"] == 0
+
+    def test_reconcile_command_repairs_drift(self, create_user, create_event, create_event_participant, capsys):
+        event = create_event()
+        create_event_participant(event, create_user(), "member")
+        Event.objects.filter(pk=event.pk).update(members_count=7, organizers_count=3)
+
+        call_command("reconcile_event_counters", batch_size=1)
+
+        assert counts(event) == (1, 0)
+        assert "Reconciled 1 events" in capsys.readouterr().out
+
+    def test_reconcile_counts_in_the_update(self, create_user, create_event, create_event_participant,
+                                            django_assert_num_queries):
+        drifted, correct = create_event(), create_event(title="Correct")
+        create_event_participant(drifted, create_user(), "member")
+        create_event_participant(correct, create_user(email="other@gmail.com"), "organizer")
+        Event.objects.filter(pk=drifted.pk).update(members_count=7)
+
+        # Savepoint, locked ids, UPDATE ... SET = (SELECT COUNT(*)) and release, then savepoint, no ids, release.
+        with django_assert_num_queries(7) as captured:
+            assert reconcile_event_counters() == 1
+
+        assert "COUNT" in next(query["sql"] for query in captured if query["sql"].startswith("UPDATE"))
+        assert counts(drifted) == (1, 0)
+        assert counts(correct) == (0, 1)
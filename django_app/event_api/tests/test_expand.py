@@ -0,0 +1,98 @@
+import pytest
+
+from event_api.authentication import ClaimsRefreshToken
+
+
+@pytest.fixture
+def participants(create_user, create_event, create_event_participant):
+    def add(count, event=None, start=0):
+        event = event or create_event()
+        for number in range(start, start + count):
+            member = create_user(email=f"member{number}@gmail.com", first_name=f"Name{number}")
+            create_event_participant(event, member, "member")
+        return event
+    return add
+
+
+@pytest.mark.django_db
+class TestParticipantExpand:
+    def test_compact_by_default(self, api_client, create_user, participants):
+        event = participants(1)
+        api_client.force_authenticate(user=create_user())
+
+        item = api_client.get("/api/participants/").data["results"][0]
+
+        assert item["event"] == event.id
+        assert isinstance(item["member"], int)
+
+    def test_expand_event_and_member(self, api_client, create_user, create_event_participant, participants):
+        event = participants(1)
+        organizer = create_user()
+        create_event_participant(event, organizer, "organizer")
+        api_client.force_authenticate(user=organizer)
+
+        item = api_client.get(f"/api/participants/?event={event.id}&role=member&expand=event,member").data["results"][0]
+
+        assert item["event"] == {"id": event.id, "title": "Daily meeting", "date": "2025-02-12 14:00:00"}
+        assert item["member"]["email"] == "member0@gmail.com"
+        assert set(item["member"]) == {"id", "first_name", "last_name", "email"}
+
+    def test_member_expansion_needs_staff_or_organizer(self, api_client, create_user, create_event_participant,
+                                                       participants):
+        event = participants(1)
+        member = create_user()
+        create_event_participant(event, member, "member")
+        api_client.force_authenticate(user=member)
+
+        assert api_client.get("/api/participants/?expand=member").status_code == 403
+        assert api_client.get(f"/api/participants/?event={event.id}&expand=member").status_code == 403
+        assert api_client.get(f"/api/participants/?event={event.id}&expand=event").status_code == 200
+
+    def test_staff_can_expand_members(self, api_client, create_user, participants):
+        participants(1)
+        staff = create_user()
+        staff.is_staff = True
+        staff.save()
+        api_client.force_authenticate(user=staff)
+
+        item = api_client.get("/api/participants/?expand=member").data["results"][0]
+
+        assert item["member"]["first_name"] == "Name0"
+
+    @pytest.mark.parametrize("expand", ["", "event", "event,member"])
+    def test_query_count_does_not_grow_with_page_size(self, api_client, create_user, participants,
+                                                      django_assert_num_queries, expand):
+        staff = create_user()
+        staff.is_staff = True
+        staff.save()
+        api_client.force_authenticate(user=staff)
+        event = participants(2)
+        # Count and page queries, related rows are joined.
+        with django_assert_num_queries(2):
+            assert len(api_client.get(f"/api/participants/?expand={expand}").data["results"]) == 2
+
+        participants(8, event=event, start=2)
+        with django_assert_num_queries(2):
+            assert len(api_client.get(f"/api/participants/?expand={expand}").data["results"]) == 10
+
+    def test_unknown_expansion(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user())
+
+        response = api_client.get("/api/participants/?expand=event,password")
+
+        assert response.status_code == 400
+        assert response.data == {"expand": ["Cannot expand 'password'."]}
+
+    def test_async_listing_expands(self, api_client, create_user, create_event_participant, participants):
+        event = participants(1)
+        organizer = create_user()
+        create_event_participant(event, organizer, "organizer")
+        token = ClaimsRefreshToken.for_user(organizer).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        assert api_client.get("/api/async/participants/?expand=member").status_code == 403
+        response = api_client.get(f"/api/async/participants/?event={event.id}&role=member&expand=member")
+
+        assert response.status_code == 200
+        assert response.json()["results"][0]["member"]["first_name"] == "Name0"
+        assert response.json()["results"][0]["event"] == event.id
@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+
+import pytest
+
+from event_api.models import CustomUser, EventParticipant
+
+
+@pytest.fixture
+def organized_event(create_user, create_event, create_event_participant):
+    organizer = create_user()
+    member = create_user(email="member@gmail.com", first_name="Stas", last_name="Stasov")
+    event = create_event()
+    create_event_participant(event, organizer, "organizer")
+    create_event_participant(event, member, "member")
+    return event, organizer, member
+
+
+def export(api_client, event, export_format=None):
+    query = f"?export_format={export_format}" if export_format else ""
+    return api_client.get(f"/api/event/{event.id}/participants/export/{query}")
+
+
+@pytest.mark.django_db
+class TestParticipantExport:
+    def test_csv(self, api_client, organized_event, django_assert_num_queries):
+        event, organizer, member = organized_event
+        api_client.force_authenticate(user=organizer)
+
+        # The event with the caller's role, then the participant rows.
+        with django_assert_num_queries(2):
+            response = export(api_client, event)
+            content = b"".join(response.streaming_content).decode()
+
+        assert response["Content-Type"] == "text/csv"
+        assert response["Content-Disposition"] == f'attachment; filename="event-{event.id}-participants.csv"'
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [(row["email"], row["first_name"], row["role"]) for row in rows] == [
+            ("test@gmail.com", "Oleg", "organizer"), ("member@gmail.com", "Stas", "member")]
+        assert rows[1]["member"] == str(member.id)
+
+    def test_ndjson(self, api_client, organized_event):
+        event, organizer, _ = organized_event
+        api_client.force_authenticate(user=organizer)
+
+        response = export(api_client, event, "ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert [json.loads(line)["last_name"] for line in lines] == ["Ivanov", "Stasov"]
+        assert json.loads(lines[0])["register_time"].endswith("Z")
+
+    def test_large_event_is_streamed_in_batches(self, api_client, organized_event, settings):
+        settings.PARTICIPANT_EXPORT_CHUNK_SIZE = 100
+        event, organizer, _ = organized_event
+        users = CustomUser.objects.bulk_create(
+            CustomUser(email=f"user{i}@gmail.com", first_name="F", last_name="L") for i in range(1200))
+        EventParticipant.objects.bulk_create(EventParticipant(event=event, member=user, role="member")
+                                             for user in users)
+        api_client.force_authenticate(user=organizer)
+
+        response = export(api_client, event)
+        chunks = list(response.streaming_content)
+
+        assert response.streaming
+        assert len(chunks) > 2
+        assert b"".join(chunks).count(b"\n") == 1 + 1202
+
+    def test_only_organizers_can_export(self, api_client, organized_event, create_user):
+        event, _, member = organized_event
+
+        api_client.force_authenticate(user=member)
+        assert export(api_client, event).status_code == 403
+
+        api_client.force_authenticate(user=create_user(email="outsider@gmail.com"))
+        assert export(api_client, event).status_code == 403
+
+        assert api_client.get("/api/event/999/participants/export/").status_code == 404
+
+    def test_unknown_format(self, api_client, organized_event):
+        event, organizer, _ = organized_event
+        api_client.force_authenticate(user=organizer)
+
+        response = export(api_client, event, "xlsx")
+
+        assert response.status_code == 400
+        assert "export_format" in response.data
@@ -0,0 +1,97 @@
+import zoneinfo
+
+import pytest
+from django.utils import timezone
+
+from event_api.benchmarks.seed import seed_benchmark_data
+from event_api.benchmarks.serialization import run_serialization_benchmark
+from event_api.fast_serializers import EventParticipantValuesSerializer, EventValuesSerializer
+from event_api.models import Event, EventParticipant
+from event_api.serializers import EventParticipantSerializer, EventSerializer
+
+
+@pytest.fixture
+def participant(create_user, create_event, create_event_participant):
+    return create_event_participant(create_event(), create_user(), "member")
+
+
+@pytest.mark.django_db
+class TestValuesSerializers:
+    @pytest.mark.parametrize("fields", [None, ["date", "title"]])
+    def test_events_match_drf(self, participant, fields):
+        events = Event.objects.order_by("id")
+        drf = EventSerializer(events, many=True, fields=fields).data
+        fast = EventValuesSerializer(fields=fields)
+
+        assert EventValuesSerializer(list(fast.values(events)), fields=fields).data == drf
+
+    def test_participants_match_drf(self, participant):
+        participants = EventParticipant.objects.order_by("id")
+        fast = EventParticipantValuesSerializer()
+
+        data = EventParticipantValuesSerializer(list(fast.values(participants))).data
+
+        assert data == EventParticipantSerializer(participants, many=True).data
+        assert data[0]["register_time"].endswith("Z")
+
+    def test_active_timezone(self, participant):
+        participants = EventParticipant.objects.all()
+        with timezone.override(zoneinfo.ZoneInfo("Europe/Kiev")):
+            drf = EventParticipantSerializer(participants, many=True).data
+            fast = EventParticipantValuesSerializer(list(EventParticipantValuesSerializer().values(participants)))
+
+            assert fast.data == drf
+            assert fast.data[0]["register_time"].endswith(("+02:00", "+03:00"))
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def test_events_list(self, api_client, participant):
+        api_client.force_authenticate(user=participant.member)
+
+        response = api_client.get("/api/events/?fields=title,date")
+
+        assert response.data["results"] == [{"date": "2025-02-12 14:00:00", "title": "Daily meeting"}]
+        assert list(response.data["results"][0]) == ["title", "date"]
+
+    def test_participants_list(self, api_client, participant):
+        api_client.force_authenticate(user=participant.member)
+
+        response = api_client.get("/api/participants/?fields=role,member")
+
+        assert response.data["results"] == [{"role": "member", "member": participant.member_id}]
+
+    def test_participants_list_with_expand(self, api_client, participant):
+        api_client.force_authenticate(user=participant.member)
+
+        response = api_client.get("/api/participants/?fields=id,event&expand=event,member")
+
+        assert response.data["results"] == [{"id": participant.id, "event": {
+            "id": participant.event_id, "title": "Daily meeting", "date": "2025-02-12 14:00:00"}}]
+
+    def test_cursor_pagination(self, api_client, participant, create_event):
+        create_event(title="Retro", date="13-02-2025 14:00:00")
+        api_client.force_authenticate(user=participant.member)
+
+        response = api_client.get("/api/events/?fields=title&pagination=cursor")
+
+        assert response.data == {"next": None, "results": [{"title": "Daily meeting"}, {"title": "Retro"}]}
+
+    def test_unknown_field(self, api_client, participant):
+        api_client.force_authenticate(user=participant.member)
+
+        response = api_client.get("/api/events/?fields=title,secret")
+
+        assert response.status_code == 400
+        assert response.data == {"fields": ["Unknown field 'secret'."]}
+
+
+@pytest.mark.django_db
+def test_serialization_benchmark():
+    seed_benchmark_data(users=20, events=5, participants_per_event=4)
+
+    report = run_serialization_benchmark(rows=10, repeat=2, fields=["title", "role"])
+
+    assert set(report["results"]) == {"events", "participants"}
+    assert report["results"]["events"]["fields"] == ["title"]
+    assert report["results"]["participants"]["rows"] == 10
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from event_api import importer
+from event_api.importer import import_records
+from event_api.models import CustomUser, Event, EventParticipant, ImportCheckpoint
+
+USERS_CSV = """email,first_name,last_name,password,is_staff
+oleg@gmail.com,Oleg,Ivanov,secret,false
+stas@GMAIL.com,Stas,Stasov,secret,true
+not-an-email,Bad,Row,secret,false
+oleg@gmail.com,Oleg,Again,secret,false
+"""
+
+
+@pytest.fixture(autouse=True)
+def fast_hashing(settings):
+    settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.mark.django_db
+class TestImport:
+    def test_users_from_csv(self, tmp_path):
+        errors = []
+        stats = import_records(write(tmp_path, "users.csv", USERS_CSV), "users", workers=0,
+                               on_error=lambda number, record_errors: errors.append(number))
+
+        assert (stats["records"], stats["created"], stats["skipped"], stats["invalid"]) == (4, 2, 1, 1)
+        assert errors == [3]
+        stas = CustomUser.objects.get(email="stas@gmail.com")
+        assert stas.is_staff and stas.check_password("secret")
+
+    def test_passwords_hashed_in_process_pool(self, tmp_path):
+        import_records(write(tmp_path, "users.csv", USERS_CSV), "users", workers=2)
+
+        assert CustomUser.objects.get(email="oleg@gmail.com").check_password("secret")
+
+    def test_events_from_ndjson(self, tmp_path):
+        lines = [json.dumps({"title": "Meetup", "description": "Talks", "date": "2025-02-12 14:00:00",
+                             "location": "Kiev"}), "{broken", json.dumps({"title": "No date"})]
+        stats = import_records(write(tmp_path, "events.ndjson", "\n".join(lines)), "events")
+
+        assert (stats["created"], stats["invalid"]) == (1, 2)
+        assert list(Event.objects.values_list("title", flat=True)) == ["Meetup"]
+
+    def test_participants_adjust_counters(self, tmp_path, create_user, create_event):
+        event = create_event()
+        member = create_user()
+        content = (f"event,member,role\n{event.id},{member.id},member\n{event.id},{member.id},member\n"
+                   f"999,{member.id},member\n")
+
+        stats = import_records(write(tmp_path, "participants.csv", content), "participants")
+
+        assert (stats["created"], stats["skipped"], stats["invalid"]) == (1, 1, 1)
+        event.refresh_from_db()
+        assert event.members_count == 1
+        assert EventParticipant.objects.filter(event=event, member=member).exists()
+
+    def test_participants_registered_during_import_are_not_counted(self, tmp_path, create_user, create_event,
+                                                                   monkeypatch, django_capture_on_commit_callbacks):
+        event = create_event()
+        members = [create_user(email=f"member{number}@gmail.com") for number in range(2)]
+        content = "event,member,role\n" + "".join(f"{event.id},{member.id},member\n" for member in members)
+        build = importer.ParticipantImporter.build
+        invalidated = []
+
+        def racing_build(self, rows, pool):
+            built = build(self, rows, pool)
+            # members[0] registers through the API after the lookup in build().
+            EventParticipant.objects.create(event=event, member=members[0], role="member")
+            return built
+
+        monkeypatch.setattr(importer.ParticipantImporter, "build", racing_build)
+        monkeypatch.setattr(importer, "invalidate_event_role", lambda member_id, event_id: invalidated.append(member_id))
+        with django_capture_on_commit_callbacks(execute=True):
+            stats = import_records(write(tmp_path, "participants.csv", content), "participants")
+
+        assert (stats["created"], stats["skipped"]) == (1, 1)
+        event.refresh_from_db()
+        assert event.members_count == 2
+        assert invalidated == [members[1].id]
+
+    def test_users_signing_up_during_import_are_skipped(self, tmp_path, create_user, monkeypatch):
+        build = importer.UserImporter.build
+
+        def racing_build(self, rows, pool):
+            built = build(self, rows, pool)
+            # oleg@gmail.com signs up through the API after the lookup in build().
+            create_user(email="oleg@gmail.com", first_name="Oleg", last_name="Signup")
+            return built
+
+        monkeypatch.setattr(importer.UserImporter, "build", racing_build)
+        stats = import_records(write(tmp_path, "users.csv", USERS_CSV), "users", workers=0)
+
+        assert (stats["created"], stats["skipped"], stats["invalid"]) == (1, 2, 1)
+        assert CustomUser.objects.get(email="oleg@gmail.com").last_name == "Signup"
+
+    def test_resumes_after_failed_batch(self, tmp_path, monkeypatch):
+        lines = [json.dumps({"title": f"Event {number}", "description": "Talks", "date": "2025-02-12 14:00:00",
+                             "location": "Kiev"}) for number in range(5)]
+        path = write(tmp_path, "events.ndjson", "\n".join(lines))
+        save = importer.EventImporter.save
+        calls = []
+
+        def failing_save(self, objects, batch_size):
+            calls.append(len(objects))
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return save(self, objects, batch_size)
+
+        monkeypatch.setattr(importer.EventImporter, "save", failing_save)
+        with pytest.raises(RuntimeError):
+            import_records(path, "events", batch_size=2)
+        assert Event.objects.count() == 2
+        assert ImportCheckpoint.objects.get().records == 2
+
+        stats = import_records(path, "events", batch_size=2)
+
+        assert (stats["resumed_from"], stats["created"]) == (2, 3)
+        assert sorted(Event.objects.values_list("title", flat=True)) == [f"Event {number}" for number in range(5)]
+
+        assert import_records(path, "events")["records"] == 0
+
+    def test_command_reports_rate(self, tmp_path, capsys):
+        call_command("import_data", "users", write(tmp_path, "users.csv", USERS_CSV), "--workers", "0")
+
+        out, err = capsys.readouterr()
+        assert "Imported 2 users (1 skipped, 1 invalid) from 4 records" in out
+        assert "rows/sec" in out
+        assert err.startswith("Record 3:")
@@ -0,0 +1,82 @@
+import pytest
+
+from event_api.benchmarks.list_cache import run_list_cache_benchmark
+from event_api.benchmarks.seed import seed_benchmark_data
+from event_api.list_cache import list_cache_hits, list_cache_misses
+
+
+@pytest.fixture
+def client(api_client, create_user):
+    api_client.force_authenticate(user=create_user())
+    return api_client
+
+
+@pytest.mark.django_db
+class TestEventListCache:
+    def test_second_request_is_served_from_cache(self, client, create_event, django_assert_num_queries):
+        create_event()
+        hits, misses = list_cache_hits.value(), list_cache_misses.value()
+
+        first = client.get("/api/events/?location=Kiev&title=Daily+meeting")
+        with django_assert_num_queries(0):
+            second = client.get("/api/events/?title=Daily+meeting&location=Kiev")
+
+        assert second.data == first.data
+        assert second["ETag"] == first["ETag"]
+        assert (list_cache_hits.value() - hits, list_cache_misses.value() - misses) == (1, 1)
+
+    def test_cached_page_answers_conditional_requests(self, client, create_event):
+        create_event()
+        etag = client.get("/api/events/")["ETag"]
+
+        response = client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_pages_are_cached_separately(self, client, create_event):
+        create_event(title="Daily meeting")
+        create_event(title="Retro")
+
+        assert client.get("/api/events/?title=Retro").data["count"] == 1
+        assert client.get("/api/events/").data["count"] == 2
+
+    def test_event_changes_invalidate(self, client, create_event):
+        event = create_event(title="Old title")
+        client.get("/api/events/")
+
+        event.title = "New title"
+        event.save()
+        assert client.get("/api/events/").data["results"][0]["title"] == "New title"
+
+        create_event(title="Another")
+        assert client.get("/api/events/").data["count"] == 2
+
+        event.delete()
+        assert client.get("/api/events/").data["count"] == 1
+
+    def test_participant_changes_invalidate(self, client, create_user, create_event, create_event_participant):
+        event = create_event()
+        client.get("/api/events/")
+
+        create_event_participant(event, create_user(email="member@gmail.com"), "member")
+
+        assert client.get("/api/events/").data["results"][0]["members_count"] == 1
+
+    def test_cache_can_be_disabled(self, client, create_event, settings, django_assert_num_queries):
+        settings.EVENT_LIST_CACHE = {**settings.EVENT_LIST_CACHE, "ALIAS": None}
+        create_event()
+        client.get("/api/events/")
+
+        with django_assert_num_queries(2):
+            client.get("/api/events/")
+
+    def test_benchmark_compares_cached_and_uncached(self):
+        seed_benchmark_data(users=20, events=10, participants_per_event=3)
+
+        report = run_list_cache_benchmark(requests=3, warmup=1)
+
+        assert set(report["results"]) == {"events_list", "events_list_deep_page", "events_list_cursor",
+                                          "events_search"}
+        assert report["meta"]["hits"] > 0
+        for result in report["results"].values():
+            assert result["cached"]["errors"] == result["uncached"]["errors"] == 0
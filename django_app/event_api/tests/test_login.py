@@ -0,0 +1,93 @@
+import pytest
+from django.contrib.auth.hashers import make_password
+
+from event_api.benchmarks.login import run_login_benchmark
+from event_api.benchmarks.seed import seed_benchmark_data
+from event_api.hashers import get_hashing_executor, verify_password
+from event_api.models import CustomUser
+
+SCRYPT_FIRST = [
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "event_api.hashers.TunedPBKDF2PasswordHasher",
+]
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashing(settings):
+    settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+
+
+def login(client, password="TtppZZffd2", path="/api/async/login/"):
+    return client.post(path, {"email": "test@gmail.com", "password": password}, format="json")
+
+
+@pytest.mark.django_db
+class TestAsyncLogin:
+    def test_returns_tokens(self, api_client, create_user):
+        create_user()
+
+        response = login(api_client)
+
+        assert response.status_code == 200
+        assert set(response.json()) == {"refresh", "access"}
+
+    def test_invalid_credentials(self, api_client, create_user):
+        create_user()
+
+        assert login(api_client, password="wrong").status_code == 401
+        assert api_client.post("/api/async/login/", {"email": "nobody@gmail.com", "password": "x"},
+                               format="json").status_code == 401
+
+    def test_invalid_body(self, api_client):
+        response = api_client.post("/api/async/login/", {"email": "not-an-email"}, format="json")
+
+        assert response.status_code == 400
+        assert set(response.json()) == {"email", "password"}
+
+    def test_rehash_on_iteration_change(self, api_client, create_user, settings):
+        user = create_user()
+        settings.PASSWORD_PBKDF2_ITERATIONS = 2000
+
+        assert login(api_client).status_code == 200
+
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+
+    @pytest.mark.parametrize("path", ["/api/async/login/", "/api/login/"])
+    def test_rehash_to_preferred_profile(self, api_client, create_user, settings, path):
+        user = create_user()
+        settings.PASSWORD_HASHERS = SCRYPT_FIRST
+
+        assert login(api_client, path=path).status_code == 200
+
+        user.refresh_from_db()
+        assert user.password.startswith("scrypt$")
+        assert login(api_client, path=path).status_code == 200
+
+
+def test_verify_password_returns_hash_to_store(settings):
+    encoded = make_password("secret")
+
+    assert verify_password("wrong", encoded) is None
+    assert verify_password("secret", encoded) == encoded
+    settings.PASSWORD_HASHERS = SCRYPT_FIRST
+    assert verify_password("secret", encoded).startswith("scrypt$")
+
+
+def test_process_pool(settings):
+    settings.PASSWORD_HASHING_EXECUTOR = {"KIND": "process", "MAX_WORKERS": 1}
+    encoded = make_password("secret")
+
+    assert get_hashing_executor().submit(verify_password, "secret", encoded).result(timeout=30) == encoded
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_benchmark():
+    seed_benchmark_data(users=3, events=1, participants_per_event=1)
+
+    report = run_login_benchmark(logins=4, concurrency=2, profiles=["pbkdf2"])
+
+    result = report["results"]["pbkdf2"]
+    assert result["sync"]["errors"] == result["async_pool"]["errors"] == 0
+    assert result["async_pool"]["logins_per_sec"] > 0
+    assert CustomUser.objects.count() == 3
@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.utils import timezone
+
+from event_api import tasks
+from event_api.mail import RateLimiter, claim_notifications, deliver, deliver_notifications
+from event_api.models import PendingNotification
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+
+class FlakyBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any("fail" in address for message in messages for address in message.to):
+            raise OSError("connection reset")
+        return super().send_messages(messages)
+
+
+def make_messages(*recipients):
+    return [EmailMessage("Subject", "Body", "events@example.com", [recipient]) for recipient in recipients]
+
+
+def test_deliver_reuses_one_connection(settings):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.CountingBackend"
+    CountingBackend.opened = 0
+
+    failed = deliver(make_messages("a@example.com", "b@example.com", "c@example.com"))
+
+    assert failed == []
+    assert CountingBackend.opened == 1
+    assert len(mail.outbox) == 3
+
+
+def test_deliver_returns_failed_messages(settings):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.FlakyBackend"
+
+    failed = deliver(make_messages("a@example.com", "fail@example.com", "b@example.com"))
+
+    assert [message.to for message in failed] == [["fail@example.com"]]
+    assert len(mail.outbox) == 2
+
+
+@pytest.mark.django_db
+def test_backoff_doubles_with_every_attempt(settings):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.FlakyBackend"
+    tasks.queue_invitations([("fail@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")])
+    PendingNotification.objects.update(attempts=2)
+    now = timezone.now()
+
+    assert deliver_notifications(claim_notifications(10, now), now) == 0
+
+    notification = PendingNotification.objects.get()
+    assert notification.attempts == 3
+    assert notification.available_at == now + timedelta(seconds=settings.NOTIFICATION_RETRY_BACKOFF * 4)
+
+
+def test_rate_limiter_waits_for_tokens():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+
+    assert waits == [0.5, 0.5]
+
+
+@pytest.mark.django_db
+def test_many_registrations_are_sent_over_one_connection(settings, api_client, create_user, create_event):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.CountingBackend"
+    CountingBackend.opened = 0
+    event = create_event()
+    for index in range(5):
+        user = create_user(email=f"member{index}@example.com")
+        api_client.force_authenticate(user=user)
+        api_client.post("/api/participants/", {"event": event.id, "member": user.id, "role": "member"})
+    assert mail.outbox == []
+
+    assert tasks.flush_notifications() == 5
+
+    assert CountingBackend.opened == 1
+    assert sorted(message.to[0] for message in mail.outbox) == [f"member{index}@example.com" for index in range(5)]
+    assert not PendingNotification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_full_batch_triggers_a_flush(settings, django_capture_on_commit_callbacks):
+    settings.NOTIFICATION_BATCH_SIZE = 3
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        for index in range(3):
+            tasks.queue_invitations([(f"member{index}@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")])
+
+    # Any three consecutive ids cross one multiple of the batch size.
+    assert len(callbacks) == 1
+    assert len(mail.outbox) >= 1
+
+
+@pytest.mark.django_db
+def test_failed_notification_waits_for_backoff(settings):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.FlakyBackend"
+    tasks.queue_invitations([("fail@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")])
+
+    assert tasks.flush_notifications() == 0
+    notification = PendingNotification.objects.get()
+    assert notification.attempts == 1
+    assert notification.available_at > timezone.now() + timedelta(seconds=settings.NOTIFICATION_RETRY_BACKOFF - 5)
+
+    # Not due yet, so the next flush leaves it alone.
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    assert tasks.flush_notifications() == 0
+    assert mail.outbox == []
+
+
+@pytest.mark.django_db
+def test_notification_is_dropped_after_max_retries(settings):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.FlakyBackend"
+    tasks.queue_invitations([("fail@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")])
+    PendingNotification.objects.update(attempts=settings.NOTIFICATION_MAX_RETRIES)
+
+    tasks.flush_notifications()
+
+    assert not PendingNotification.objects.exists()
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from event_api.views import EventListAPIView
+
+
+@pytest.fixture
+def many_events(create_event):
+    # Three events share each date so the id tie-breaker is exercised.
+    return [create_event(title=f"Event {i}", date=f"{10 + i // 3}-02-2025 14:00:00") for i in range(25)]
+
+
+def walk(api_client, url):
+    seen = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        seen.extend(item["title"] for item in response.data["results"])
+        url = response.data["next"]
+    return seen
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_cursor_walk_returns_every_event_in_order(self, api_client, create_user, many_events):
+        api_client.force_authenticate(user=create_user())
+
+        titles = walk(api_client, "/api/events/?pagination=cursor")
+
+        expected = sorted(many_events, key=lambda event: (event.date, event.id))
+        assert titles == [event.title for event in expected]
+
+    def test_cursor_page_runs_no_count(self, api_client, create_user, many_events):
+        api_client.force_authenticate(user=create_user())
+        first = api_client.get("/api/events/?pagination=cursor")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(first.data["next"])
+
+        assert response.status_code == 200
+        assert len(queries) == 1
+        assert "COUNT(" not in queries[0]["sql"].upper()
+        assert "OFFSET" not in queries[0]["sql"].upper()
+
+    def test_page_number_mode_is_default(self, api_client, create_user, many_events):
+        api_client.force_authenticate(user=create_user())
+        response = api_client.get("/api/events/?page=3")
+        assert response.data["count"] == 25
+        assert len(response.data["results"]) == 5
+
+    def test_view_level_opt_in(self, api_client, create_user, many_events, monkeypatch):
+        monkeypatch.setattr(EventListAPIView, "pagination_mode", "cursor", raising=False)
+        api_client.force_authenticate(user=create_user())
+
+        assert "count" not in api_client.get("/api/events/").data
+        assert "count" in api_client.get("/api/events/?pagination=page").data
+
+    def test_participants_cursor_by_event(self, api_client, create_user, create_event, create_event_participant):
+        event = create_event()
+        users = [create_user(email=f"user{i}@gmail.com") for i in range(12)]
+        for user in users:
+            create_event_participant(event, user, "member")
+        api_client.force_authenticate(user=users[0])
+
+        response = api_client.get(f"/api/participants/?event={event.id}&pagination=cursor")
+        second = api_client.get(response.data["next"])
+
+        members = [item["member"] for item in response.data["results"] + second.data["results"]]
+        assert members == [user.id for user in users]
+        assert second.data["next"] is None
+
+    def test_invalid_cursor(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user())
+        response = api_client.get("/api/events/?cursor=not-a-cursor")
+        assert response.status_code == 404
+
+    def test_ranked_search_rejects_cursor_mode(self, api_client, create_user, create_event):
+        create_event(title="Python workshop")
+        create_event(title="Daily meeting", description="Python workshop planning")
+        api_client.force_authenticate(user=create_user())
+
+        response = api_client.get("/api/events/?search=python&pagination=cursor")
+        assert response.status_code == 400
+        assert "pagination" in response.data
+
+        ranked = api_client.get("/api/events/?search=python&pagination=page")
+        assert [item["title"] for item in ranked.data["results"]] == ["Python workshop", "Daily meeting"]
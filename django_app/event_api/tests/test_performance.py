@@ -0,0 +1,141 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory
+
+from event_api.authentication import ClaimsRefreshToken
+from event_api.metrics import histogram, render_prometheus
+from event_api.middleware import PerformanceMiddleware, ReplicaRoutingMiddleware
+from event_api.models import Event
+from event_api.performance import request_queries, request_serializer_duration, requests_total
+
+
+@pytest.fixture
+def monitoring(settings):
+    def configure(**overrides):
+        settings.PERFORMANCE_MONITORING = {**settings.PERFORMANCE_MONITORING, **overrides}
+    return configure
+
+
+def test_histogram_exposition():
+    metric = histogram("test_histogram_seconds", "Test histogram", (0.1, 1))
+    metric.reset()
+    for value in (0.05, 0.1, 0.5, 3):
+        metric.observe(value, view="a")
+
+    lines = render_prometheus().splitlines()
+
+    assert "# TYPE test_histogram_seconds histogram" in lines
+    assert 'test_histogram_seconds_bucket{view="a",le="0.1"} 2' in lines
+    assert 'test_histogram_seconds_bucket{view="a",le="1"} 3' in lines
+    assert 'test_histogram_seconds_bucket{view="a",le="+Inf"} 4' in lines
+    assert 'test_histogram_seconds_count{view="a"} 4' in lines
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    def test_records_per_view_metrics(self, api_client, create_user, create_event):
+        create_event()
+        api_client.force_authenticate(user=create_user())
+        labels = {"view": "api/events/", "method": "GET"}
+        requests_before = requests_total.value(status=200, **labels)
+        serialized_before = request_serializer_duration.count(**labels)
+
+        assert api_client.get("/api/events/").status_code == 200
+
+        assert requests_total.value(status=200, **labels) == requests_before + 1
+        assert request_serializer_duration.count(**labels) == serialized_before + 1
+        assert request_queries.count(**labels) >= 1
+
+    def test_server_timing_is_opt_in(self, api_client, create_user, create_event, monitoring):
+        event = create_event()
+        api_client.force_authenticate(user=create_user())
+        assert "Server-Timing" not in api_client.get("/api/events/")
+
+        monitoring(SERVER_TIMING=True)
+        response = api_client.get(f"/api/participants/?event={event.id}")
+
+        total, db, serializer = response["Server-Timing"].split(", ")
+        assert total.startswith("total;dur=")
+        assert db.startswith("db;dur=") and db.endswith(' queries"')
+        assert serializer.startswith("serializer;dur=")
+
+    def test_async_requests(self, create_user, create_event, monitoring):
+        create_event()
+        token = ClaimsRefreshToken.for_user(create_user()).access_token
+        labels = {"view": "api/async/events/", "method": "GET"}
+        requests_before = requests_total.value(status=200, **labels)
+        monitoring(SERVER_TIMING=True)
+
+        response = async_to_sync(AsyncClient().get)("/api/async/events/", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert requests_total.value(status=200, **labels) == requests_before + 1
+        # Queries the view runs in sync_to_async threads count for the request.
+        db = response["Server-Timing"].split(", ")[1]
+        assert int(db.split('desc="')[1].split()[0]) >= 1
+
+    def test_middlewares_run_without_adaptation_under_asgi(self, settings, caplog):
+        settings.DEBUG = True  # Django only logs adaptations in debug mode
+        with caplog.at_level(logging.DEBUG, logger="django.request"):
+            handler = ASGIHandler()
+            handler.load_middleware(is_async=True)
+
+        adapted = [record.getMessage() for record in caplog.records if "adapted" in record.getMessage()]
+        assert not any("event_api.middleware" in message for message in adapted)
+        # Adapted methods are wrapped; the replica router's own coroutine is registered as is.
+        view_middleware = [getattr(method, "__func__", None) for method in handler._view_middleware]
+        assert ReplicaRoutingMiddleware.aprocess_view in view_middleware
+
+    def test_metrics_endpoint(self, client, api_client, create_user):
+        api_client.force_authenticate(user=create_user())
+        api_client.get("/api/events/")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.content.decode()
+        assert 'http_requests_total{method="GET",status="200",view="api/events/"}' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",view="api/events/",le="+Inf"}' in body
+        assert "# TYPE event_list_cache_misses_total counter" in body
+
+    def test_metrics_endpoint_is_local(self, client, monitoring):
+        monitoring(METRICS_ALLOWED_IPS=["10.0.0.5"])
+
+        assert client.get("/metrics").status_code == 404
+        assert client.get("/metrics", REMOTE_ADDR="10.0.0.5").status_code == 200
+
+    def test_logs_repeated_queries(self, create_event, monitoring, caplog):
+        event = create_event()
+        monitoring(REPEATED_QUERY_THRESHOLD=3)
+
+        def n_plus_one(request):
+            for _ in range(3):
+                Event.objects.get(pk=event.pk)
+            return HttpResponse("ok")
+
+        with caplog.at_level(logging.WARNING, logger="event_api.middleware"):
+            PerformanceMiddleware(n_plus_one)(RequestFactory().get("/n-plus-one/"))
+
+        [record] = caplog.records
+        assert record.getMessage().startswith("Repeated query in GET /n-plus-one/: 3 times: SELECT")
+
+    def test_logs_slow_requests(self, monitoring, caplog):
+        monitoring(SLOW_REQUEST_MS=0)
+
+        with caplog.at_level(logging.WARNING, logger="event_api.middleware"):
+            PerformanceMiddleware(lambda request: HttpResponse("ok"))(RequestFactory().get("/slow/"))
+
+        assert caplog.records[0].getMessage().startswith("Slow request GET /slow/:")
+
+    def test_disabled(self, monitoring):
+        monitoring(ENABLED=False)
+        before = requests_total.value(status=200, view="unmatched", method="GET")
+
+        PerformanceMiddleware(lambda request: HttpResponse("ok"))(RequestFactory().get("/off/"))
+
+        assert requests_total.value(status=200, view="unmatched", method="GET") == before
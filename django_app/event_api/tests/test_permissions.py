@@ -0,0 +1,79 @@
+import pytest
+
+
+@pytest.fixture
+def organized_event(create_user, create_event, create_event_participant):
+    organizer = create_user()
+    member = create_user(email="member@gmail.com", first_name="Stas", last_name="Stasov")
+    event = create_event()
+    create_event_participant(event, organizer, "organizer")
+    participant = create_event_participant(event, member, "member")
+    return event, organizer, member, participant
+
+
+@pytest.mark.django_db
+class TestEventPermissionQueries:
+    def test_event_detail_single_query(self, api_client, organized_event, django_assert_num_queries):
+        event, organizer, _, _ = organized_event
+        api_client.force_authenticate(user=organizer)
+        with django_assert_num_queries(1):
+            response = api_client.get(f"/api/event/{event.id}/")
+        assert response.status_code == 200
+
+    def test_event_update_queries(self, api_client, organized_event, django_assert_num_queries):
+        event, organizer, _, _ = organized_event
+        api_client.force_authenticate(user=organizer)
+        # Select and update, plus the savepoint and release of the view's atomic block.
+        with django_assert_num_queries(4):
+            response = api_client.patch(f"/api/event/{event.id}/", {"title": "Renamed"})
+        assert response.status_code == 200
+
+    def test_event_detail_as_member_is_forbidden(self, api_client, organized_event, django_assert_num_queries):
+        event, _, member, _ = organized_event
+        api_client.force_authenticate(user=member)
+        with django_assert_num_queries(1):
+            response = api_client.get(f"/api/event/{event.id}/")
+        assert response.status_code == 403
+        assert response.data["detail"] == "Participants cannot modify the event."
+
+    def test_event_detail_as_outsider_is_forbidden(self, api_client, organized_event, create_user):
+        event, _, _, _ = organized_event
+        api_client.force_authenticate(user=create_user(email="outsider@gmail.com"))
+        response = api_client.get(f"/api/event/{event.id}/")
+        assert response.status_code == 403
+
+    def test_missing_event(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user())
+        response = api_client.get("/api/event/999/")
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestParticipantPermissionQueries:
+    def test_participant_detail_as_organizer_single_query(self, api_client, organized_event,
+                                                          django_assert_num_queries):
+        _, organizer, _, participant = organized_event
+        api_client.force_authenticate(user=organizer)
+        with django_assert_num_queries(1):
+            response = api_client.get(f"/api/participants/{participant.id}/")
+        assert response.status_code == 200
+
+    def test_participant_detail_as_self_single_query(self, api_client, organized_event, django_assert_num_queries):
+        _, _, member, participant = organized_event
+        api_client.force_authenticate(user=member)
+        with django_assert_num_queries(1):
+            response = api_client.get(f"/api/participants/{participant.id}/")
+        assert response.status_code == 200
+
+    def test_participant_delete_queries(self, api_client, organized_event, django_assert_num_queries):
+        _, organizer, _, participant = organized_event
+        api_client.force_authenticate(user=organizer)
+        # Delete plus the counter update.
+        with django_assert_num_queries(3):
+            response = api_client.delete(f"/api/participants/{participant.id}/")
+        assert response.status_code == 204
+
+    def test_missing_participant(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user())
+        response = api_client.get("/api/participants/999/")
+        assert response.status_code == 404
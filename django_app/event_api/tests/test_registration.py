@@ -0,0 +1,121 @@
+import pytest
+from django.db import IntegrityError
+
+from event_api.models import Event, EventParticipant, PendingNotification
+
+
+@pytest.mark.django_db
+class TestRegistration:
+    def test_duplicate_registration(self, api_client, create_user, create_event, create_event_participant):
+        user = create_user()
+        event = create_event()
+        create_event_participant(event, user, "organizer")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post("/api/participants/", {"event": event.id, "member": user.id, "role": "organizer"})
+
+        assert response.status_code == 200
+        assert response.data == {"detail": "You are already registered for this event."}
+        assert EventParticipant.objects.filter(event=event, member=user).count() == 1
+
+    def test_registration_does_not_check_for_duplicates_first(self, api_client, create_user, create_event,
+                                                              django_assert_num_queries):
+        user = create_user()
+        event = create_event()
+        api_client.force_authenticate(user=user)
+
+        # event and member lookups for validation, then savepoint, insert, counter update and release.
+        with django_assert_num_queries(6):
+            response = api_client.post("/api/participants/",
+                                       {"event": event.id, "member": user.id, "role": "organizer"})
+
+        assert response.status_code == 201
+
+    def test_member_registration_queues_invitation(self, api_client, create_user, create_event,
+                                                   django_assert_num_queries):
+        user = create_user()
+        event = create_event()
+        api_client.force_authenticate(user=user)
+
+        # The event date comes from the validation lookup, no extra query for it; the invitation is queued
+        # in the registration's transaction.
+        with django_assert_num_queries(7):
+            response = api_client.post("/api/participants/", {"event": event.id, "member": user.id, "role": "member"})
+
+        assert response.status_code == 201
+        [notification] = PendingNotification.objects.all()
+        assert notification.to == ["test@gmail.com"]
+        assert "Oleg + Ivanov" in notification.body
+
+    def test_duplicate_registration_does_not_notify(self, api_client, create_user, create_event,
+                                                    create_event_participant):
+        user = create_user()
+        event = create_event()
+        create_event_participant(event, user, "member")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post("/api/participants/", {"event": event.id, "member": user.id, "role": "member"})
+
+        assert response.status_code == 200
+        assert not PendingNotification.objects.exists()
+        event.refresh_from_db()
+        assert event.members_count == 1
+
+    def test_event_create_queries(self, api_client, create_user, django_assert_num_queries):
+        user = create_user()
+        api_client.force_authenticate(user=user)
+        payload = {"title": "Retro", "description": "Sprint retro", "date": "2025-02-12 14:00:00", "location": "Kiev"}
+
+        # Savepoint, event and organizer inserts, release.
+        with django_assert_num_queries(4):
+            response = api_client.post("/api/events/", payload)
+
+        assert response.status_code == 201
+        assert response.data["organizers_count"] == 1
+        event = Event.objects.get()
+        assert event.organizers_count == 1
+        assert EventParticipant.objects.filter(event=event, member=user, role="organizer").exists()
+
+    def test_event_create_rolls_back_together(self, api_client, create_user, monkeypatch):
+        api_client.force_authenticate(user=create_user())
+
+        def fail(*args, **kwargs):
+            raise IntegrityError("organizer insert failed")
+
+        monkeypatch.setattr(EventParticipant.objects, "bulk_create", fail)
+        payload = {"title": "Retro", "description": "Sprint retro", "date": "2025-02-12 14:00:00", "location": "Kiev"}
+        with pytest.raises(IntegrityError):
+            api_client.post("/api/events/", payload)
+
+        assert not Event.objects.exists()
+
+    def test_database_rejects_duplicates(self, create_user, create_event, create_event_participant):
+        user = create_user()
+        event = create_event()
+        create_event_participant(event, user, "member")
+        with pytest.raises(IntegrityError):
+            EventParticipant.objects.create(event=event, member=user, role="organizer")
+
+    def test_update_to_existing_member(self, api_client, create_user, create_event, create_event_participant):
+        organizer = create_user()
+        member = create_user(email="member@gmail.com")
+        event = create_event()
+        create_event_participant(event, organizer, "organizer")
+        participant = create_event_participant(event, member, "member")
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.patch(f"/api/participants/{participant.id}/", {"member": organizer.id})
+
+        assert response.status_code == 400
+
+    def test_role_filter_is_case_insensitive(self, api_client, create_user, create_event, create_event_participant):
+        organizer = create_user()
+        member = create_user(email="member@gmail.com")
+        event = create_event()
+        create_event_participant(event, organizer, "organizer")
+        create_event_participant(event, member, "member")
+        api_client.force_authenticate(user=organizer)
+
+        response = api_client.get(f"/api/participants/?event={event.id}&role=ORGANIZER")
+
+        assert [item["member"] for item in response.data["results"]] == [organizer.id]
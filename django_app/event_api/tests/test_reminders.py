@@ -0,0 +1,170 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.core import mail
+from django.core.cache import caches
+from django.core.management import call_command
+from django.utils import timezone
+
+from event_api import reminders, tasks
+from event_api.models import CustomUser, Event, EventParticipant, EventReminder, ReminderDelivery
+
+
+@pytest.fixture
+def upcoming_event(db):
+    def make(hours=2, members=5):
+        event = Event.objects.create(title="Conference", description="Talks", location="Kiev",
+                                     date=timezone.now() + timedelta(hours=hours))
+        for number in range(members):
+            user = CustomUser.objects.create(email=f"member{event.id}-{number}@example.com",
+                                             first_name="Member", last_name=str(number))
+            EventParticipant.objects.create(event=event, member=user, role="member")
+        organizer = CustomUser.objects.create(email=f"organizer{event.id}@example.com", first_name="Org",
+                                              last_name="Anizer")
+        EventParticipant.objects.create(event=event, member=organizer, role="organizer")
+        return event
+    return make
+
+
+def chunk(event):
+    return [[member_id, email, "Member"] for member_id, email in EventParticipant.objects.filter(
+        event=event, role="member").order_by("id").values_list("member_id", "member__email")]
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    batches = []
+    monkeypatch.setattr(tasks.send_event_reminders, "delay",
+                        lambda reminder_id, title, date_event, recipients: batches.append(recipients))
+    return batches
+
+
+@pytest.mark.django_db
+class TestReminderScheduling:
+    def test_due_events_are_in_the_window(self, upcoming_event, settings):
+        settings.EVENT_REMINDERS = {**settings.EVENT_REMINDERS, "HOURS_BEFORE": 24}
+        soon = upcoming_event(hours=2, members=0)
+        upcoming_event(hours=48, members=0)
+        upcoming_event(hours=-1, members=0)
+
+        assert list(reminders.due_events()) == [soon]
+
+    def test_members_are_enqueued_in_chunks(self, upcoming_event, enqueued, django_assert_num_queries):
+        event = upcoming_event(members=5)
+
+        # Reminder lookup and insert in a savepoint, then per chunk a savepoint around the locked reminder
+        # read, the chunk and the cursor update; the last one finds an empty chunk and sets the status.
+        with django_assert_num_queries(24):
+            assert reminders.enqueue_reminders(event, chunk_size=2) == 5
+
+        assert [len(batch) for batch in enqueued] == [2, 2, 1]
+        assert {email for batch in enqueued for _, email, _ in batch} == {
+            f"member{event.id}-{number}@example.com" for number in range(5)}
+        reminder = EventReminder.objects.get(event=event)
+        assert (reminder.status, reminder.enqueued) == (EventReminder.ENQUEUED, 5)
+
+    def test_rerun_is_idempotent(self, upcoming_event, enqueued):
+        upcoming_event()
+
+        assert reminders.schedule_reminders(chunk_size=2) == {"events": 1, "members": 5}
+        assert reminders.schedule_reminders(chunk_size=2) == {}
+        assert len(enqueued) == 3
+
+    def test_interrupted_run_resumes_after_cursor(self, upcoming_event, monkeypatch):
+        event = upcoming_event(members=5)
+        batches = []
+
+        def fail_on_second_chunk(reminder_id, title, date_event, recipients):
+            if len(batches) == 1:
+                raise ConnectionError("broker went away")
+            batches.append(recipients)
+
+        monkeypatch.setattr(tasks.send_event_reminders, "delay", fail_on_second_chunk)
+        with pytest.raises(ConnectionError):
+            reminders.schedule_reminders(chunk_size=2)
+        assert EventReminder.objects.get(event=event).enqueued == 2
+
+        monkeypatch.setattr(tasks.send_event_reminders, "delay",
+                            lambda reminder_id, title, date_event, recipients: batches.append(recipients))
+        assert reminders.schedule_reminders(chunk_size=2)["members"] == 3
+        assert sorted(member_id for batch in batches for member_id, _, _ in batch) == sorted(
+            EventParticipant.objects.filter(event=event, role="member").values_list("member_id", flat=True))
+
+    def test_run_stops_when_another_run_took_over(self, upcoming_event, monkeypatch):
+        event = upcoming_event(members=5)
+        batches = []
+
+        def finished_elsewhere(reminder_id, title, date_event, recipients):
+            batches.append(recipients)
+            # A concurrent run finishes the reminder while this one holds no lock between chunks.
+            EventReminder.objects.filter(pk=reminder_id).update(status=EventReminder.ENQUEUED)
+
+        monkeypatch.setattr(tasks.send_event_reminders, "delay", finished_elsewhere)
+
+        assert reminders.enqueue_reminders(event, chunk_size=2) == 2
+        assert len(batches) == 1
+
+    def test_rescheduled_event_is_reminded_again(self, upcoming_event, enqueued):
+        event = upcoming_event(members=1)
+        reminders.schedule_reminders()
+
+        Event.objects.filter(pk=event.pk).update(date=event.date + timedelta(hours=1))
+
+        assert reminders.schedule_reminders() == {"events": 1, "members": 1}
+        assert EventReminder.objects.filter(event=event).count() == 2
+
+
+@pytest.mark.django_db
+class TestReminderDelivery:
+    def test_members_are_mailed_once(self, upcoming_event):
+        event = upcoming_event(members=3)
+
+        call_command("send_event_reminders", "--chunk-size", "2", stdout=open("/dev/null", "w"))
+
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f"member{event.id}-{number}@example.com" for number in range(3)]
+        assert mail.outbox[0].subject == "Reminder: Conference"
+
+    def test_chunk_enqueued_twice_sends_once(self, upcoming_event):
+        event = upcoming_event(members=2)
+        reminder = EventReminder.objects.create(event=event, event_date=event.date)
+        recipients = chunk(event)
+
+        tasks.send_event_reminders.delay(reminder.id, event.title, event.date, recipients)
+        tasks.send_event_reminders.delay(reminder.id, event.title, event.date, recipients)
+
+        assert len(mail.outbox) == 2
+
+    def test_delivery_state_outlives_the_cache(self, upcoming_event):
+        event = upcoming_event(members=2)
+        reminder = EventReminder.objects.create(event=event, event_date=event.date)
+        recipients = chunk(event)
+
+        tasks.send_event_reminders.delay(reminder.id, event.title, event.date, recipients)
+        caches[settings.NOTIFICATION_IDEMPOTENCY["ALIAS"]].clear()
+        tasks.send_event_reminders.delay(reminder.id, event.title, event.date, recipients)
+
+        assert len(mail.outbox) == 2
+        assert list(reminder.deliveries.values_list("status", "attempts")) == [(ReminderDelivery.SENT, 1)] * 2
+
+    def test_failed_members_are_recorded_and_retried(self, upcoming_event, settings, monkeypatch):
+        settings.EMAIL_BACKEND = "event_api.tests.test_mail.FlakyBackend"
+        event = upcoming_event(members=2)
+        reminder = EventReminder.objects.create(event=event, event_date=event.date)
+        recipients = chunk(event)
+        recipients[0][1] = "fail@example.com"
+        retries = []
+        monkeypatch.setattr(tasks.send_event_reminders, "apply_async", lambda args, countdown: retries.append(args))
+
+        tasks.send_event_reminders(reminder.id, event.title, event.date, recipients)
+
+        assert dict(reminder.deliveries.values_list("member_id", "status")) == {
+            recipients[0][0]: ReminderDelivery.FAILED, recipients[1][0]: ReminderDelivery.SENT}
+        assert retries == [[reminder.id, event.title, event.date, recipients[:1], 1]]
+
+        # The last attempt gives up and leaves the failure on record.
+        tasks.send_event_reminders(*retries[0][:4], settings.NOTIFICATION_MAX_RETRIES)
+        failed = reminder.deliveries.get(member_id=recipients[0][0])
+        assert (failed.status, failed.attempts) == (ReminderDelivery.FAILED, settings.NOTIFICATION_MAX_RETRIES + 1)
+        assert len(retries) == 1
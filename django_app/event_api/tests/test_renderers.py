@@ -0,0 +1,103 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from event_api.benchmarks.renderer import run_renderer_benchmark
+from event_api.benchmarks.seed import seed_benchmark_data
+from event_api.parsers import ORJSONParser
+from event_api.renderers import ORJSONRenderer
+
+PAYLOADS = [
+    {"title": "Зустріч ☕", "members_count": 3, "ratio": 0.1, "ok": True, "missing": None},
+    {"separator": "line\u2028paragraph\u2029end", "quote": "\"\\/"},
+    {"aware": datetime.datetime(2025, 2, 12, 14, 0, 5, 123456, tzinfo=datetime.timezone.utc),
+     "offset": datetime.datetime(2025, 2, 12, 14, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+     "naive": datetime.datetime(2025, 2, 12, 14, 0), "date": datetime.date(2025, 2, 12),
+     "time": datetime.time(14, 0, 0, 500), "delta": datetime.timedelta(minutes=90)},
+    {"decimal": decimal.Decimal("12.50"), "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    ReturnDict({"results": [{"id": 2, "role": "member"}, {"id": 1, "role": "organizer"}]}, serializer=None),
+    {1: "int key", "detail": ErrorDetail("Not found.", code="not_found"), "lazy": gettext_lazy("Lazy")},
+    {"big": 2 ** 70, "tuple": (1, 2)},
+    [],
+]
+
+
+@pytest.mark.parametrize("data", PAYLOADS)
+def test_renderer_is_byte_identical(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_renderer_floats_keep_their_value():
+    data = {"large": 1e16, "small": 2.5e-05, "plain": 0.1}
+
+    content = ORJSONRenderer().render(data)
+
+    assert content == b'{"large":1e16,"small":0.000025,"plain":0.1}'
+    assert json.loads(content) == json.loads(JSONRenderer().render(data)) == data
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf"), decimal.Decimal("NaN")])
+def test_renderer_rejects_non_finite_numbers(value):
+    with pytest.raises(ValueError, match="Out of range float values are not JSON compliant"):
+        ORJSONRenderer().render({"results": [{"score": value}], "next": None})
+
+
+def test_renderer_falls_back_for_indent():
+    content = ORJSONRenderer().render({"a": [1]}, "application/json; indent=2")
+
+    assert content == b'{\n  "a": [\n    1\n  ]\n}'
+
+
+def test_stdlib_backend(settings, monkeypatch):
+    settings.API_JSON_BACKEND = "stdlib"
+    monkeypatch.setattr("event_api.renderers.orjson.dumps", None)
+
+    assert ORJSONRenderer().render({"a": 1}) == b'{"a":1}'
+
+
+@pytest.mark.parametrize("body", [b'{"event": 1, "role": "member"}', b'{"big": 1180591620717411303424}',
+                                  b'[1.5, "\\u00e9"]'])
+def test_parser_matches_json_parser(body):
+    assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+
+def test_parser_errors_match_json_parser():
+    with pytest.raises(ParseError) as expected:
+        JSONParser().parse(io.BytesIO(b'{"event": '))
+    with pytest.raises(ParseError) as error:
+        ORJSONParser().parse(io.BytesIO(b'{"event": '))
+
+    assert str(error.value) == str(expected.value)
+
+
+@pytest.mark.django_db
+def test_endpoints_use_orjson(api_client, create_user, create_event):
+    create_event(title="Зустріч")
+    api_client.force_authenticate(user=create_user())
+
+    response = api_client.get("/api/events/")
+
+    assert response["Content-Type"] == "application/json"
+    assert response.content == JSONRenderer().render(response.data)
+    assert api_client.post("/api/participants/", b'{"event": ', content_type="application/json").status_code == 400
+
+
+@pytest.mark.django_db
+def test_renderer_benchmark():
+    seed_benchmark_data(users=20, events=5, participants_per_event=4)
+
+    report = run_renderer_benchmark(requests=2, warmup=0, rows=10)
+
+    assert report["results"]["page_rendering"]["byte_identical"]
+    assert set(report["results"]["endpoints"]["events_list"]) == {"stdlib", "orjson", "p50_speedup"}
+    assert all(result[backend]["errors"] == 0 for result in report["results"]["endpoints"].values()
+               for backend in ("stdlib", "orjson"))
@@ -0,0 +1,117 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+
+from event_api.authentication import ClaimsRefreshToken
+from event_api.models import Event
+from event_api.roles import get_event_role
+from event_api.routers import PrimaryReplicaRouter, get_read_database, reset_read_database, use_read_database
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def replica(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.EVENT_LIST_CACHE = {**settings.EVENT_LIST_CACHE, "ALIAS": None}
+
+
+@pytest.fixture
+def client(api_client, create_user):
+    user = create_user()
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {ClaimsRefreshToken.for_user(user).access_token}")
+    return api_client
+
+
+def queries_on(alias):
+    return CaptureQueriesContext(connections[alias])
+
+
+def test_router_follows_the_request_context(replica):
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(Event) is None
+
+    token = use_read_database("replica")
+    try:
+        assert router.db_for_read(Event) == "replica"
+        assert router.db_for_write(Event) == "default"
+    finally:
+        reset_read_database(token)
+
+
+def test_safe_reads_go_to_the_replica(replica, client, create_event):
+    create_event()
+    # Caches the caller's status, which is always read from the primary.
+    client.get("/api/events/")
+
+    with queries_on("replica") as replica_queries, queries_on("default") as primary_queries:
+        response = client.get("/api/events/")
+
+    assert response.status_code == 200
+    assert response.data["count"] == 1
+    assert len(replica_queries) == 2
+    assert len(primary_queries) == 0
+    assert get_read_database() is None
+
+
+def test_views_without_replica_reads_use_the_primary(replica, client, create_event, create_user):
+    user = create_user(email="other@gmail.com")
+
+    with queries_on("replica") as replica_queries:
+        client.get(f"/api/user/{user.id}/")
+
+    assert len(replica_queries) == 0
+
+
+def test_writes_pin_the_client_to_the_primary(replica, client, create_event):
+    event = create_event()
+
+    response = client.post("/api/events/", {"title": "Retro", "description": "Sprint retro",
+                                            "date": "2025-02-12 14:00:00", "location": "Kiev"})
+    assert response.status_code == 201
+    assert "replica_pin" in response.cookies
+
+    # Pinned by the per-user marker even without the cookie.
+    client.cookies.clear()
+    with queries_on("replica") as replica_queries:
+        client.get(f"/api/event/{event.id}/")
+    assert len(replica_queries) == 0
+
+
+def test_async_writes_pin_the_client(replica, create_user, create_event):
+    user = create_user()
+    token = ClaimsRefreshToken.for_user(user).access_token
+    cache = caches[settings.REPLICA_PINNING["ALIAS"]]
+    cache.delete(f"replica_pin:{user.id}")
+
+    response = async_to_sync(AsyncClient().post)(
+        "/api/async/participants/", {"event": create_event().id, "member": user.id, "role": "member"},
+        content_type="application/json", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 201
+    assert "replica_pin" in response.cookies
+    assert cache.get(f"replica_pin:{user.id}") == 1
+
+
+def test_no_pinning_without_replicas(client):
+    response = client.post("/api/events/", {"title": "Retro", "description": "Sprint retro",
+                                            "date": "2025-02-12 14:00:00", "location": "Kiev"})
+
+    assert "replica_pin" not in response.cookies
+
+
+def test_cached_roles_are_read_from_the_primary(replica, create_user, create_event):
+    user = create_user()
+    event = create_event()
+
+    token = use_read_database("replica")
+    try:
+        with queries_on("replica") as replica_queries:
+            get_event_role(user.id, event.id)
+    finally:
+        reset_read_database(token)
+    assert len(replica_queries) == 0
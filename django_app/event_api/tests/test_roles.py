@@ -0,0 +1,141 @@
+import pytest
+from django.core.cache import caches
+from django.test import override_settings
+
+from event_api.roles import LocMemRoleBackend, MISSING, get_event_role, get_role_backend, reset_role_cache, \
+    role_cache_stats
+
+
+def test_locmem_backend_evicts_least_recently_used():
+    backend = LocMemRoleBackend(max_entries=2)
+    backend.set(1, 1, "member")
+    backend.set(2, 1, "member")
+    backend.get(1, 1)
+    backend.set(3, 1, "organizer")
+
+    assert backend.get(2, 1) is MISSING
+    assert backend.get(1, 1) == "member"
+    assert backend.get(3, 1) == "organizer"
+
+
+def test_locmem_backend_expires_entries():
+    backend = LocMemRoleBackend(timeout=-1)
+    backend.set(1, 1, "member")
+    assert backend.get(1, 1) is MISSING
+
+
+@pytest.mark.django_db
+class TestEventRoleCache:
+    def test_lookup_is_cached(self, create_user, create_event, create_event_participant,
+                              django_assert_num_queries):
+        user = create_user()
+        event = create_event()
+        create_event_participant(event, user, "organizer")
+
+        with django_assert_num_queries(1):
+            assert get_event_role(user.id, event.id) == "organizer"
+            assert get_event_role(user.id, event.id) == "organizer"
+        assert role_cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_non_participant_is_cached(self, create_user, create_event, django_assert_num_queries):
+        user = create_user()
+        event = create_event()
+
+        with django_assert_num_queries(1):
+            assert get_event_role(user.id, event.id) is None
+            assert get_event_role(user.id, event.id) is None
+
+    def test_role_change_invalidates(self, api_client, create_user, create_event, create_event_participant):
+        organizer = create_user()
+        event = create_event()
+        participant = create_event_participant(event, organizer, "organizer")
+        api_client.force_authenticate(user=organizer)
+        url = f"/api/participants/?event={event.id}&expand=member"
+        assert api_client.get(url).status_code == 200
+
+        participant.role = "member"
+        participant.save()
+
+        assert api_client.get(url).status_code == 403
+
+    def test_annotated_checks_bypass_the_cache(self, api_client, create_user, create_event,
+                                               create_event_participant):
+        organizer = create_user()
+        event = create_event()
+        create_event_participant(event, organizer, "organizer")
+        api_client.force_authenticate(user=organizer)
+
+        assert api_client.get(f"/api/event/{event.id}/").status_code == 200
+        assert role_cache_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0}
+
+        api_client.get(f"/api/participants/?event={event.id}&expand=member")
+        api_client.get(f"/api/participants/?event={event.id}&expand=member")
+        assert role_cache_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_annotated_role_wins_over_stale_cache(self, api_client, create_user, create_event,
+                                                  create_event_participant):
+        # Another process demoted the organizer; this process still has the old role cached.
+        member = create_user()
+        event = create_event()
+        create_event_participant(event, member, "member")
+        get_role_backend().set(member.id, event.id, "organizer")
+        api_client.force_authenticate(user=member)
+
+        assert api_client.get(f"/api/event/{event.id}/").status_code == 403
+
+    def test_annotated_role_is_not_cached(self, api_client, create_user, create_event, create_event_participant):
+        # The annotation may come from a lagging replica, so it must not overwrite the shared cache.
+        organizer = create_user()
+        event = create_event()
+        create_event_participant(event, organizer, "organizer")
+        api_client.force_authenticate(user=organizer)
+
+        assert api_client.get(f"/api/event/{event.id}/").status_code == 200
+        assert get_role_backend().get(organizer.id, event.id) is MISSING
+
+    def test_role_cached_before_commit_is_invalidated_on_commit(self, create_user, create_event,
+                                                                 create_event_participant,
+                                                                 django_capture_on_commit_callbacks):
+        user = create_user()
+        event = create_event()
+        participant = create_event_participant(event, user, "organizer")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            participant.role = "member"
+            participant.save()
+            # A concurrent request that missed the cache read the committed organizer role and stored it.
+            get_role_backend().set(user.id, event.id, "organizer")
+
+        assert get_event_role(user.id, event.id) == "member"
+
+    def test_participant_delete_invalidates(self, create_user, create_event, create_event_participant):
+        user = create_user()
+        event = create_event()
+        participant = create_event_participant(event, user, "organizer")
+        assert get_event_role(user.id, event.id) == "organizer"
+
+        participant.delete()
+
+        assert get_event_role(user.id, event.id) is None
+
+    @override_settings(EVENT_ROLE_CACHE={"BACKEND": "event_api.roles.DjangoCacheRoleBackend"})
+    def test_django_cache_backend(self, create_user, create_event, create_event_participant):
+        user = create_user()
+        event = create_event()
+        participant = create_event_participant(event, user, "member")
+        assert get_event_role(user.id, event.id) == "member"
+
+        participant.role = "organizer"
+        participant.save()
+
+        assert get_event_role(user.id, event.id) == "organizer"
+
+
+def test_reset_keeps_other_keys_of_the_shared_cache():
+    cache = caches["default"]
+    cache.set("notification-sent:kept", "sent")
+
+    with override_settings(EVENT_ROLE_CACHE={"BACKEND": "event_api.roles.DjangoCacheRoleBackend"}):
+        reset_role_cache()
+
+    assert cache.get("notification-sent:kept") == "sent"
@@ -0,0 +1,71 @@
+import pytest
+
+from event_api.models import Event
+from event_api.search import IcontainsSearchBackend, SQLiteFTS5SearchBackend
+
+
+def search(query):
+    return list(SQLiteFTS5SearchBackend().search(Event.objects.all(), query).values_list("title", flat=True))
+
+
+@pytest.mark.django_db
+class TestEventSearch:
+    def test_ranks_title_matches_first(self, create_event):
+        create_event(title="Daily meeting", description="Planning for the python workshop")
+        create_event(title="Python workshop", description="Hands-on session")
+        create_event(title="Standup", description="Nothing to see")
+
+        assert search("python workshop") == ["Python workshop", "Daily meeting"]
+
+    def test_searches_description_and_location(self, create_event):
+        create_event(title="Meetup", description="Talks about databases", location="Lviv")
+
+        assert search("databases") == ["Meetup"]
+        assert search("lviv") == ["Meetup"]
+
+    def test_prefix_and_stemming(self, create_event):
+        create_event(title="Workshops for organizers")
+
+        assert search("worksh") == ["Workshops for organizers"]
+        assert search("organizer") == ["Workshops for organizers"]
+
+    def test_index_follows_updates_and_deletes(self, create_event):
+        event = create_event(title="Old title")
+        event.title = "New title"
+        event.save()
+        assert search("old") == []
+        assert search("new") == ["New title"]
+
+        event.delete()
+        assert search("new") == []
+
+    def test_query_syntax_is_escaped(self, create_event):
+        create_event(title="C++ meetup")
+
+        assert search('meetup" (^') == ["C++ meetup"]
+        assert search("***") == []
+
+    def test_icontains_backend(self, create_event):
+        create_event(title="Daily meeting", location="Kiev")
+        create_event(title="Retro", location="Lviv")
+
+        backend = IcontainsSearchBackend(fields=("title", "location"))
+        assert list(backend.search(Event.objects.all(), "kie").values_list("title", flat=True)) == ["Daily meeting"]
+
+    def test_listing_endpoint_uses_backend(self, api_client, create_user, create_event):
+        create_event(title="Standup", description="Discuss the release plan")
+        create_event(title="Release party", description="Celebrate")
+        api_client.force_authenticate(user=create_user())
+
+        response = api_client.get("/api/events/?search=release")
+
+        assert [item["title"] for item in response.data["results"]] == ["Release party", "Standup"]
+
+    def test_listing_endpoint_with_configured_backend(self, api_client, create_user, create_event, settings):
+        settings.EVENT_SEARCH_BACKEND = "event_api.search.IcontainsSearchBackend"
+        create_event(title="Standup", description="Discuss the release plan")
+        api_client.force_authenticate(user=create_user())
+
+        response = api_client.get("/api/events/?search=releas")
+
+        assert [item["title"] for item in response.data["results"]] == ["Standup"]
@@ -1,43 +1,4 @@
-from datetime import datetime
 import pytest
-from rest_framework.test import APIClient
-from event_api.models import CustomUser, Event, EventParticipant
-
-
-@pytest.fixture
-def api_client():
-    return APIClient()
-
-
-@pytest.fixture
-def create_user(db):
-    def make_user(email="test@gmail.com", first_name="Oleg", last_name="Ivanov", password="TtppZZffd2"):
-        user = CustomUser.objects.create(
-            email=email, first_name=first_name, last_name=last_name
-        )
-        user.set_password(password)
-        user.save()
-        return user
-    return make_user
-
-
-@pytest.fixture
-def create_event(db):
-    def make_event(title="Daily meeting", description="Discussion of a new project",
-                   date="12-02-2025 14:00:00", location="Kiev"):
-        parsed_date = datetime.strptime(date, "%d-%m-%Y %H:%M:%S")
-        event = Event.objects.create(
-            title=title, description=description, date=parsed_date, location=location
-        )
-        return event
-    return make_event
-
-
-@pytest.fixture
-def create_event_participant(db):
-    def add_participant(event, member, role):
-        return EventParticipant.objects.create(event=event, member=member, role=role)
-    return add_participant
 
 
 @pytest.mark.django_db
@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+from celery.contrib.testing.worker import start_worker
+from celery.signals import task_postrun
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from core import celery_app
+from event_api import tasks
+from event_api.mail import claim_delivery, claim_notifications, deliver, duplicate_notifications, \
+    notification_to_message
+from event_api.models import PendingNotification
+from event_api.task_metrics import task_failures, task_queue_latency, task_runtime
+
+FLUSH = "event_api.tasks.flush_notifications"
+
+
+def invitation(idempotency_key):
+    message = tasks.invitation("member@example.com", "Oleg Ivanov", "2025-02-12")
+    message.idempotency_key = idempotency_key
+    return message
+
+
+def test_notifications_are_routed_to_their_queue():
+    route = celery_app.amqp.router.route({}, FLUSH, (), {})
+    assert route["queue"].name == "notifications"
+    assert celery_app.amqp.router.route({}, "celery.ping", (), {})["queue"].name == "default"
+    assert celery_app.conf.task_acks_late
+    assert celery_app.conf.worker_prefetch_multiplier == 1
+
+
+@pytest.mark.django_db
+def test_flush_that_died_after_sending_does_not_resend(settings):
+    settings.NOTIFICATION_CLAIM_TIMEOUT = 0
+    before = duplicate_notifications.value()
+    tasks.queue_invitations([("member@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")])
+
+    # The worker sent the claimed batch and died before deleting the rows; the claim expires immediately.
+    deliver([notification_to_message(notification) for notification in claim_notifications(10)])
+    tasks.flush_notifications.apply()
+
+    assert len(mail.outbox) == 1
+    assert duplicate_notifications.value() == before + 1
+    assert not PendingNotification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_delivery_can_be_retried(settings):
+    settings.EMAIL_BACKEND = "event_api.tests.test_mail.FlakyBackend"
+    tasks.queue_invitations([("fail@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")])
+
+    tasks.flush_notifications()
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    PendingNotification.objects.update(available_at=timezone.now())
+    tasks.flush_notifications()
+
+    assert len(mail.outbox) == 1
+    assert not PendingNotification.objects.exists()
+
+
+@pytest.mark.django_db
+def test_legacy_registration_tasks_queue_their_invitations():
+    tasks.message_for_register_event.delay("member@example.com", "Oleg Ivanov", "2025-02-12 14:00:00")
+    tasks.messages_for_register_event.delay([["other@example.com", "Oleg Ivanov", "2025-02-12 14:00:00"]])
+
+    assert sorted(PendingNotification.objects.values_list("to", flat=True)) == [
+        ["member@example.com"], ["other@example.com"]]
+
+
+def test_message_being_sent_is_skipped():
+    message = invitation("in-flight")
+
+    assert claim_delivery(message)
+    assert deliver([message]) == []
+    assert mail.outbox == []
+
+
+def test_claim_of_a_crashed_delivery_expires(settings):
+    settings.NOTIFICATION_IDEMPOTENCY = {**settings.NOTIFICATION_IDEMPOTENCY, "CLAIM_TIMEOUT": 0}
+    message = invitation("crashed")
+
+    # The worker claimed the key and died before sending; its redelivery sends once the claim expires.
+    assert claim_delivery(message)
+    assert deliver([message]) == []
+    assert len(mail.outbox) == 1
+
+    # A sent message keeps its marker past CLAIM_TIMEOUT.
+    deliver([message])
+    assert len(mail.outbox) == 1
+
+
+def test_workers_require_a_shared_idempotency_cache(settings):
+    with pytest.raises(ImproperlyConfigured):
+        tasks.require_shared_idempotency_cache()
+
+    settings.NOTIFICATION_IDEMPOTENCY = {**settings.NOTIFICATION_IDEMPOTENCY, "ALIAS": ""}
+    tasks.require_shared_idempotency_cache()
+    message = invitation("unchecked")
+    deliver([message])
+    deliver([message])
+    assert len(mail.outbox) == 2
+
+
+@pytest.mark.django_db
+def test_eager_tasks_record_run_time_and_failures(monkeypatch):
+    succeeded = task_runtime.count(task=FLUSH, state="SUCCESS")
+    failed = task_failures.value(task=FLUSH, exception="KeyError")
+
+    tasks.flush_notifications.apply()
+    monkeypatch.setattr(tasks, "claim_notifications", lambda limit: {}["lost"])
+    result = tasks.flush_notifications.apply()
+
+    assert result.state == "FAILURE"
+    assert task_runtime.count(task=FLUSH, state="SUCCESS") == succeeded + 1
+    assert task_failures.value(task=FLUSH, exception="KeyError") == failed + 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_published_tasks_record_queue_latency():
+    finished = threading.Event()
+    before = task_queue_latency.count(task=FLUSH, queue="notifications")
+
+    def on_finished(**kwargs):
+        finished.set()
+
+    celery_app.conf.update(CELERY_TASK_ALWAYS_EAGER=False)
+    task_postrun.connect(on_finished, sender=tasks.flush_notifications, weak=False)
+    try:
+        with start_worker(celery_app, pool="solo", queues=["notifications"], perform_ping_check=False):
+            tasks.flush_notifications.delay()
+            assert finished.wait(timeout=10)
+    finally:
+        task_postrun.disconnect(on_finished, sender=tasks.flush_notifications)
+        celery_app.conf.update(CELERY_TASK_ALWAYS_EAGER=True)
+
+    assert task_queue_latency.count(task=FLUSH, queue="notifications") == before + 1
@@ -1,7 +1,8 @@
 from django.urls import path
 
+from . import async_views
 from .views import UserRegisterAPIView, ListUsersAPIView, UserLoginAPIView, UserAPIView, EventListAPIView, EventAPIView, EventParticipantListAPIView, \
-    EventParticipantDetailAPIView
+    EventParticipantDetailAPIView, EventParticipantBulkAPIView, EventParticipantExportAPIView
 
 urlpatterns = [
 
@@ -12,10 +13,17 @@ urlpatterns = [
 
     path("events/", EventListAPIView.as_view()),
     path("event/<int:pk>/", EventAPIView.as_view()),
+    path("event/<int:pk>/participants/export/", EventParticipantExportAPIView.as_view()),
 
     path("participants/", EventParticipantListAPIView.as_view()),
+    path("participants/bulk/", EventParticipantBulkAPIView.as_view()),
     path("participants/<int:pk>/", EventParticipantDetailAPIView.as_view()),
 
+    path("async/login/", async_views.login),
+    path("async/events/", async_views.event_list),
+    path("async/event/<int:pk>/", async_views.event_detail),
+    path("async/participants/", async_views.participant_list),
+
 
 
 ]
\ No newline at end of file
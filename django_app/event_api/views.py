@@ -1,19 +1,34 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import generics
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import ClaimsRefreshToken
+from .conditional import conditional_response, event_etag, event_list_etag, set_validators
+from .export import EXPORT_FORMATS, participant_rows
+from .fast_serializers import EventParticipantValuesSerializer, EventValuesSerializer
 from .filters import EventParticipantFilter
+from .list_cache import cache_page, get_cached_page, list_cache_key
+from .metrics import render_prometheus
 from .models import CustomUser, Event, EventParticipant
-from .permissions import IsStaff, UserPermission, CanManageEvent, CanManageEventParticipant
-from .serializers import UserSerializer, UserLoginSerializer, EventSerializer, EventParticipantSerializer
-from .tasks import message_for_register_event
+from .permissions import IsStaff, UserPermission, CanManageEvent, CanManageEventParticipant, IsEventOrganizer, \
+    can_expand_members, expands_members
+from .search import EventSearchFilter
+from .serializers import UserSerializer, UserLoginSerializer, EventSerializer, EventParticipantSerializer, \
+    EventParticipantBulkSerializer, requested_expansions, requested_fields
+from .tasks import queue_invitations
 
 class UserRegisterAPIView(APIView):
     queryset = CustomUser.objects.all()
@@ -36,10 +51,12 @@ class ListUsersAPIView(generics.ListAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsStaff]
+    replica_reads = True
     filter_backends = [DjangoFilterBackend, SearchFilter]
 
     filterset_fields = ["email", "first_name", "last_name"]
     search_fields = ["email", "first_name", "last_name"]
+    keyset_ordering = ("id",)
 
 
 class UserLoginAPIView(APIView):
@@ -53,7 +70,7 @@ class UserLoginAPIView(APIView):
 
         if serializer.is_valid():
             user = serializer.validated_data
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({"refresh": str(refresh),
                              "access": str(refresh.access_token)})
 
@@ -70,23 +87,95 @@ class EventListAPIView(generics.ListCreateAPIView):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    replica_reads = True
+    filter_backends = [DjangoFilterBackend, EventSearchFilter]
 
     filterset_fields = ["title", "location"]
-    search_fields = ["title", "location"]
+    search_fields = ["title", "description", "location"]
+    keyset_ordering = ("date", "id")
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                                             description="Comma separated fields to return")],
+    )
+    def list(self, request, *args, **kwargs):
+        cache_key = list_cache_key(request)
+        cached = get_cached_page(cache_key)
+        if cached is not None:
+            data, etag = cached
+            not_modified = conditional_response(request, etag)
+            return not_modified or set_validators(Response(data), etag)
+
+        fields = requested_fields(request, EventSerializer)
+        queryset = EventValuesSerializer(fields=fields).values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        events = page if page is not None else list(queryset)
+        pagination = self.get_paginated_response([]).data if page is not None else None
+
+        etag = event_list_etag(request, events, pagination)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        data = EventValuesSerializer(events, fields=fields).data
+        response = self.get_paginated_response(data) if page is not None else Response(data)
+        cache_page(cache_key, (response.data, etag))
+        return set_validators(response, etag)
 
 
 class EventAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated, CanManageEvent]
+    replica_reads = True
+
+    def get_queryset(self):
+        queryset = Event.objects.with_caller_role(self.request.user.id)
+        if self.request.method not in ("GET", "HEAD") and "HTTP_IF_MATCH" in self.request.META:
+            # Lock the row so the If-Match check and the write cannot interleave with another writer.
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = event_etag(instance)
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        return set_validators(Response(self.get_serializer(instance).data), etag)
+
+    @transaction.atomic
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object()
+        precondition_failed = conditional_response(request, event_etag(instance))
+        if precondition_failed is not None:
+            return precondition_failed
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        return set_validators(Response(serializer.data), event_etag(serializer.instance))
+
+    @transaction.atomic
+    def destroy(self, request, *args, **kwargs):
+        instance = self.get_object()
+        precondition_failed = conditional_response(request, event_etag(instance))
+        if precondition_failed is not None:
+            return precondition_failed
+
+        self.perform_destroy(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class EventParticipantListAPIView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
+    replica_reads = True
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_class = EventParticipantFilter
     search_fields = ["event__title", "member__email", "role"]
+    keyset_ordering = ("register_time", "id")
 
     def get_queryset(self):
         return EventParticipant.objects.all()
@@ -96,17 +185,32 @@ class EventParticipantListAPIView(generics.ListCreateAPIView):
 
     @swagger_auto_schema(
         request_body=EventParticipantSerializer,
+        manual_parameters=[
+            openapi.Parameter("expand", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Inline related objects: event, member"),
+            openapi.Parameter("fields", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Comma separated fields to return"),
+        ],
     )
     def list(self, request, *args, **kwargs):
+        expand = requested_expansions(request, EventParticipantSerializer)
+        fields = requested_fields(request, EventParticipantSerializer)
+        if expands_members(expand, fields) and not can_expand_members(request):
+            raise PermissionDenied("Expanding member is limited to staff and the organizers of the ?event= listed.")
         queryset = self.filter_queryset(self.get_queryset())
+        if expand:
+            # Nested representations need model instances and the regular serializers.
+            queryset = queryset.select_related(*expand)
+            serializer_class = partial(EventParticipantSerializer, expand=expand, fields=fields)
+        else:
+            queryset = EventParticipantValuesSerializer(fields=fields).values(queryset)
+            serializer_class = partial(EventParticipantValuesSerializer, fields=fields)
 
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = EventParticipantSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return self.get_paginated_response(serializer_class(page, many=True).data)
 
-        serializer = EventParticipantSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(serializer_class(queryset, many=True).data)
 
     @swagger_auto_schema(
         request_body=EventParticipantSerializer,
@@ -115,35 +219,83 @@ class EventParticipantListAPIView(generics.ListCreateAPIView):
     def create(self, request, *args, **kwargs):
         data = request.data
 
-        event_pat = EventParticipant.objects.filter(event=data['event'],
-                                                    member=data['member']).exists()
-        if event_pat:
-            return Response({"detail": "You are already registered for this event."})
-
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        if serializer.data["role"] == "member":
-            full_name = f"{self.request.user.first_name} + {self.request.user.last_name}"
-            date_event = Event.objects.get(id=serializer.data["event"]).date
-            message_for_register_event.delay(self.request.user.email, full_name, date_event)
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-
-
-class EventParticipantDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = EventParticipant
-    serializer_class = EventParticipantSerializer
-    permission_classes = [IsAuthenticated, CanManageEventParticipant]
+        try:
+            self.perform_create(serializer)
+        except IntegrityError:
+            return Response({"detail": "You are already registered for this event."})
+        data = serializer.data
+        return Response(data, status=status.HTTP_201_CREATED, headers=self.get_success_headers(data))
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            participant = serializer.save()
+            if participant.role == "member":
+                full_name = f"{self.request.user.first_name} + {self.request.user.last_name}"
+                # The event was loaded by the validation; the invitation is queued in the registration's transaction.
+                queue_invitations([(self.request.user.email, full_name, participant.event.date)])
 
 
+class EventParticipantBulkAPIView(APIView):
+    permission_classes = [IsAuthenticated, IsStaff]
 
+    @swagger_auto_schema(
+        request_body=EventParticipantBulkSerializer,
+        responses={200: openapi.Response("Per-item registration status")}
+    )
+    def post(self, request):
+        serializer = EventParticipantBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save())
 
 
+class EventParticipantDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = EventParticipantSerializer
+    permission_classes = [IsAuthenticated, CanManageEventParticipant]
 
+    def get_queryset(self):
+        return EventParticipant.objects.with_caller_role(self.request.user.id)
 
+    def perform_update(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            raise serializers.ValidationError({"detail": "This member is already registered for this event."})
 
 
+class EventParticipantExportAPIView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsEventOrganizer]
 
+    def get_queryset(self):
+        return Event.objects.with_caller_role(self.request.user.id).only("id")
 
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter("export_format", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                                             enum=list(EXPORT_FORMATS), default="csv")],
+        responses={200: openapi.Response("Participants of the event with member email and name")}
+    )
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            raise serializers.ValidationError({"export_format": f"Choose one of: {', '.join(EXPORT_FORMATS)}."})
+
+        event = self.get_object()
+        content_type, stream = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(stream(participant_rows(event.id)), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="event-{event.id}-participants.{export_format}"'
+        return response
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint, only answered for PERFORMANCE_MONITORING["METRICS_ALLOWED_IPS"].
+
+    The check trusts REMOTE_ADDR. Behind a reverse proxy on the same host every request comes from
+    127.0.0.1, so there /metrics has to be blocked at the proxy (or the proxy's address left out).
+    """
+    if request.META.get("REMOTE_ADDR") not in settings.PERFORMANCE_MONITORING["METRICS_ALLOWED_IPS"]:
+        raise Http404
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")